@@ -1,6 +1,6 @@
 import { describe, test } from "node:test"
-import { strictEqual } from "node:assert/strict"
-import { parseOne, Dialect } from "sqlglot-ts"
+import { strictEqual, throws } from "node:assert/strict"
+import { parseOne, Dialect, Generator } from "sqlglot-ts"
 import { DuckDB, Postgres, DuckDBDialect } from "sqlglot-ts/dialects"
 
 describe("dialects", () => {
@@ -26,6 +26,38 @@ describe("dialects", () => {
     strictEqual(sql, "SELECT CAST(x AS INT)")
   })
 
+  test("pooled instances are reset between calls", () => {
+    const ast = parseOne("SELECT * FROM (VALUES (1)) AS (a)")
+
+    const first = DuckDB.generate(ast)
+
+    strictEqual(first, "SELECT * FROM (VALUES (1)) AS _t0(a)")
+    strictEqual(DuckDB.generate(ast), first)
+    strictEqual(Dialect.get("duckdb, version=1.0").generate(ast), first)
+  })
+
+  test("reused generators restore identify after a failed call", () => {
+    class Flaky extends Generator {
+      fail(): string {
+        return this.noIdentify(() => {
+          throw new Error("boom")
+        })
+      }
+
+      drift(): void {
+        this.identify = false
+        this.pretty = true
+      }
+    }
+    const ast = parseOne("SELECT a FROM t")
+    const generator = new Flaky({ identify: true })
+
+    throws(() => generator.fail(), /boom/)
+    strictEqual(generator.generate(ast), 'SELECT "a" FROM "t"')
+    generator.drift()
+    strictEqual(generator.generate(ast), 'SELECT "a" FROM "t"')
+  })
+
   test("per-dialect import (tree-shaking friendly)", async () => {
     const mod = await import("sqlglot-ts/dialects/duckdb")
     strictEqual(typeof mod.DuckDBDialect, "function")
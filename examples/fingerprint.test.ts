@@ -0,0 +1,31 @@
+import {
+  deepStrictEqual,
+  notStrictEqual,
+  strictEqual,
+} from "node:assert/strict"
+import { describe, test } from "node:test"
+import { fingerprint, parameterize } from "sqlglot-ts"
+
+describe("fingerprint", () => {
+  test("normalizes literals, IN lists, case and whitespace", () => {
+    const a = fingerprint("select A from T where x in (1, 2, 3) and y = 'a'")
+    const b = fingerprint("SELECT a\n FROM t -- c\n WHERE x IN (4) AND y = 'b'")
+
+    strictEqual(a.normalized, "SELECT a FROM t WHERE x IN (?) AND y = ?")
+    strictEqual(a.hash, b.hash)
+    strictEqual(a.hash.length, 16)
+    notStrictEqual(a.hash, fingerprint("SELECT a FROM t WHERE x = 1").hash)
+  })
+
+  test("hash is FNV-1a 64 of the normalized text", () => {
+    strictEqual(fingerprint("").hash, "cbf29ce484222325")
+    strictEqual(fingerprint("a").hash, "af63dc4c8601ec8c")
+  })
+
+  test("parameterize returns extracted values", () => {
+    const result = parameterize("SELECT f(a) - 1 FROM t WHERE b IN (-2, 'x')")
+
+    strictEqual(result.normalized, "SELECT f(a) - ? FROM t WHERE b IN (?)")
+    deepStrictEqual(result.values.map((v) => v.value), ["1", "-2", "x"])
+  })
+})
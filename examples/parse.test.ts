@@ -1,6 +1,18 @@
 import { describe, test } from "node:test"
 import { deepStrictEqual, strictEqual, throws } from "node:assert/strict"
-import { parse, parseOne } from "sqlglot-ts"
+import {
+  Dialect,
+  formatTime,
+  parse,
+  parseOne,
+  parseScript,
+  reparseScript,
+  splitStatements,
+  TOKEN_TYPE_NAMES,
+  Tokenizer,
+  TokenType,
+  tokenTypeCode,
+} from "sqlglot-ts"
 import "sqlglot-ts/dialects/duckdb"
 
 describe("parse", () => {
@@ -20,6 +32,169 @@ describe("parse", () => {
     )
   })
 
+  test("splitStatements returns spans without parsing", () => {
+    const sql = "SELECT ';' AS a; /* x; */ SELECT 2 ;;\n"
+
+    const spans = splitStatements(sql)
+
+    deepStrictEqual(
+      spans.map(({ start, end }) => sql.slice(start, end)),
+      ["SELECT ';' AS a", "/* x; */ SELECT 2"],
+    )
+  })
+
+  test("Parser.parse accepts tokens from an earlier tokenize", () => {
+    const sql = "SELECT \"a b\" FROM t"
+    const tokens = new Tokenizer().tokenize(sql)
+
+    const [ast] = Dialect.get("").createParser().parse(tokens, sql)
+
+    strictEqual(ast?.sql(), sql)
+  })
+
+  test("tokens record line and col at their end", () => {
+    const tokens = Dialect.get("duckdb")
+      .createTokenizer()
+      .tokenize("SELECT 'a\nbc', /* x\ny */ 0x\n  $$q\n$$ AS b")
+
+    deepStrictEqual(
+      tokens.map((t) => [t.text, t.line, t.col]),
+      [
+        ["SELECT", 1, 6],
+        ["a\nbc", 2, 3],
+        [",", 2, 4],
+        ["0", 3, 6],
+        ["x", 3, 7],
+        ["q\n", 5, 2],
+        ["AS", 5, 5],
+        ["b", 5, 7],
+        ["", 5, 7],
+      ],
+    )
+  })
+
+  test("token types have dense integer codes", () => {
+    const codes = TOKEN_TYPE_NAMES.map(tokenTypeCode)
+
+    deepStrictEqual(codes, [...TOKEN_TYPE_NAMES.keys()])
+    strictEqual(TOKEN_TYPE_NAMES[tokenTypeCode(TokenType.SELECT)], "SELECT")
+  })
+
+  test("multi-word keywords match in any case and spacing", () => {
+    const tokens = new Tokenizer().tokenize("order \tBy a, group x, sort_by")
+
+    deepStrictEqual(
+      tokens.map((t) => [t.tokenType, t.text]),
+      [
+        ["ORDER_BY", "order \tBy"],
+        ["VAR", "a"],
+        ["COMMA", ","],
+        ["GROUP", "group"],
+        ["VAR", "x"],
+        ["COMMA", ","],
+        ["VAR", "sort_by"],
+        ["EOF", ""],
+      ],
+    )
+  })
+
+  test("retokenize matches a full tokenize after an edit", () => {
+    const before = "SELECT a, 'x' FROM t -- tail\nWHERE b = 1; SELECT 2"
+    const edits = [
+      { offset: 7, deleted: 1, inserted: "abc" },
+      { offset: 11, deleted: 0, inserted: "''" },
+      { offset: 25, deleted: 0, inserted: "\n" },
+      { offset: 40, deleted: 3, inserted: "" },
+    ]
+    const tokenizer = new Tokenizer()
+    const previous = tokenizer.tokenize(before)
+
+    for (const edit of edits) {
+      const after =
+        before.slice(0, edit.offset) +
+        edit.inserted +
+        before.slice(edit.offset + edit.deleted)
+      const { tokens } = new Tokenizer().retokenize(after, previous, edit)
+
+      deepStrictEqual(tokens.toArray(), tokenizer.tokenize(after))
+    }
+  })
+
+  test("tokenizeChunks matches tokenize across chunk boundaries", () => {
+    const sql = "SELECT 'a;b' -- c\nFROM t ORDER  BY x; SELECT $$q\n$$, 1.5"
+    const expected = new Tokenizer().tokenize(sql)
+
+    for (const size of [1, 2, 3, 7]) {
+      const chunks: string[] = []
+      for (let i = 0; i < sql.length; i += size) {
+        chunks.push(sql.slice(i, i + size))
+      }
+
+      deepStrictEqual([...new Tokenizer().tokenizeChunks(chunks)], expected)
+    }
+  })
+
+  test("push returns only completed tokens", () => {
+    const tokenizer = new Tokenizer()
+
+    deepStrictEqual(
+      tokenizer.push("SELECT a, 'b").map((t) => t.text),
+      ["SELECT"],
+    )
+    deepStrictEqual(
+      tokenizer.push("c' FROM t").map((t) => t.text),
+      ["a", ",", "bc"],
+    )
+    deepStrictEqual(
+      tokenizer.end().map((t) => t.text),
+      ["FROM", "t", ""],
+    )
+  })
+
+  test("reparseScript reuses statements outside the edit", () => {
+    const script = parseScript("SELECT 1; SELECT b FROM t; SELECT 3")
+    const edited = reparseScript(script, {
+      offset: 17,
+      deleted: 1,
+      inserted: "bb",
+    })
+
+    deepStrictEqual(
+      edited.statements.map((s) => s.expression.sql()),
+      ["SELECT 1", "SELECT bb FROM t", "SELECT 3"],
+    )
+    strictEqual(
+      edited.statements[0]!.expression,
+      script.statements[0]!.expression,
+    )
+    strictEqual(
+      edited.statements[2]!.expression,
+      script.statements[2]!.expression,
+    )
+  })
+
+  test("reparseScript keeps matching a full parse over many edits", () => {
+    let script = parseScript(
+      Array.from({ length: 40 }, (_, i) => `SELECT ${i} FROM t`).join(";\n"),
+    )
+
+    for (let i = 0; i < 40; i++) {
+      const at = script.sql.indexOf(`SELECT ${i} `)
+      const edit =
+        i % 3 === 0
+          ? { offset: at + 6, deleted: 1, inserted: "\n  " }
+          : { offset: at + 7, deleted: 0, inserted: "9" }
+      script = reparseScript(script, edit)
+
+      const full = parseScript(script.sql)
+      deepStrictEqual(script.tokens.toArray(), full.tokens.toArray())
+      deepStrictEqual(
+        script.statements.map((s) => [s.tokenStart, s.expression.sql()]),
+        full.statements.map((s) => [s.tokenStart, s.expression.sql()]),
+      )
+    }
+  })
+
   test("parseOne throws on multiple statements", () => {
     throws(() => parseOne("SELECT 1; SELECT 2"), /Expected exactly one/)
   })
@@ -39,3 +214,28 @@ describe("parse", () => {
     strictEqual(sql, input)
   })
 })
+
+describe("formatTime", () => {
+  test("formatTime replaces the longest mapped prefix", () => {
+    const mapping = new Map([
+      ["%M", "mm"],
+      ["%MI", "mi"],
+      ["%Y", "yyyy"],
+    ])
+
+    strictEqual(formatTime("%Y-%MI:%M%", mapping), "yyyy-mi:mm%")
+  })
+
+  test("formatTime sees a key replaced in a cached mapping", () => {
+    const mapping = new Map([
+      ["%Y", "yyyy"],
+      ["%d", "dd"],
+    ])
+    strictEqual(formatTime("%Y-%d", mapping), "yyyy-dd")
+
+    mapping.delete("%d")
+    mapping.set("%m", "MM")
+
+    strictEqual(formatTime("%Y-%m-%d", mapping), "yyyy-MM-%d")
+  })
+})
@@ -1,6 +1,13 @@
-import { deepStrictEqual, strictEqual } from "node:assert/strict"
+import { deepStrictEqual, strictEqual, throws } from "node:assert/strict"
 import { describe, test } from "node:test"
-import { transpile, transpileOne } from "sqlglot-ts"
+import {
+  ErrorLevel,
+  ParseError,
+  TranspileCache,
+  transpile,
+  transpileOne,
+} from "sqlglot-ts"
+import "sqlglot-ts/dialects/bigquery"
 import "sqlglot-ts/dialects/duckdb"
 import "sqlglot-ts/dialects/postgres"
 
@@ -31,4 +38,53 @@ describe("transpile", () => {
 
     strictEqual(sql, "SELECT a, b FROM t")
   })
+
+  test("forwards generator and parser options", () => {
+    const sql = transpileOne("SELECT a FROM t", { identify: true })
+
+    strictEqual(sql, 'SELECT "a" FROM "t"')
+    throws(
+      () => transpile("SELECT 1 +", { errorLevel: ErrorLevel.RAISE }),
+      ParseError,
+    )
+    strictEqual(
+      transpile("SELECT 1 +", { errorLevel: ErrorLevel.IGNORE }).length,
+      1,
+    )
+  })
+
+  test("cache reuses results and evicts least recently used", () => {
+    const cache = new TranspileCache({ maxSize: 2 })
+    const options = { read: "duckdb", write: "postgres", cache }
+
+    transpile("SELECT EPOCH(a)", options)
+    transpile("SELECT EPOCH(b)", options)
+    transpile("SELECT EPOCH(a)", options)
+    transpile("SELECT EPOCH(c)", options)
+    const results = transpile("SELECT EPOCH(a)", options)
+
+    deepStrictEqual(results, ["SELECT DATE_PART('epoch', a)"])
+    const { hits, misses, evictions, size } = cache.stats()
+    deepStrictEqual(
+      { hits, misses, evictions, size },
+      { hits: 2, misses: 3, evictions: 1, size: 2 },
+    )
+    strictEqual(transpile("SELECT EPOCH(a)", { cache }).length, 1)
+    strictEqual(cache.stats().misses, 4)
+  })
+
+  test("cache hits are copies and warned results are not cached", () => {
+    const cache = new TranspileCache()
+
+    transpile("SELECT 1", { cache }).push("mutated")
+    deepStrictEqual(transpile("SELECT 1", { cache }), ["SELECT 1"])
+
+    const warned = "SELECT ARRAY_AGG(a ORDER BY b) FROM t"
+    const options = { read: "duckdb", write: "bigquery", cache }
+    transpile(warned, options)
+    transpile(warned, options)
+
+    const { hits, misses, size } = cache.stats()
+    deepStrictEqual({ hits, misses, size }, { hits: 1, misses: 3, size: 1 })
+  })
 })
@@ -0,0 +1,105 @@
+/**
+ * Bounded LRU cache for transpile() results
+ */
+
+export interface CacheStats {
+  hits: number
+  misses: number
+  evictions: number
+  /** Number of cached inputs */
+  size: number
+  /** Approximate memory held by keys and outputs (UTF-16, 2 bytes per unit) */
+  bytes: number
+}
+
+export interface TranspileCacheOptions {
+  /** Maximum number of cached inputs (default 1024) */
+  maxSize?: number
+  /** Maximum approximate bytes held (default unbounded) */
+  maxBytes?: number
+}
+
+interface CacheEntry {
+  value: string[]
+  bytes: number
+}
+
+function entryBytes(key: string, value: string[]): number {
+  let units = key.length
+  for (const sql of value) {
+    units += sql.length
+  }
+  return units * 2
+}
+
+/**
+ * Least-recently-used cache keyed by transpile input.
+ *
+ * Pass one to `transpile(sql, { cache })` to reuse results for repeated
+ * `(sql, read, write, options)` inputs.
+ */
+export class TranspileCache {
+  readonly maxSize: number
+  readonly maxBytes: number
+  private readonly entries = new Map<string, CacheEntry>()
+  private hits = 0
+  private misses = 0
+  private evictions = 0
+  private bytes = 0
+
+  constructor(options: TranspileCacheOptions = {}) {
+    this.maxSize = options.maxSize ?? 1024
+    this.maxBytes = options.maxBytes ?? Number.POSITIVE_INFINITY
+  }
+
+  get(key: string): string[] | undefined {
+    const entry = this.entries.get(key)
+    if (!entry) {
+      this.misses++
+      return undefined
+    }
+    this.hits++
+    // Re-insert to mark as most recently used
+    this.entries.delete(key)
+    this.entries.set(key, entry)
+    return [...entry.value]
+  }
+
+  set(key: string, value: string[]): void {
+    const existing = this.entries.get(key)
+    if (existing) {
+      this.entries.delete(key)
+      this.bytes -= existing.bytes
+    }
+    const bytes = entryBytes(key, value)
+    if (this.maxSize <= 0 || bytes > this.maxBytes) {
+      return
+    }
+    this.entries.set(key, { value: [...value], bytes })
+    this.bytes += bytes
+    while (this.entries.size > this.maxSize || this.bytes > this.maxBytes) {
+      const [oldestKey, oldest] = this.entries.entries().next().value!
+      this.entries.delete(oldestKey)
+      this.bytes -= oldest.bytes
+      this.evictions++
+    }
+  }
+
+  stats(): CacheStats {
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      size: this.entries.size,
+      bytes: this.bytes,
+    }
+  }
+
+  clear(): void {
+    this.entries.clear()
+    this.bytes = 0
+    this.hits = 0
+    this.misses = 0
+    this.evictions = 0
+  }
+}
@@ -7,8 +7,8 @@ import * as exp from "./expressions.js"
 import { type GenerateOptions, Generator } from "./generator.js"
 import { Parser, type ParserOptions } from "./parser.js"
 import { formatTime } from "./time.js"
-import { Tokenizer, type TokenizerOptions } from "./tokens.js"
-import { newTrie, type Trie } from "./trie.js"
+import { type Token, Tokenizer, type TokenizerOptions } from "./tokens.js"
+import { compileTrie, type TrieTable } from "./trie.js"
 
 export interface DialectOptions {
   tokenizer?: TokenizerOptions
@@ -19,6 +19,13 @@ export interface DialectOptions {
 // Registry of dialects
 const DIALECTS: Map<string, Dialect> = new Map()
 
+interface PoolEntry<T> {
+  instance: T
+  busy: boolean
+}
+
+type Pool<T> = Map<string, PoolEntry<T>>
+
 const DEFAULT_UNESCAPED_SEQUENCES: Record<string, string> = {
   "\\a": "\x07",
   "\\b": "\b",
@@ -98,21 +105,21 @@ export class Dialect {
   static TIME_FORMAT = "'%Y-%m-%d %H:%M:%S'"
 
   // Cached tries (built lazily from TIME_MAPPING / INVERSE_TIME_MAPPING)
-  private static _TIME_TRIE: Trie | null = null
-  private static _INVERSE_TIME_TRIE: Trie | null = null
+  private static _TIME_TRIE: TrieTable | null = null
+  private static _INVERSE_TIME_TRIE: TrieTable | null = null
 
-  static get TIME_TRIE(): Trie {
+  static get TIME_TRIE(): TrieTable {
     if (!Dialect._TIME_TRIE) {
-      Dialect._TIME_TRIE = newTrie([...Dialect.TIME_MAPPING.keys()])
+      Dialect._TIME_TRIE = compileTrie(Dialect.TIME_MAPPING.keys())
     }
     return Dialect._TIME_TRIE
   }
 
-  static get INVERSE_TIME_TRIE(): Trie {
+  static get INVERSE_TIME_TRIE(): TrieTable {
     if (!Dialect._INVERSE_TIME_TRIE) {
-      Dialect._INVERSE_TIME_TRIE = newTrie([
-        ...Dialect.INVERSE_TIME_MAPPING.keys(),
-      ])
+      Dialect._INVERSE_TIME_TRIE = compileTrie(
+        Dialect.INVERSE_TIME_MAPPING.keys(),
+      )
     }
     return Dialect._INVERSE_TIME_TRIE
   }
@@ -163,6 +170,11 @@ export class Dialect {
     Number.POSITIVE_INFINITY,
   ]
 
+  // Reusable Tokenizer/Parser/Generator instances, keyed by call options
+  private tokenizerPool: Pool<Tokenizer> = new Map()
+  private parserPool: Pool<Parser> = new Map()
+  private generatorPool: Pool<Generator> = new Map()
+
   constructor(protected options: DialectOptions = {}) {}
 
   // Instance getters for feature flags (allow dialect subclasses to override via static)
@@ -286,9 +298,13 @@ export class Dialect {
     })
   }
 
-  createParser(): Parser {
+  createParser(options?: ParserOptions): Parser {
     const tokenizer = this.createTokenizer()
-    const parser = new this.ParserClass({ ...this.options.parser, tokenizer })
+    const parser = new this.ParserClass({
+      ...this.options.parser,
+      ...options,
+      tokenizer,
+    })
     // Dialect implements DialectSettings via getters
     parser.setDialect(this as unknown as import("./parser.js").DialectSettings)
     return parser
@@ -306,27 +322,99 @@ export class Dialect {
     })
   }
 
-  parse(sql: string): Expression[] {
-    const parser = this.createParser()
-    return parser.parse(sql)
+  /**
+   * Run `use` with the pooled instance for `key`, creating it on first use.
+   * Nested calls that find it busy (e.g. a generator transform calling
+   * back into generate) get a fresh instance instead.
+   */
+  private usePooled<T, R>(
+    pool: Pool<T>,
+    key: string,
+    create: () => T,
+    use: (instance: T) => R,
+  ): R {
+    let entry = pool.get(key)
+    if (!entry) {
+      entry = { instance: create(), busy: false }
+      pool.set(key, entry)
+    }
+    if (entry.busy) {
+      return use(create())
+    }
+    entry.busy = true
+    try {
+      return use(entry.instance)
+    } finally {
+      entry.busy = false
+    }
+  }
+
+  private withParser<R>(
+    options: ParserOptions | undefined,
+    use: (parser: Parser) => R,
+  ): R {
+    // A caller-supplied tokenizer cannot be shared
+    if (options?.tokenizer) {
+      return use(this.createParser(options))
+    }
+    const key = options ? JSON.stringify(options) : ""
+    return this.usePooled(
+      this.parserPool,
+      key,
+      () => this.createParser(options),
+      use,
+    )
+  }
+
+  /** Drop pooled instances, e.g. after changing `version` on a copy */
+  resetPools(): void {
+    this.tokenizerPool = new Map()
+    this.parserPool = new Map()
+    this.generatorPool = new Map()
+  }
+
+  tokenize(sql: string): Token[] {
+    return this.usePooled(
+      this.tokenizerPool,
+      "",
+      () => this.createTokenizer(),
+      (tokenizer) => tokenizer.tokenize(sql),
+    )
+  }
+
+  parse(sql: string, options?: ParserOptions): Expression[] {
+    return this.withParser(options, (parser) => parser.parse(sql))
+  }
+
+  /** Parse tokens from an earlier tokenize(); `sql` gives error context */
+  parseTokens(
+    tokens: Token[],
+    sql?: string,
+    options?: ParserOptions,
+  ): Expression[] {
+    return this.withParser(options, (parser) => parser.parse(tokens, sql))
   }
 
   parseOne(sql: string): Expression {
-    const parser = this.createParser()
-    return parser.parseOne(sql)
+    return this.withParser(undefined, (parser) => parser.parseOne(sql))
   }
 
   parseInto(
     expressionTypes: ExpressionClass | ExpressionClass[],
     sql: string,
   ): Expression[] {
-    const parser = this.createParser()
-    return parser.parseInto(expressionTypes, sql)
+    return this.withParser(undefined, (parser) =>
+      parser.parseInto(expressionTypes, sql),
+    )
   }
 
   generate(expression: Expression, options?: GenerateOptions): string {
-    const generator = this.createGenerator(options)
-    return generator.generate(expression)
+    return this.usePooled(
+      this.generatorPool,
+      options ? JSON.stringify(options) : "",
+      () => this.createGenerator(options),
+      (generator) => generator.generate(expression),
+    )
   }
 
   transpile(
@@ -377,6 +465,7 @@ export class Dialect {
         ) as Dialect
         Object.assign(clone, found)
         clone.version = version
+        clone.resetPools()
         return clone
       }
 
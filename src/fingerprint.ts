@@ -0,0 +1,247 @@
+/**
+ * Query fingerprinting and literal parameterization over the token stream
+ */
+
+import { Dialect } from "./dialect.js"
+import { type Token, TokenType } from "./tokens.js"
+
+export interface FingerprintOptions {
+  dialect?: string | Dialect
+}
+
+export interface Fingerprint {
+  /** FNV-1a 64-bit hash of the normalized text, as 16 hex digits */
+  hash: string
+  /** Query text with literals replaced by `?` and case/whitespace normalized */
+  normalized: string
+}
+
+export interface ParameterValue {
+  /** Literal text as tokenized (unquoted for strings, signed for numbers) */
+  value: string
+  tokenType: TokenType
+}
+
+export interface Parameterized extends Fingerprint {
+  /** Extracted literal values, in source order */
+  values: ParameterValue[]
+}
+
+const LITERALS: ReadonlySet<TokenType> = new Set([
+  TokenType.NUMBER,
+  TokenType.STRING,
+  TokenType.BIT_STRING,
+  TokenType.HEX_STRING,
+  TokenType.BYTE_STRING,
+  TokenType.NATIONAL_STRING,
+  TokenType.RAW_STRING,
+])
+
+// Tokens after which a MINUS is binary subtraction rather than a sign
+const OPERAND_ENDS: ReadonlySet<TokenType> = new Set([
+  ...LITERALS,
+  TokenType.VAR,
+  TokenType.IDENTIFIER,
+  TokenType.PARAMETER,
+  TokenType.PLACEHOLDER,
+  TokenType.R_PAREN,
+  TokenType.R_BRACKET,
+  TokenType.R_BRACE,
+  TokenType.NULL,
+  TokenType.TRUE,
+  TokenType.FALSE,
+  TokenType.STAR,
+])
+
+const NO_SPACE_BEFORE: ReadonlySet<TokenType> = new Set([
+  TokenType.COMMA,
+  TokenType.DOT,
+  TokenType.COLONCOLON,
+  TokenType.R_PAREN,
+  TokenType.R_BRACKET,
+])
+
+const NO_SPACE_AFTER: ReadonlySet<TokenType> = new Set([
+  TokenType.COLON,
+  TokenType.DOT,
+  TokenType.COLONCOLON,
+  TokenType.L_PAREN,
+  TokenType.L_BRACKET,
+])
+
+// Call parentheses and subscripts stay attached to the name before them
+const OPENERS: ReadonlySet<TokenType> = new Set([
+  TokenType.L_PAREN,
+  TokenType.L_BRACKET,
+])
+
+const encoder = new TextEncoder()
+
+/**
+ * 64-bit FNV-1a over the UTF-8 bytes of `text`, computed on four 16-bit
+ * limbs so it stays in plain number arithmetic.
+ */
+function fnv1a64(text: string): string {
+  let h0 = 0x2325
+  let h1 = 0x8422
+  let h2 = 0x9ce4
+  let h3 = 0xcbf2
+  for (const byte of encoder.encode(text)) {
+    h0 ^= byte
+    // h * 0x100000001b3 == h * 0x1b3 + (h << 40)
+    const t0 = h0 * 0x1b3
+    const t1 = h1 * 0x1b3 + (t0 >>> 16)
+    const t2 = h2 * 0x1b3 + (h0 << 8) + (t1 >>> 16)
+    h3 = (h3 * 0x1b3 + (h1 << 8) + (t2 >>> 16)) & 0xffff
+    h0 = t0 & 0xffff
+    h1 = t1 & 0xffff
+    h2 = t2 & 0xffff
+  }
+  return [h3, h2, h1, h0].map((h) => h.toString(16).padStart(4, "0")).join("")
+}
+
+/** Length of the signed literal starting at `i`, or 0 if there is none */
+function literalAt(tokens: Token[], i: number): number {
+  const token = tokens[i]!
+  if (LITERALS.has(token.tokenType)) return 1
+  if (
+    token.tokenType === TokenType.MINUS &&
+    tokens[i + 1]?.tokenType === TokenType.NUMBER &&
+    (i === 0 || !OPERAND_ENDS.has(tokens[i - 1]!.tokenType))
+  ) {
+    return 2
+  }
+  return 0
+}
+
+function literalValue(
+  tokens: Token[],
+  i: number,
+  width: number,
+): ParameterValue {
+  const last = tokens[i + width - 1]!
+  const value = width === 2 ? `-${last.text}` : last.text
+  return { value, tokenType: last.tokenType }
+}
+
+/**
+ * Length of an `IN (<literal>, ...)` list starting at the L_PAREN at `i`,
+ * or 0 if the list holds anything other than literals.
+ */
+function literalListAt(tokens: Token[], i: number): number {
+  let j = i + 1
+  for (;;) {
+    const width = literalAt(tokens, j)
+    if (width === 0) return 0
+    j += width
+    const next = tokens[j]!.tokenType
+    if (next === TokenType.R_PAREN) return j + 1 - i
+    if (next !== TokenType.COMMA) return 0
+    j++
+  }
+}
+
+function tokenText(token: Token): string {
+  switch (token.tokenType) {
+    case TokenType.IDENTIFIER:
+      return token.text
+    case TokenType.VAR:
+      return token.text.toLowerCase()
+    default:
+      return token.text.toUpperCase()
+  }
+}
+
+function normalize(sql: string, options: FingerprintOptions): Parameterized {
+  const dialect =
+    options.dialect instanceof Dialect
+      ? options.dialect
+      : Dialect.get(options.dialect)
+  const tokens = dialect.tokenize(sql)
+  let end = tokens.length
+  while (
+    end > 0 &&
+    (tokens[end - 1]!.tokenType === TokenType.EOF ||
+      tokens[end - 1]!.tokenType === TokenType.SEMICOLON)
+  ) {
+    end--
+  }
+
+  const parts: string[] = []
+  const values: ParameterValue[] = []
+  let previous: TokenType | undefined
+  const emit = (text: string, tokenType: TokenType): void => {
+    const glued =
+      previous === undefined ||
+      NO_SPACE_AFTER.has(previous) ||
+      NO_SPACE_BEFORE.has(tokenType) ||
+      (OPENERS.has(tokenType) &&
+        (previous === TokenType.VAR || previous === TokenType.IDENTIFIER))
+    parts.push(glued ? text : ` ${text}`)
+    previous = tokenType
+  }
+
+  let i = 0
+  while (i < end) {
+    const token = tokens[i]!
+    if (
+      token.tokenType === TokenType.IN &&
+      tokens[i + 1]?.tokenType === TokenType.L_PAREN
+    ) {
+      const width = literalListAt(tokens, i + 1)
+      if (width > 0) {
+        for (let j = i + 2; j < i + width; j++) {
+          const literal = literalAt(tokens, j)
+          if (literal > 0) {
+            values.push(literalValue(tokens, j, literal))
+            j += literal - 1
+          }
+        }
+        emit("IN", TokenType.IN)
+        emit("(", TokenType.L_PAREN)
+        emit("?", TokenType.PLACEHOLDER)
+        emit(")", TokenType.R_PAREN)
+        i += width + 1
+        continue
+      }
+    }
+    const literal = literalAt(tokens, i)
+    if (literal > 0) {
+      values.push(literalValue(tokens, i, literal))
+      emit("?", TokenType.PLACEHOLDER)
+      i += literal
+      continue
+    }
+    emit(tokenText(token), token.tokenType)
+    i++
+  }
+
+  const normalized = parts.join("")
+  return { hash: fnv1a64(normalized), normalized, values }
+}
+
+/**
+ * Fingerprint a query from its tokens alone, without parsing.
+ *
+ * Literals become `?`, `IN` lists of literals collapse to `IN (?)`,
+ * keywords are upper-cased, unquoted identifiers lower-cased and whitespace
+ * and comments are dropped, so queries differing only in constants share a
+ * hash.
+ */
+export function fingerprint(
+  sql: string,
+  options: FingerprintOptions = {},
+): Fingerprint {
+  const { hash, normalized } = normalize(sql, options)
+  return { hash, normalized }
+}
+
+/**
+ * Like fingerprint(), but also return the literal values that were replaced.
+ */
+export function parameterize(
+  sql: string,
+  options: FingerprintOptions = {},
+): Parameterized {
+  return normalize(sql, options)
+}
@@ -622,6 +622,7 @@ export class Generator {
   }
 
   generate(expression: exp.Expression, copy = true): string {
+    this.reset()
     if (copy) {
       expression = expression.copy()
     }
@@ -629,6 +630,15 @@ export class Generator {
     return this.sql(expression).trim()
   }
 
+  /**
+   * Clear per-call state so the instance can be reused for another tree.
+   */
+  protected reset(): void {
+    this._nameCounter = 0
+    this.pretty = this.options.pretty ?? false
+    this.identify = this.options.identify ?? false
+  }
+
   preprocess(expression: exp.Expression): exp.Expression {
     expression = this.moveCTEsToTopLevelImpl(expression)
 
@@ -4629,9 +4639,11 @@ export class Generator {
   protected noIdentify<T>(fn: () => T): T {
     const original = this.identify
     this.identify = false
-    const result = fn()
-    this.identify = original
-    return result
+    try {
+      return fn()
+    } finally {
+      this.identify = original
+    }
   }
 
   protected shouldQuote(name: string): boolean {
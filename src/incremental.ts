@@ -0,0 +1,147 @@
+/**
+ * Incremental re-tokenizing and statement-level re-parsing for edited scripts
+ */
+
+import { Dialect } from "./dialect.js"
+import type { ErrorLevel } from "./errors.js"
+import type { Expression } from "./expressions.js"
+import type { ParserOptions } from "./parser.js"
+import { type TextEdit, TokenList, TokenType } from "./tokens.js"
+
+export interface ParsedStatement {
+  /** Token index range `[tokenStart, tokenEnd)`, excluding the semicolon */
+  tokenStart: number
+  tokenEnd: number
+  expression: Expression
+}
+
+export interface ParsedScript {
+  sql: string
+  tokens: TokenList
+  statements: ParsedStatement[]
+  dialect: Dialect
+  parserOptions?: ParserOptions
+}
+
+export interface ParseScriptOptions {
+  dialect?: string | Dialect
+  errorLevel?: ErrorLevel
+}
+
+/** Parse the statements in tokens[from, to); `to` must be a boundary */
+function parseStatements(
+  script: Omit<ParsedScript, "statements">,
+  from: number,
+  to: number,
+): ParsedStatement[] {
+  const { sql, dialect, parserOptions } = script
+  const tokens = script.tokens.slice(from, to)
+  const statements: ParsedStatement[] = []
+  let start = 0
+  for (let i = 0; i <= tokens.length; i++) {
+    const type = tokens[i]?.tokenType
+    if (
+      i < tokens.length &&
+      type !== TokenType.SEMICOLON &&
+      type !== TokenType.EOF
+    ) {
+      continue
+    }
+    if (i > start) {
+      const slice = tokens.slice(start, i)
+      for (const expression of dialect.parseTokens(slice, sql, parserOptions)) {
+        statements.push({
+          tokenStart: from + start,
+          tokenEnd: from + i,
+          expression,
+        })
+      }
+    }
+    start = i + 1
+  }
+  return statements
+}
+
+/** Index of the first statement for which `past` holds; they are sorted */
+function firstStatement(
+  statements: ParsedStatement[],
+  past: (statement: ParsedStatement) => boolean,
+): number {
+  let lo = 0
+  let hi = statements.length
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1
+    if (past(statements[mid]!)) {
+      hi = mid
+    } else {
+      lo = mid + 1
+    }
+  }
+  return lo
+}
+
+/**
+ * Tokenize and parse a script statement by statement, keeping what
+ * reparseScript() needs to reuse work after an edit.
+ */
+export function parseScript(
+  sql: string,
+  options: ParseScriptOptions = {},
+): ParsedScript {
+  const dialect = Dialect.get(options.dialect)
+  const script = {
+    sql,
+    tokens: TokenList.of(dialect.tokenize(sql)),
+    dialect,
+    ...(options.errorLevel
+      ? { parserOptions: { errorLevel: options.errorLevel } }
+      : {}),
+  }
+  const statements = parseStatements(script, 0, script.tokens.length)
+  return { ...script, statements }
+}
+
+/**
+ * Apply `edit` to a parsed script, re-tokenizing only around the edit and
+ * re-parsing only the statements whose tokens changed.
+ *
+ * Statements before and after the edited region keep their previous
+ * Expression objects, so treat those as shared between both results.
+ */
+export function reparseScript(
+  previous: ParsedScript,
+  edit: TextEdit,
+): ParsedScript {
+  const sql =
+    previous.sql.slice(0, edit.offset) +
+    edit.inserted +
+    previous.sql.slice(edit.offset + edit.deleted)
+  const { tokens, restart, resync, previousResync } = previous.dialect
+    .createTokenizer()
+    .retokenize(sql, previous.tokens, edit)
+  const script = { ...previous, sql, tokens }
+
+  // Statements terminated inside the untouched prefix are unchanged
+  const statements = previous.statements
+  const before = statements.slice(
+    0,
+    firstStatement(statements, (s) => s.tokenEnd > restart),
+  )
+  // Statements that start after the resync point moved but did not change
+  const shift = resync - previousResync
+  let after = statements.slice(
+    firstStatement(statements, (s) => s.tokenStart > previousResync),
+  )
+  if (shift !== 0) {
+    after = after.map((s) => ({
+      ...s,
+      tokenStart: s.tokenStart + shift,
+      tokenEnd: s.tokenEnd + shift,
+    }))
+  }
+
+  const from = before.length > 0 ? before[before.length - 1]!.tokenEnd + 1 : 0
+  const to = after.length > 0 ? after[0]!.tokenStart - 1 : tokens.length
+  const changed = parseStatements(script, from, to)
+  return { ...script, statements: [...before, ...changed, ...after] }
+}
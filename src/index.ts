@@ -3,6 +3,11 @@
  * Port of SQLGlot (https://github.com/tobymao/sqlglot)
  */
 
+export {
+  type CacheStats,
+  TranspileCache,
+  type TranspileCacheOptions,
+} from "./cache.js"
 export { Dialect, type DialectOptions } from "./dialect.js"
 export type { ParseErrorDetail } from "./errors.js"
 export { ErrorLevel, ParseError } from "./errors.js"
@@ -51,21 +56,49 @@ export {
   var_,
   xor,
 } from "./expressions.js"
+export {
+  type Fingerprint,
+  type FingerprintOptions,
+  fingerprint,
+  type ParameterValue,
+  type Parameterized,
+  parameterize,
+} from "./fingerprint.js"
 export type { GenerateOptions } from "./generator.js"
 export { Generator } from "./generator.js"
+export {
+  type ParsedScript,
+  type ParsedStatement,
+  type ParseScriptOptions,
+  parseScript,
+  reparseScript,
+} from "./incremental.js"
 export { annotateTypes } from "./optimizer/annotate_types.js"
 export { Parser } from "./parser.js"
 export { dump, load } from "./serde.js"
 export { formatTime } from "./time.js"
-export { Token, Tokenizer, TokenType } from "./tokens.js"
+export {
+  type Retokenized,
+  type TextEdit,
+  Token,
+  TOKEN_TYPE_NAMES,
+  Tokenizer,
+  TokenList,
+  TokenType,
+  tokenTypeCode,
+} from "./tokens.js"
 
+import type { TranspileCache } from "./cache.js"
 import { Dialect } from "./dialect.js"
+import type { ErrorLevel } from "./errors.js"
 import {
   Expression,
   type ExpressionClass,
   type ExpressionConstructor,
+  indexOffsetLogs,
 } from "./expressions.js"
 import type { GenerateOptions } from "./generator.js"
+import { type Token, TokenType } from "./tokens.js"
 
 // Initialize Expression.dump/load methods
 import { dump as _dump, load as _load } from "./serde.js"
@@ -110,10 +143,30 @@ export interface ParseOptions {
     | ExpressionClass[]
 }
 
+export interface SplitOptions {
+  dialect?: string | Dialect
+}
+
+/** Half-open `[start, end)` range of one statement in the source text */
+export interface StatementSpan {
+  start: number
+  end: number
+}
+
 export interface TranspileOptions {
   read?: string | Dialect
   write?: string | Dialect
   pretty?: boolean
+  identify?: boolean | "safe"
+  unsupportedLevel?: "IGNORE" | "WARN" | "RAISE"
+  /** Parser error level for the read side */
+  errorLevel?: ErrorLevel
+  /** Reuse results for repeated inputs */
+  cache?: TranspileCache
+}
+
+function dialectCacheKey(dialect: Dialect): string {
+  return `${dialect.name}@${dialect.version.join(".")}`
 }
 
 /**
@@ -124,6 +177,40 @@ export function parse(sql: string, options: ParseOptions = {}): Expression[] {
   return dialect.parse(sql)
 }
 
+/**
+ * Split a script into statement spans at top-level semicolons without
+ * parsing it.
+ *
+ * Semicolons inside strings, comments and quoted identifiers are handled by
+ * the dialect tokenizer. Each span starts at the first non-whitespace
+ * character after the previous separator, so leading comments stay with
+ * their statement, and ends after its last token. Empty statements are
+ * skipped.
+ */
+export function splitStatements(
+  sql: string,
+  options: SplitOptions = {},
+): StatementSpan[] {
+  const spans: StatementSpan[] = []
+  let spanStart = 0
+  let last: Token | undefined
+  for (const token of Dialect.get(options.dialect).tokenize(sql)) {
+    const type = token.tokenType
+    if (type !== TokenType.SEMICOLON && type !== TokenType.EOF) {
+      last = token
+      continue
+    }
+    if (last) {
+      let start = spanStart
+      while (start < last.start && /\s/.test(sql[start]!)) start++
+      spans.push({ start, end: last.end })
+    }
+    spanStart = token.end
+    last = undefined
+  }
+  return spans
+}
+
 /**
  * Parse a single SQL statement
  */
@@ -162,15 +249,49 @@ export function transpile(
   const readDialect = Dialect.get(options.read)
   const writeDialect = Dialect.get(options.write)
 
-  const expressions = readDialect.parse(sql)
+  const { cache } = options
+  const cacheKey = cache
+    ? [
+        dialectCacheKey(readDialect),
+        dialectCacheKey(writeDialect),
+        options.pretty ?? "",
+        options.identify ?? "",
+        options.unsupportedLevel ?? "",
+        options.errorLevel ?? "",
+        sql,
+      ].join("\0")
+    : ""
+  if (cache) {
+    const cached = cache.get(cacheKey)
+    if (cached) {
+      return cached
+    }
+  }
+
+  const expressions = readDialect.parse(
+    sql,
+    options.errorLevel !== undefined ? { errorLevel: options.errorLevel } : {},
+  )
   const genOptions: GenerateOptions = {}
   if (options.pretty !== undefined) {
     genOptions.pretty = options.pretty
   }
+  if (options.identify !== undefined) {
+    genOptions.identify = options.identify
+  }
+  if (options.unsupportedLevel !== undefined) {
+    genOptions.unsupportedLevel = options.unsupportedLevel
+  }
 
-  return expressions.map((expr: Expression) =>
+  const logged = indexOffsetLogs.length
+  const results = expressions.map((expr: Expression) =>
     writeDialect.generate(expr, genOptions),
   )
+  // A hit skips generate(), so only cache results that logged no warnings
+  if (indexOffsetLogs.length === logged) {
+    cache?.set(cacheKey, results)
+  }
+  return results
 }
 
 /**
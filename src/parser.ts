@@ -10,6 +10,10 @@ import { Token, Tokenizer, TokenType } from "./tokens.js"
 export interface ParserOptions {
   dialect?: string
   tokenizer?: Tokenizer
+  /** How parse errors are reported (default IMMEDIATE) */
+  errorLevel?: ErrorLevel
+  /** Maximum number of errors included in a RAISE message (default 3) */
+  maxErrors?: number
 }
 
 export interface DialectSettings {
@@ -801,6 +805,8 @@ export class Parser {
 
   constructor(_options: ParserOptions = {}) {
     this.tokenizer = _options.tokenizer ?? new Tokenizer()
+    this.errorLevel = _options.errorLevel ?? this.errorLevel
+    this.maxErrors = _options.maxErrors ?? this.maxErrors
     this.functions = new Map((this.constructor as typeof Parser).FUNCTIONS)
     this.functionParsers = new Map(
       (this.constructor as typeof Parser).FUNCTION_PARSERS,
@@ -862,8 +868,14 @@ export class Parser {
     }
   }
 
-  parse(sql: string): exp.Expression[] {
-    return this._parseUsing(sql, (p) => p.parseStatement())
+  /**
+   * Parse SQL text, or tokens a tokenizer already produced for it.
+   *
+   * When parsing tokens, pass the source text as `sql` so error messages
+   * and raw-text fallbacks (e.g. Command) can slice it by token offsets.
+   */
+  parse(sqlOrTokens: string | Token[], sql?: string): exp.Expression[] {
+    return this._parseUsing(sqlOrTokens, (p) => p.parseStatement(), sql)
   }
 
   parseInto(
@@ -899,14 +911,26 @@ export class Parser {
     )
   }
 
+  /**
+   * Clear per-parse state so the instance can be reused for another input.
+   */
+  protected reset(): void {
+    this.sql = ""
+    this.errors = []
+    this.tokens = []
+    this.index = 0
+    this.prevComments = undefined
+  }
+
   private _parseUsing(
-    sql: string,
+    input: string | Token[],
     parseMethod: ExpressionParser,
+    sql?: string,
   ): exp.Expression[] {
-    this.sql = sql
-    this.errors = []
-    this.tokens = this.tokenizer.tokenize(sql)
-    this.index = 0
+    this.reset()
+    this.sql = typeof input === "string" ? input : (sql ?? "")
+    this.tokens =
+      typeof input === "string" ? this.tokenizer.tokenize(input) : input
 
     const expressions: exp.Expression[] = []
 
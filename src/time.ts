@@ -2,7 +2,26 @@
  * Time format conversion utilities
  */
 
-import { type Trie, TrieResult, inTrie, newTrie } from "./trie.js"
+import { type TrieTable, compileTrie, trieStep } from "./trie.js"
+
+const compiledMappings = new WeakMap<Map<string, string>, TrieTable>()
+
+function mappingTrie(mapping: Map<string, string>): TrieTable {
+  let trie = compiledMappings.get(mapping)
+  // Recompile if keys were added, removed or replaced after it was cached;
+  // values are read from the mapping itself, so they may change freely. The
+  // check costs one has() per key on every call, which is small next to
+  // compiling; callers on a hot path can pass a precompiled trie to skip it
+  if (
+    !trie ||
+    trie.keys.length !== mapping.size ||
+    !trie.keys.every((key) => mapping.has(key))
+  ) {
+    trie = compileTrie(mapping.keys())
+    compiledMappings.set(mapping, trie)
+  }
+  return trie
+}
 
 /**
  * Converts a date/time format string from one format to another using a mapping.
@@ -11,40 +30,37 @@ import { type Trie, TrieResult, inTrie, newTrie } from "./trie.js"
 export function formatTime(
   format: string,
   mapping: Map<string, string>,
-  trie?: Trie,
+  trie?: TrieTable,
 ): string {
   if (mapping.size === 0) {
     return format
   }
 
-  if (!trie) {
-    trie = newTrie([...mapping.keys()])
-  }
+  trie ??= mappingTrie(mapping)
 
   let result = ""
   let i = 0
 
   while (i < format.length) {
-    let currentTrie: Trie = trie
-    let longestMatch = ""
+    let state = 0
+    let longestMatch = -1
     let longestMatchEnd = i
 
     // Find longest matching prefix using trie
     for (let j = i; j < format.length; j++) {
-      const char = format[j]!
-      const [trieResult, nextTrie] = inTrie(currentTrie, char)
-
-      if (trieResult === TrieResult.FAILED) break
+      state = trieStep(trie, state, format.charCodeAt(j))
+      if (state < 0) break
 
-      currentTrie = nextTrie
-      if (trieResult === TrieResult.EXISTS) {
-        longestMatch = format.slice(i, j + 1)
+      const key = trie.terminal[state]!
+      if (key > 0) {
+        longestMatch = key - 1
         longestMatchEnd = j + 1
       }
     }
 
-    if (longestMatch) {
-      result += mapping.get(longestMatch) ?? longestMatch
+    if (longestMatch >= 0) {
+      const key = trie.keys[longestMatch]!
+      result += mapping.get(key) ?? key
       i = longestMatchEnd
     } else {
       result += format[i]
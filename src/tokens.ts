@@ -2,7 +2,7 @@
  * Token types and tokenizer for SQL parsing
  */
 
-import { type Trie, TrieResult, inTrie, newTrie } from "./trie.js"
+import { type TrieTable, compileTrie, trieStep, trieWalk } from "./trie.js"
 
 export enum TokenType {
   // Literals
@@ -312,6 +312,18 @@ export enum TokenType {
   EOF = "EOF",
 }
 
+/** Token type names in code order: a type's integer code is its index */
+export const TOKEN_TYPE_NAMES: readonly TokenType[] = Object.values(TokenType)
+
+const TOKEN_TYPE_CODES: ReadonlyMap<TokenType, number> = new Map(
+  TOKEN_TYPE_NAMES.map((name, code) => [name, code]),
+)
+
+/** Dense integer code of a token type, for compact token encodings */
+export function tokenTypeCode(tokenType: TokenType): number {
+  return TOKEN_TYPE_CODES.get(tokenType)!
+}
+
 export class Token {
   constructor(
     public readonly tokenType: TokenType,
@@ -552,6 +564,10 @@ const MULTI_WORD_KEYWORDS: Map<string, TokenType> = new Map([
   ["SORT BY", TokenType.SORT_BY],
 ])
 
+const MULTI_WORD_TRIE = compileTrie(MULTI_WORD_KEYWORDS.keys(), {
+  ignoreCase: true,
+})
+
 const SINGLE_TOKENS: Map<string, TokenType> = new Map([
   ["(", TokenType.L_PAREN],
   [")", TokenType.R_PAREN],
@@ -597,23 +613,291 @@ export interface TokenizerOptions {
   unescapedSequences?: Record<string, string> // e.g., {"\\n": "\n", ...}
 }
 
+/** A text edit: `deleted` characters at `offset` replaced by `inserted` */
+export interface TextEdit {
+  offset: number
+  deleted: number
+  inserted: string
+}
+
+export interface Retokenized {
+  tokens: TokenList
+  /** Tokens before this index are carried over from `previous` unchanged */
+  restart: number
+  /**
+   * Tokens from this index on were carried over from `previousResync` in the
+   * previous array; equals `tokens.length` if the scan never resynced
+   */
+  resync: number
+  previousResync: number
+}
+
+// Character classes of ASCII codes for the scanner's hot loops
+const DIGIT = 1
+const IDENT_START = 2
+const SPACE = 4
+const QUOTE = 8
+const IDENTIFIER_QUOTE = 16
+const WORD = DIGIT | IDENT_START
+
+const CHAR_CLASS = new Uint8Array(128)
+for (let code = 0x30; code <= 0x39; code++) CHAR_CLASS[code] = DIGIT
+for (let code = 0x41; code <= 0x5a; code++) {
+  CHAR_CLASS[code] = IDENT_START
+  CHAR_CLASS[code + 0x20] = IDENT_START
+}
+CHAR_CLASS[0x5f] = IDENT_START // _
+for (const code of [0x09, 0x0a, 0x0b, 0x0c, 0x0d, 0x20]) {
+  CHAR_CLASS[code] = SPACE
+}
+
+function isSpaceCode(code: number): boolean {
+  return code < 128
+    ? (CHAR_CLASS[code]! & SPACE) !== 0
+    : /\s/.test(String.fromCharCode(code))
+}
+
+function isDigitCode(code: number): boolean {
+  return code >= 0x30 && code <= 0x39
+}
+
+// Unconsumed input of a push()/end() stream, starting at a token boundary
+interface StreamState {
+  buffer: string
+  /** Offset of buffer[0] in the whole stream, and the position there */
+  base: number
+  line: number
+  col: number
+  /** Buffer length to wait for before rescanning an unterminated tail */
+  retryAt: number
+}
+
+/** Index of the last token ending before `offset`, or -1 */
+function lastTokenEndingBefore(tokens: TokenList, offset: number): number {
+  let lo = 0
+  let hi = tokens.length
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1
+    if (tokens.at(mid)!.end < offset) {
+      lo = mid + 1
+    } else {
+      hi = mid
+    }
+  }
+  return lo - 1
+}
+
+/**
+ * How far a run of tokens moved: offsets and lines by a fixed amount, and
+ * columns only on the lines an edit shifted, keyed by the unshifted line
+ */
+export interface TokenShift {
+  offset: number
+  line: number
+  cols: Map<number, number>
+}
+
+/** tokens[from, to), moved by `shift`, starting at `index` in its list */
+export interface TokenPiece {
+  tokens: Token[]
+  from: number
+  to: number
+  index: number
+  shift?: TokenShift
+}
+
+// Past this many pieces, the smallest neighbours are copied into one array
+const MAX_TOKEN_PIECES = 32
+
+function pieceSize(piece: TokenPiece): number {
+  return piece.to - piece.from
+}
+
+function shiftToken(token: Token, shift: TokenShift | undefined): Token {
+  if (!shift) return token
+  return new Token(
+    token.tokenType,
+    token.text,
+    token.line + shift.line,
+    token.col + (shift.cols.get(token.line) ?? 0),
+    token.start + shift.offset,
+    token.end + shift.offset,
+    token.comments,
+  )
+}
+
+/**
+ * A read-only token sequence made of slices of other token arrays.
+ *
+ * retokenize() returns one so that the tokens behind an edit are carried
+ * over as a shifted slice of the previous list rather than copied one by
+ * one; at() and slice() build the moved Token objects on demand.
+ */
+export class TokenList implements Iterable<Token> {
+  private constructor(
+    private readonly pieces: TokenPiece[],
+    readonly length: number,
+  ) {}
+
+  static of(tokens: Token[]): TokenList {
+    return new TokenList(
+      tokens.length > 0
+        ? [{ tokens, from: 0, to: tokens.length, index: 0 }]
+        : [],
+      tokens.length,
+    )
+  }
+
+  at(index: number): Token | undefined {
+    if (index < 0 || index >= this.length) return undefined
+    const piece = this.pieces[this.pieceAt(index)]!
+    return shiftToken(
+      piece.tokens[piece.from + index - piece.index]!,
+      piece.shift,
+    )
+  }
+
+  slice(start = 0, end = this.length): Token[] {
+    const tokens: Token[] = []
+    for (const piece of this.range(start, end)) {
+      for (let i = piece.from; i < piece.to; i++) {
+        tokens.push(shiftToken(piece.tokens[i]!, piece.shift))
+      }
+    }
+    return tokens
+  }
+
+  toArray(): Token[] {
+    return this.slice()
+  }
+
+  *[Symbol.iterator](): Iterator<Token> {
+    for (const piece of this.pieces) {
+      for (let i = piece.from; i < piece.to; i++) {
+        yield shiftToken(piece.tokens[i]!, piece.shift)
+      }
+    }
+  }
+
+  /** Pieces covering [start, end) of this list */
+  range(start: number, end = this.length): TokenPiece[] {
+    const pieces: TokenPiece[] = []
+    if (start >= end) return pieces
+    for (let p = this.pieceAt(start); p < this.pieces.length; p++) {
+      const piece = this.pieces[p]!
+      if (piece.index >= end) break
+      const from = piece.from + Math.max(start - piece.index, 0)
+      const to = piece.from + Math.min(end - piece.index, pieceSize(piece))
+      pieces.push({ ...piece, from, to })
+    }
+    return pieces
+  }
+
+  /**
+   * Pieces for [start, length) moved by `offset` characters and `line`
+   * lines, plus `col` columns for the tokens on line `colLine`
+   */
+  moved(
+    start: number,
+    offset: number,
+    line: number,
+    col: number,
+    colLine: number,
+  ): TokenPiece[] {
+    const pieces = this.range(start)
+    if (offset === 0 && line === 0 && col === 0) return pieces
+    return pieces.map((piece) => {
+      const base = piece.shift
+      const cols = new Map(base?.cols)
+      if (col !== 0) {
+        const key = colLine - (base?.line ?? 0)
+        cols.set(key, (cols.get(key) ?? 0) + col)
+      }
+      const shift = {
+        offset: (base?.offset ?? 0) + offset,
+        line: (base?.line ?? 0) + line,
+        cols,
+      }
+      return { ...piece, shift }
+    })
+  }
+
+  /** Join pieces from range()/moved() and plain token arrays into a list */
+  static concat(...parts: (TokenPiece[] | Token[])[]): TokenList {
+    const pieces: TokenPiece[] = []
+    for (const part of parts) {
+      if (part.length === 0) continue
+      if (part[0] instanceof Token) {
+        const tokens = part as Token[]
+        pieces.push({ tokens, from: 0, to: tokens.length, index: 0 })
+      } else {
+        pieces.push(...(part as TokenPiece[]))
+      }
+    }
+    while (pieces.length > MAX_TOKEN_PIECES) {
+      const pairSize = (p: number) =>
+        pieceSize(pieces[p]!) + pieceSize(pieces[p + 1]!)
+      let smallest = 0
+      for (let p = 1; p + 1 < pieces.length; p++) {
+        if (pairSize(p) < pairSize(smallest)) smallest = p
+      }
+      const tokens: Token[] = []
+      for (const piece of pieces.slice(smallest, smallest + 2)) {
+        for (let i = piece.from; i < piece.to; i++) {
+          tokens.push(shiftToken(piece.tokens[i]!, piece.shift))
+        }
+      }
+      const merged = { tokens, from: 0, to: tokens.length, index: 0 }
+      pieces.splice(smallest, 2, merged)
+    }
+    let length = 0
+    for (let p = 0; p < pieces.length; p++) {
+      pieces[p] = { ...pieces[p]!, index: length }
+      length += pieceSize(pieces[p]!)
+    }
+    return new TokenList(pieces, length)
+  }
+
+  /** Index of the piece holding list position `index` */
+  private pieceAt(index: number): number {
+    let lo = 0
+    let hi = this.pieces.length - 1
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >>> 1
+      if (this.pieces[mid]!.index <= index) {
+        lo = mid
+      } else {
+        hi = mid - 1
+      }
+    }
+    return lo
+  }
+}
+
 export class Tokenizer {
   private sql = ""
   private pos = 0
+  /** Offset of sql[0] in the whole input, non-zero only while streaming */
+  private base = 0
   private line = 1
-  private col = 0
+  /** Offset of the current line's first character; col is derived from it */
+  private lineStart = 0
   private tokens: Token[] = []
   private comments: string[] = []
+  private stream: StreamState | undefined
   private keywords: Map<string, TokenType>
   private singleTokens: Map<string, TokenType>
-  private keywordTrie: Trie
+  private keywordTrie: TrieTable
   private identifierChars: Set<string>
   private quoteChars: Set<string>
+  /** CHAR_CLASS plus this dialect's quote characters */
+  private charClass: Uint8Array
   private numbersCanBeUnderscoreSeparated: boolean
   private formatStrings: Map<string, [string, TokenType]> // prefix -> [end_quote, token_type]
   private hasBitStrings: boolean
   private hasHexStrings: boolean
   private stringEscapes: Set<string>
+  private escapeCodes: Set<number>
   private unescapedSequences: Record<string, string>
 
   constructor(options: TokenizerOptions = {}) {
@@ -624,9 +908,7 @@ export class Tokenizer {
       }
     }
     this.singleTokens = new Map(SINGLE_TOKENS)
-    this.keywordTrie = newTrie(
-      [...MULTI_WORD_KEYWORDS.keys()].map((k) => k.toUpperCase()),
-    )
+    this.keywordTrie = MULTI_WORD_TRIE
     this.identifierChars = new Set(options.identifiers ?? ['"', "`"])
     this.quoteChars = new Set(options.quotes ?? ["'"])
     this.numbersCanBeUnderscoreSeparated =
@@ -659,17 +941,34 @@ export class Tokenizer {
       }
     }
 
+    this.charClass = CHAR_CLASS.slice()
+    for (const [chars, flag] of [
+      [this.quoteChars, QUOTE],
+      [this.identifierChars, IDENTIFIER_QUOTE],
+    ] as const) {
+      for (const ch of chars) {
+        const code = ch.charCodeAt(0)
+        if (ch.length === 1 && code < 128) this.charClass[code]! |= flag
+      }
+    }
+
     this.hasBitStrings = (options.bitStrings?.length ?? 0) > 0
     this.hasHexStrings = (options.hexStrings?.length ?? 0) > 0
     this.stringEscapes = new Set(options.stringEscapes ?? ["'"])
+    this.escapeCodes = new Set(
+      [...this.stringEscapes]
+        .filter((escape) => escape.length === 1)
+        .map((escape) => escape.charCodeAt(0)),
+    )
     this.unescapedSequences = options.unescapedSequences ?? {}
   }
 
   tokenize(sql: string): Token[] {
     this.sql = sql
     this.pos = 0
+    this.base = 0
     this.line = 1
-    this.col = 0
+    this.lineStart = 0
     this.tokens = []
     this.comments = []
 
@@ -677,6 +976,199 @@ export class Tokenizer {
       this.scanToken()
     }
 
+    return this.finish()
+  }
+
+  /**
+   * Re-tokenize `sql`, the result of applying `edit` to the text that
+   * produced `previous`.
+   *
+   * Scanning restarts at the end of a comment-free token safely before the
+   * edit, which is always outside any string or comment, and stops as soon
+   * as a token scanned past the edit lines up with a previous one. The
+   * tokens before the restart and after that point are shared with
+   * `previous`, the latter as a shifted slice, so the work is proportional
+   * to the edited region rather than the whole text.
+   */
+  retokenize(
+    sql: string,
+    previous: TokenList | Token[],
+    edit: TextEdit,
+  ): Retokenized {
+    const prev =
+      previous instanceof TokenList ? previous : TokenList.of(previous)
+    // One token of slack before the edit covers scanner lookahead
+    let anchor = lastTokenEndingBefore(prev, edit.offset) - 1
+    while (anchor >= 0 && prev.at(anchor)!.comments.length > 0) anchor--
+    const restart = Math.max(anchor, 0)
+    const prefix = prev.range(0, restart)
+
+    this.sql = sql
+    this.base = 0
+    this.comments = []
+    this.tokens = []
+    const from = prev.at(anchor)
+    if (from) {
+      // Copy the anchor: comments found while rescanning may attach to it
+      this.tokens.push(
+        new Token(
+          from.tokenType,
+          from.text,
+          from.line,
+          from.col,
+          from.start,
+          from.end,
+        ),
+      )
+    }
+    this.pos = from?.end ?? 0
+    this.line = from?.line ?? 1
+    this.lineStart = this.pos - (from?.col ?? 0)
+
+    const editEnd = edit.offset + edit.inserted.length
+    const delta = edit.inserted.length - edit.deleted
+    let candidate = restart
+    let old = prev.at(candidate)
+    while (this.pos < this.sql.length) {
+      const count = this.tokens.length
+      const gapStart = this.tokens[count - 1]?.end ?? 0
+      this.scanToken()
+      const token = this.tokens[count]
+      // Only tokens whose leading gaps are the same text past the edit on
+      // both sides can resync, so they carry the same comments
+      if (!token || gapStart < editEnd) continue
+
+      while (old && old.start + delta < token.start) {
+        old = prev.at(++candidate)
+      }
+      const oldGapStart = prev.at(candidate - 1)?.end ?? 0
+      if (
+        old &&
+        oldGapStart >= edit.offset + edit.deleted &&
+        oldGapStart + delta === gapStart &&
+        old.start + delta === token.start &&
+        old.end + delta === token.end &&
+        old.tokenType === token.tokenType &&
+        old.text === token.text
+      ) {
+        this.tokens.pop()
+        const scanned = this.tokens
+        const suffix = prev.moved(
+          candidate,
+          delta,
+          token.line - old.line,
+          token.col - old.col,
+          old.line,
+        )
+        return {
+          tokens: TokenList.concat(prefix, scanned, suffix),
+          restart,
+          resync: restart + scanned.length,
+          previousResync: candidate,
+        }
+      }
+    }
+
+    const tokens = TokenList.concat(prefix, this.finish())
+    return {
+      tokens,
+      restart,
+      resync: tokens.length,
+      previousResync: prev.length,
+    }
+  }
+
+  /**
+   * Feed the next chunk of a streamed script and return the tokens it
+   * completed; call end() after the last chunk for the rest.
+   *
+   * Strings, comments and dollar-quoted strings may span chunks. Only the
+   * text after the last returned token is kept, and the last two scanned
+   * tokens are held back since more input may still extend them (`1` +
+   * `.5`, `ORDER` + ` BY`).
+   */
+  push(chunk: string): Token[] {
+    this.stream ??= { buffer: "", base: 0, line: 1, col: 0, retryAt: 0 }
+    const stream = this.stream
+    stream.buffer += chunk
+    // Rescanning an unterminated string on every chunk would be quadratic
+    if (stream.buffer.length < stream.retryAt) return []
+
+    this.resume(stream)
+    let complete = true
+    try {
+      while (this.pos < this.sql.length) {
+        this.scanToken()
+      }
+    } catch {
+      // Unterminated tail; end() reports it if no later chunk closes it
+      complete = false
+    }
+
+    let emit = this.tokens.length - 2
+    // Comments before ; are attached to the token preceding it
+    while (emit > 0 && this.tokens[emit]!.tokenType === TokenType.SEMICOLON) {
+      emit--
+    }
+    const last = this.tokens[emit - 1]
+    if (last) {
+      stream.buffer = stream.buffer.slice(last.end - stream.base)
+      stream.base = last.end
+      stream.line = last.line
+      stream.col = last.col
+    }
+    stream.retryAt = complete ? 0 : stream.buffer.length * 2
+    return this.tokens.slice(0, Math.max(emit, 0))
+  }
+
+  /** Finish a push() stream, returning its remaining tokens and EOF */
+  end(): Token[] {
+    const stream = this.stream ?? {
+      buffer: "",
+      base: 0,
+      line: 1,
+      col: 0,
+      retryAt: 0,
+    }
+    this.stream = undefined
+    this.resume(stream)
+    while (this.pos < this.sql.length) {
+      this.scanToken()
+    }
+    return this.finish()
+  }
+
+  /** Tokenize a script given as chunks, yielding tokens as they complete */
+  *tokenizeChunks(chunks: Iterable<string>): Generator<Token> {
+    this.stream = undefined
+    for (const chunk of chunks) {
+      yield* this.push(chunk)
+    }
+    yield* this.end()
+  }
+
+  /** Async counterpart of tokenizeChunks(), e.g. for a utf-8 file stream */
+  async *tokenizeStream(
+    chunks: AsyncIterable<string> | Iterable<string>,
+  ): AsyncGenerator<Token> {
+    this.stream = undefined
+    for await (const chunk of chunks) {
+      yield* this.push(chunk)
+    }
+    yield* this.end()
+  }
+
+  private resume(stream: StreamState): void {
+    this.sql = stream.buffer
+    this.pos = 0
+    this.base = stream.base
+    this.line = stream.line
+    this.lineStart = -stream.col
+    this.tokens = []
+    this.comments = []
+  }
+
+  private finish(): Token[] {
     // Attach trailing comments to the last real token (Python behavior)
     const lastToken = this.tokens[this.tokens.length - 1]
     if (this.comments.length > 0 && lastToken) {
@@ -696,18 +1188,55 @@ export class Tokenizer {
     return this.sql[this.pos + 1] ?? ""
   }
 
+  private get col(): number {
+    return this.pos - this.lineStart
+  }
+
   private advance(): string {
     const ch = this.current
-    this.pos++
     if (ch === "\n") {
       this.line++
-      this.col = 0
-    } else {
-      this.col++
+      this.lineStart = this.pos + 1
     }
+    this.pos++
     return ch
   }
 
+  /** Move forward to `end`, counting the newlines passed over */
+  private advanceTo(end: number): void {
+    const sql = this.sql
+    for (let pos = this.pos; pos < end; pos++) {
+      if (sql.charCodeAt(pos) === 0x0a) {
+        this.line++
+        this.lineStart = pos + 1
+      }
+    }
+    this.pos = end
+  }
+
+  /** Advance past a run of identifier characters */
+  private skipWord(): void {
+    const sql = this.sql
+    let pos = this.pos
+    while (pos < sql.length) {
+      const code = sql.charCodeAt(pos)
+      if (code >= 128 || (CHAR_CLASS[code]! & WORD) === 0) break
+      pos++
+    }
+    this.pos = pos
+  }
+
+  private skipDigits(underscores: boolean): void {
+    const sql = this.sql
+    let pos = this.pos
+    while (pos < sql.length) {
+      const code = sql.charCodeAt(pos)
+      if (!isDigitCode(code) && !(underscores && code === 0x5f)) break
+      pos++
+    }
+    this.pos = pos
+  }
+
   private addToken(type: TokenType, text: string, start?: number): void {
     // Comments before ; go to the preceding token (Python behavior)
     if (
@@ -727,8 +1256,8 @@ export class Tokenizer {
       text,
       this.line,
       this.col,
-      start ?? this.pos - text.length,
-      this.pos,
+      this.base + (start ?? this.pos - text.length),
+      this.base + this.pos,
       this.comments,
     )
     this.tokens.push(token)
@@ -744,27 +1273,33 @@ export class Tokenizer {
 
     const ch = this.current
     const start = this.pos
+    const code = this.sql.charCodeAt(start)
+    const next = this.sql.charCodeAt(start + 1)
+    const charClass = code < 128 ? this.charClass[code]! : 0
 
     // Single-line comment
-    if (ch === "-" && this.peek === "-") {
+    if (code === 0x2d && next === 0x2d) {
       this.scanLineComment()
       return
     }
 
     // Block comment
-    if (ch === "/" && this.peek === "*") {
+    if (code === 0x2f && next === 0x2a) {
       this.scanBlockComment()
       return
     }
 
     // String - check configurable quotes (also checks format strings like N'...')
-    if (this.quoteChars.has(ch)) {
+    if (charClass & QUOTE || (code >= 128 && this.quoteChars.has(ch))) {
       this.scanString(ch, TokenType.STRING)
       return
     }
 
     // Quoted identifier - check configurable delimiters
-    if (this.identifierChars.has(ch)) {
+    if (
+      charClass & IDENTIFIER_QUOTE ||
+      (code >= 128 && this.identifierChars.has(ch))
+    ) {
       if (ch === "[") {
         this.scanBracketIdentifier()
       } else {
@@ -774,13 +1309,13 @@ export class Tokenizer {
     }
 
     // Number
-    if (this.isDigit(ch) || (ch === "." && this.isDigit(this.peek))) {
+    if (charClass & DIGIT || (code === 0x2e && isDigitCode(next))) {
       this.scanNumber()
       return
     }
 
     // Identifier or keyword
-    if (this.isAlpha(ch) || ch === "_") {
+    if (charClass & IDENT_START) {
       this.scanIdentifier()
       return
     }
@@ -1036,9 +1571,19 @@ export class Tokenizer {
   }
 
   private skipWhitespace(): void {
-    while (this.pos < this.sql.length && /\s/.test(this.current)) {
-      this.advance()
+    const sql = this.sql
+    let pos = this.pos
+    while (pos < sql.length) {
+      const code = sql.charCodeAt(pos)
+      if (code === 0x0a) {
+        this.line++
+        this.lineStart = pos + 1
+      } else if (!isSpaceCode(code)) {
+        break
+      }
+      pos++
     }
+    this.pos = pos
   }
 
   private scanLineComment(): void {
@@ -1046,9 +1591,8 @@ export class Tokenizer {
     this.advance() // -
 
     const start = this.pos
-    while (this.pos < this.sql.length && this.current !== "\n") {
-      this.advance()
-    }
+    const end = this.sql.indexOf("\n", start)
+    this.pos = end < 0 ? this.sql.length : end
 
     this.comments.push(this.sql.slice(start, this.pos))
   }
@@ -1058,21 +1602,24 @@ export class Tokenizer {
     this.advance() // *
 
     const start = this.pos
+    const sql = this.sql
+    let pos = start
     let depth = 1
 
-    while (this.pos < this.sql.length && depth > 0) {
-      if (this.current === "/" && this.peek === "*") {
+    while (pos < sql.length && depth > 0) {
+      const code = sql.charCodeAt(pos)
+      const next = sql.charCodeAt(pos + 1)
+      if (code === 0x2f && next === 0x2a) {
         depth++
-        this.advance()
-        this.advance()
-      } else if (this.current === "*" && this.peek === "/") {
+        pos += 2
+      } else if (code === 0x2a && next === 0x2f) {
         depth--
-        this.advance()
-        this.advance()
+        pos += 2
       } else {
-        this.advance()
+        pos++
       }
     }
+    this.advanceTo(Math.min(pos, sql.length))
 
     if (depth > 0) {
       throw new Error(`Unterminated block comment at line ${this.line}`)
@@ -1092,9 +1639,26 @@ export class Tokenizer {
     const delimiter = endQuote ?? quote
     const escapes = this.stringEscapes
     const hasUnescapedSeqs = Object.keys(this.unescapedSequences).length > 0
+    const delimiterCode =
+      delimiter.length === 1 ? delimiter.charCodeAt(0) : -1
+    const escapeCodes = this.escapeCodes
     let text = ""
 
     while (this.pos < this.sql.length) {
+      // Copy a run of plain characters in one slice
+      const runStart = this.pos
+      let runEnd = runStart
+      while (runEnd < this.sql.length) {
+        const code = this.sql.charCodeAt(runEnd)
+        if (code === delimiterCode || escapeCodes.has(code)) break
+        runEnd++
+      }
+      if (runEnd > runStart) {
+        text += this.sql.slice(runStart, runEnd)
+        this.advanceTo(runEnd)
+        continue
+      }
+
       // Check UNESCAPED_SEQUENCES first (e.g., \n → newline)
       if (hasUnescapedSeqs && escapes.has(this.current) && this.peek) {
         const seq = this.current + this.peek
@@ -1202,19 +1766,12 @@ export class Tokenizer {
     }
 
     // Integer part
-    while (
-      this.isDigit(this.current) ||
-      (this.current === "_" && this.numbersCanBeUnderscoreSeparated)
-    ) {
-      this.advance()
-    }
+    this.skipDigits(this.numbersCanBeUnderscoreSeparated)
 
     // Decimal part
     if (this.current === "." && this.isDigit(this.peek)) {
       this.advance() // .
-      while (this.isDigit(this.current)) {
-        this.advance()
-      }
+      this.skipDigits(false)
     }
 
     // Exponent
@@ -1225,12 +1782,7 @@ export class Tokenizer {
       if (sign === "+" || sign === "-") {
         this.advance()
       }
-      while (
-        this.isDigit(this.current) ||
-        (this.current === "_" && this.numbersCanBeUnderscoreSeparated)
-      ) {
-        this.advance()
-      }
+      this.skipDigits(this.numbersCanBeUnderscoreSeparated)
     }
 
     const text = this.sql.slice(start, this.pos)
@@ -1262,18 +1814,14 @@ export class Tokenizer {
       }
     }
 
-    while (this.isAlphaNumeric(this.current) || this.current === "_") {
-      this.advance()
-    }
-
-    const text = this.sql.slice(start, this.pos)
-    const upper = text.toUpperCase()
+    this.skipWord()
 
-    if (this.tryMultiWordKeyword(upper, start)) {
+    if (this.tryMultiWordKeyword(start)) {
       return
     }
 
-    const keywordType = this.keywords.get(upper)
+    const text = this.sql.slice(start, this.pos)
+    const keywordType = this.keywords.get(text.toUpperCase())
     if (keywordType) {
       this.addToken(keywordType, text, start)
     } else {
@@ -1281,58 +1829,54 @@ export class Tokenizer {
     }
   }
 
-  private tryMultiWordKeyword(firstWord: string, start: number): boolean {
-    const [result] = inTrie(this.keywordTrie, firstWord)
-    if (result === TrieResult.FAILED) {
+  private tryMultiWordKeyword(start: number): boolean {
+    const trie = this.keywordTrie
+    let state = trieWalk(trie, 0, this.sql, start, this.pos)
+    if (state < 0) {
       return false
     }
 
+    // Only spaces and tabs separate the words, so the line does not change
     const savedPos = this.pos
-    const savedLine = this.line
-    const savedCol = this.col
-
-    let accumulated = firstWord
+    const sql = this.sql
 
     while (true) {
-      const wsStart = this.pos
-      while (this.pos < this.sql.length && /[ \t]/.test(this.current)) {
-        this.advance()
+      let wordStart = this.pos
+      while (
+        sql.charCodeAt(wordStart) === 0x20 ||
+        sql.charCodeAt(wordStart) === 0x09
+      ) {
+        wordStart++
       }
-
-      if (!this.isAlpha(this.current) && this.current !== "_") {
-        this.pos = wsStart
-        this.line = savedLine
-        this.col = savedCol + (wsStart - savedPos)
+      const code = sql.charCodeAt(wordStart)
+      if (!(code < 128 && CHAR_CLASS[code]! & IDENT_START)) {
         break
       }
 
-      const wordStart = this.pos
-      while (this.isAlphaNumeric(this.current) || this.current === "_") {
-        this.advance()
-      }
-      const nextWord = this.sql.slice(wordStart, this.pos).toUpperCase()
-
-      const candidate = `${accumulated} ${nextWord}`
-      const [candidateResult] = inTrie(this.keywordTrie, candidate)
+      this.pos = wordStart
+      this.skipWord()
 
-      if (candidateResult === TrieResult.EXISTS) {
-        const kwType = MULTI_WORD_KEYWORDS.get(candidate)
+      // Keys separate words with a single space
+      state = trieStep(trie, state, 0x20)
+      if (state >= 0) {
+        state = trieWalk(trie, state, sql, wordStart, this.pos)
+      }
+      if (state < 0) {
+        break
+      }
+      const key = trie.terminal[state]!
+      if (key > 0) {
+        const kwType = MULTI_WORD_KEYWORDS.get(trie.keys[key - 1]!)
         if (kwType) {
-          const fullText = this.sql.slice(start, this.pos)
+          const fullText = sql.slice(start, this.pos)
           this.addToken(kwType, fullText, start)
           return true
         }
-      } else if (candidateResult === TrieResult.PREFIX) {
-        accumulated = candidate
-        continue
+        break
       }
-
-      break
     }
 
     this.pos = savedPos
-    this.line = savedLine
-    this.col = savedCol
     return false
   }
 
@@ -1340,12 +1884,8 @@ export class Tokenizer {
     const start = this.pos
     this.advance() // Opening quote
 
-    while (this.pos < this.sql.length && this.current !== quote) {
-      if (this.current === quote && this.peek === quote) {
-        this.advance()
-      }
-      this.advance()
-    }
+    const end = this.sql.indexOf(quote, this.pos)
+    this.advanceTo(end < 0 ? this.sql.length : end)
 
     if (this.current !== quote) {
       throw new Error(`Unterminated identifier at line ${this.line}`)
@@ -1471,16 +2011,8 @@ export class Tokenizer {
     const closeDelim = `$${tag}$`
 
     // Find closing delimiter
-    while (this.pos < this.sql.length) {
-      if (this.current === "$") {
-        // Check if this is the closing delimiter
-        const remaining = this.sql.slice(this.pos, this.pos + closeDelim.length)
-        if (remaining === closeDelim) {
-          break
-        }
-      }
-      this.advance()
-    }
+    const close = this.sql.indexOf(closeDelim, this.pos)
+    this.advanceTo(close < 0 ? this.sql.length : close)
 
     if (this.pos >= this.sql.length) {
       throw new Error(`Unterminated dollar-quoted string at line ${this.line}`)
@@ -39,3 +39,101 @@ export function inTrie(trie: Trie, key: string): [TrieResult, Trie] {
 
   return [TrieResult.PREFIX, current]
 }
+
+/**
+ * A trie compiled into flat transition tables: state 0 is the root and
+ * `next[state * width + columns[code]]` is the state after UTF-16 unit
+ * `code`, or -1.
+ */
+export interface TrieTable {
+  /** Column of each char code up to the largest one in `keys`, or -1 */
+  columns: Int16Array
+  width: number
+  next: Int32Array
+  /** 1 + index into `keys` of the key ending at each state, or 0 */
+  terminal: Int32Array
+  keys: string[]
+}
+
+export interface CompileTrieOptions {
+  /** Match ASCII letters in either case (keys must be upper case) */
+  ignoreCase?: boolean
+}
+
+export function compileTrie(
+  keywords: Iterable<string>,
+  options: CompileTrieOptions = {},
+): TrieTable {
+  const keys = [...keywords]
+  let maxCode = 0
+  const codes = new Set<number>()
+  for (const key of keys) {
+    for (let i = 0; i < key.length; i++) {
+      const code = key.charCodeAt(i)
+      codes.add(code)
+      maxCode = Math.max(maxCode, code)
+    }
+  }
+
+  const width = codes.size
+  const size = options.ignoreCase ? Math.max(maxCode, 0x7a) : maxCode
+  const columns = new Int16Array(size + 1).fill(-1)
+  let column = 0
+  for (const code of codes) {
+    columns[code] = column++
+  }
+  if (options.ignoreCase) {
+    for (let code = 0x41; code <= 0x5a; code++) {
+      columns[code + 0x20] = columns[code]!
+    }
+  }
+
+  // Build with growable arrays, then freeze into typed arrays
+  const next: number[] = new Array<number>(width).fill(-1)
+  const terminal: number[] = [0]
+  keys.forEach((key, index) => {
+    let state = 0
+    for (let i = 0; i < key.length; i++) {
+      const slot = state * width + columns[key.charCodeAt(i)]!
+      if (next[slot]! < 0) {
+        next[slot] = terminal.length
+        terminal.push(0)
+        next.push(...new Array<number>(width).fill(-1))
+      }
+      state = next[slot]!
+    }
+    terminal[state] = index + 1
+  })
+
+  return {
+    columns,
+    width,
+    next: Int32Array.from(next),
+    terminal: Int32Array.from(terminal),
+    keys,
+  }
+}
+
+/** State after `code` from `state`, or -1 */
+export function trieStep(
+  table: TrieTable,
+  state: number,
+  code: number,
+): number {
+  const column = code < table.columns.length ? table.columns[code]! : -1
+  return column < 0 ? -1 : table.next[state * table.width + column]!
+}
+
+/** State after text[start:end) from `state`, or -1 */
+export function trieWalk(
+  table: TrieTable,
+  state: number,
+  text: string,
+  start: number,
+  end: number,
+): number {
+  for (let i = start; i < end && state >= 0; i++) {
+    state = trieStep(table, state, text.charCodeAt(i))
+  }
+  return state
+}
@@ -1,35 +1,79 @@
+from compat.api import BatchItem
+from compat.api import Fingerprint
+from compat.api import Parameterized
+from compat.api import ParameterValue
+from compat.api import StatementError
+from compat.api import TargetResult
+from compat.api import TranspileFileSummary
+from compat.api import fingerprint
+from compat.api import fingerprint_many
+from compat.api import parameterize
 from compat.api import parse
+from compat.api import parse_many
 from compat.api import parse_one
+from compat.api import parse_tokens
+from compat.api import project
+from compat.api import split_statements
 from compat.api import transpile
+from compat.api import transpile_file
+from compat.api import transpile_many
 from compat.bridge import PROJECT_ROOT
 from compat.bridge import TSBridge
+from compat.cache import CacheStats
+from compat.cache import TranspileCache
 from compat.errors import Dialects
 from compat.errors import ErrorLevel
 from compat.errors import Expression
 from compat.errors import ParseError
 from compat.errors import TokenError
 from compat.errors import UnsupportedError
+from compat.proxy import DeferredExpression
 from compat.proxy import ExpressionProxy
 from compat.proxy import ExpressionProxyMeta
+from compat.proxy import Pipeline
+from compat.proxy import TreeEdit
+from compat.proxy import deferred_operators
 from compat.proxy import deserialize
 from compat.proxy import serialize_arg
 from compat.registration import register_fake_sqlglot
 
 __all__ = [
     "PROJECT_ROOT",
+    "BatchItem",
+    "CacheStats",
+    "DeferredExpression",
     "Dialects",
     "ErrorLevel",
     "Expression",
     "ExpressionProxy",
     "ExpressionProxyMeta",
+    "Fingerprint",
+    "ParameterValue",
+    "Parameterized",
     "ParseError",
+    "Pipeline",
+    "StatementError",
     "TSBridge",
+    "TargetResult",
     "TokenError",
+    "TranspileCache",
+    "TranspileFileSummary",
+    "TreeEdit",
     "UnsupportedError",
+    "deferred_operators",
     "deserialize",
+    "fingerprint",
+    "fingerprint_many",
+    "parameterize",
     "parse",
+    "parse_many",
     "parse_one",
+    "parse_tokens",
+    "project",
     "register_fake_sqlglot",
     "serialize_arg",
+    "split_statements",
     "transpile",
+    "transpile_file",
+    "transpile_many",
 ]
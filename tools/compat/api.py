@@ -1,9 +1,124 @@
+import json
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import batched
+from os import PathLike
+from pathlib import Path
 from typing import Any
+from typing import Literal
+from typing import NamedTuple
+from typing import overload
 
 from compat.bridge import TSBridge
 from compat.bridge import emit_bridge_logs
+from compat.cache import TranspileCache
 from compat.errors import ParseError
+from compat.errors import TokenError
+from compat.errors import UnsupportedError
 from compat.proxy import ExpressionProxy
+from compat.proxy import deserialize_row
+from compat.tokens import Token
+from compat.tokens import TokenStream
+
+
+class BatchItem(NamedTuple):
+    value: Any
+    error: str | None = None
+    error_type: str | None = None
+    line: int | None = None
+    col: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Fingerprint(NamedTuple):
+    hash: str
+    normalized: str
+
+
+class ParameterValue(NamedTuple):
+    value: str
+    token_type: str
+
+
+class Parameterized(NamedTuple):
+    hash: str
+    normalized: str
+    values: list[ParameterValue]
+
+
+class TargetResult(NamedTuple):
+    sql: list[str]
+    warnings: list[str]
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_WARNING_PREFIX = "WARNING:sqlglot:"
+
+
+def _target_result(target: dict[str, Any]) -> TargetResult:
+    warnings = [
+        log.removeprefix(_WARNING_PREFIX)
+        for log in target["logs"]
+        if log.startswith(_WARNING_PREFIX)
+    ]
+    if not target["ok"]:
+        return TargetResult([], warnings, target["error"])
+    return TargetResult(target["sql"], warnings)
+
+
+class StatementError(NamedTuple):
+    statement: int
+    offset: int
+    line: int
+    error: str
+    error_type: str
+
+
+class TranspileFileSummary(NamedTuple):
+    statements: int
+    errors: list[StatementError]
+    timings: dict[str, float]
+
+
+def _failed_item(item: dict[str, Any]) -> BatchItem:
+    return BatchItem(
+        value=None,
+        error=item["error"],
+        error_type=item.get("errorType"),
+        line=item.get("line"),
+        col=item.get("col"),
+    )
+
+
+def _fingerprint_item(item: dict[str, Any]) -> Fingerprint | Parameterized:
+    if "values" not in item:
+        return Fingerprint(item["hash"], item["normalized"])
+    values = [ParameterValue(v["value"], v["tokenType"]) for v in item["values"]]
+    return Parameterized(item["hash"], item["normalized"], values)
+
+
+def _run_batches(
+    method: str,
+    sqls: Iterable[str],
+    chunk_size: int,
+    *,
+    timeout: float = 30.0,
+    **kwargs: Any,
+) -> Iterator[dict[str, Any]]:
+    bridge = TSBridge.get()
+    for chunk in batched(sqls, chunk_size, strict=False):
+        result = bridge.call(method, timeout=timeout, sqls=list(chunk), **kwargs)
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        emit_bridge_logs(result)
+        yield from result["items"]
 
 
 def create_datatype(type_name: str) -> ExpressionProxy:
@@ -22,6 +137,8 @@ def parse_one(
     sql: str,
     read: str | None = None,
     into: type | None = None,
+    *,
+    cache: bool = False,
     **_kwargs: Any,
 ) -> ExpressionProxy:
     bridge = TSBridge.get()
@@ -46,6 +163,8 @@ def parse_one(
     call_kwargs: dict[str, Any] = {"sql": sql, "dialect": dialect}
     if into_name:
         call_kwargs["into"] = into_name
+    if cache:
+        call_kwargs["cache"] = True
 
     result = bridge.call("parseOne", **call_kwargs)
     if not result["ok"]:
@@ -70,19 +189,307 @@ def parse(sql: str, read: str | None = None, **_kwargs: Any) -> list[ExpressionP
     return list(map(ExpressionProxy, result["ids"], result["keys"]))
 
 
+def parse_tokens(
+    tokens: Iterable[Token],
+    sql: str | None = None,
+    read: str | None = None,
+    *,
+    error_level: str | None = None,
+) -> list[ExpressionProxy]:
+    bridge = TSBridge.get()
+    if not sql and isinstance(tokens, TokenStream):
+        sql = tokens.sql
+    sql = sql or ""
+    dialect = str(read) if read else ""
+    result = None
+    if isinstance(tokens, TokenStream) and tokens.handle is not None:
+        result = bridge.call(
+            "parseTokens",
+            tokensId=tokens.handle,
+            sql=sql,
+            dialect=dialect,
+            errorLevel=error_level or "",
+        )
+    if result is None or result.get("expired"):
+        if isinstance(tokens, TokenStream):
+            compact = tokens.compact()
+        else:
+            compact = [token.compact() for token in tokens]
+        result = bridge.call(
+            "parseTokens",
+            tokens=compact,
+            sql=sql,
+            dialect=dialect,
+            errorLevel=error_level or "",
+        )
+    if not result["ok"]:
+        raise ParseError(result["error"])
+    return list(map(ExpressionProxy, result["ids"], result["keys"]))
+
+
+def parse_many(
+    sqls: Iterable[str], read: str | None = None, *, chunk_size: int = 500
+) -> Iterator[BatchItem]:
+    dialect = str(read) if read else ""
+    for item in _run_batches("parseMany", sqls, chunk_size, dialect=dialect):
+        if item["ok"]:
+            yield BatchItem(list(map(ExpressionProxy, item["ids"], item["keys"])))
+        else:
+            yield _failed_item(item)
+
+
+@overload
 def transpile(
     sql: str,
     read: str | None = None,
     write: str | None = None,
+    *,
+    cache: TranspileCache | None = None,
+    pretty: bool = False,
+    identify: bool | str = False,
+    unsupported_level: str | None = None,
+    error_level: str | None = None,
     **_kwargs: Any,
-) -> list[str]:
+) -> list[str]: ...
+
+
+@overload
+def transpile(
+    sql: str,
+    read: str | None = None,
+    *,
+    write: list[str] | tuple[str, ...],
+    cache: TranspileCache | None = None,
+    pretty: bool = False,
+    identify: bool | str = False,
+    unsupported_level: str | None = None,
+    error_level: str | None = None,
+    **_kwargs: Any,
+) -> dict[str, TargetResult]: ...
+
+
+def transpile(
+    sql: str,
+    read: str | None = None,
+    write: str | list[str] | tuple[str, ...] | None = None,
+    *,
+    cache: TranspileCache | None = None,
+    pretty: bool = False,
+    identify: bool | str = False,
+    unsupported_level: str | None = None,
+    error_level: str | None = None,
+    **_kwargs: Any,
+) -> list[str] | dict[str, TargetResult]:
+    options = _transpile_options(
+        pretty=pretty,
+        identify=identify,
+        unsupported_level=unsupported_level,
+        error_level=error_level,
+    )
+    if isinstance(write, (list, tuple)):
+        targets = [str(target) for target in write]
+        return _transpile_fan_out(sql, read, targets, options, cache)
+    read_dialect = str(read) if read else ""
+    write_dialect = str(write) if write else ""
+    key = (sql, read_dialect, write_dialect, _option_key(options))
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
     bridge = TSBridge.get()
     result = bridge.call(
         "transpile",
         sql=sql,
-        readDialect=str(read) if read else "",
-        writeDialect=str(write) if write else "",
+        readDialect=read_dialect,
+        writeDialect=write_dialect,
+        **options,
     )
     if not result["ok"]:
+        if result.get("errorType") == "UnsupportedError":
+            raise UnsupportedError(result["error"])
         raise ParseError(result["error"])
+    emit_bridge_logs(result)
+    # Logged warnings are not cached, so only cache results that had none
+    if cache is not None and not result.get("logs"):
+        cache.put(key, result["sql"])
     return result["sql"]
+
+
+def _transpile_options(
+    *,
+    pretty: bool,
+    identify: bool | str,
+    unsupported_level: str | None,
+    error_level: str | None,
+) -> dict[str, Any]:
+    options: dict[str, Any] = {}
+    if pretty:
+        options["pretty"] = pretty
+    if identify:
+        options["identify"] = identify
+    if unsupported_level:
+        options["unsupportedLevel"] = unsupported_level
+    if error_level:
+        options["errorLevel"] = error_level
+    return options
+
+
+def _option_key(options: dict[str, Any]) -> str:
+    return json.dumps(options, sort_keys=True) if options else ""
+
+
+def _transpile_fan_out(
+    sql: str,
+    read: str | None,
+    writes: list[str],
+    options: dict[str, Any],
+    cache: TranspileCache | None,
+) -> dict[str, TargetResult]:
+    read_dialect = str(read) if read else ""
+    option_key = _option_key(options)
+    results: dict[str, TargetResult] = {}
+    if cache is not None:
+        for write in writes:
+            cached = cache.get((sql, read_dialect, write, option_key))
+            if cached is not None:
+                results[write] = TargetResult(cached, [])
+    missing = [write for write in writes if write not in results]
+    if missing:
+        bridge = TSBridge.get()
+        result = bridge.call(
+            "transpileFanOut",
+            sql=sql,
+            readDialect=read_dialect,
+            writeDialects=missing,
+            **options,
+        )
+        if not result["ok"]:
+            raise ParseError(result["error"])
+        emit_bridge_logs(result)
+        for write, target in result["targets"].items():
+            results[write] = _target_result(target)
+            if cache is not None and target["ok"] and not target["logs"]:
+                cache.put((sql, read_dialect, write, option_key), target["sql"])
+    return {write: results[write] for write in writes}
+
+
+def split_statements(sql: str, dialect: str | None = None) -> list[tuple[int, int]]:
+    bridge = TSBridge.get()
+    result = bridge.call(
+        "splitStatements", sql=sql, dialect=str(dialect) if dialect else ""
+    )
+    if not result["ok"]:
+        raise TokenError(result["error"])
+    return list(batched(result["offsets"], 2, strict=True))
+
+
+def transpile_file(
+    src_path: str | PathLike[str],
+    dst_path: str | PathLike[str],
+    read: str | None = None,
+    write: str | None = None,
+) -> TranspileFileSummary:
+    bridge = TSBridge.get()
+    result = bridge.call(
+        "transpileFile",
+        timeout=600.0,
+        srcPath=str(Path(src_path).resolve()),
+        dstPath=str(Path(dst_path).resolve()),
+        readDialect=str(read) if read else "",
+        writeDialect=str(write) if write else "",
+    )
+    if not result["ok"]:
+        raise ValueError(result["error"])
+    emit_bridge_logs(result)
+    return TranspileFileSummary(
+        statements=result["statements"],
+        errors=[
+            StatementError(
+                statement=error["index"],
+                offset=error["offset"],
+                line=error["line"],
+                error=error["error"],
+                error_type=error["errorType"],
+            )
+            for error in result["errors"]
+        ],
+        timings=result["timings"],
+    )
+
+
+def transpile_many(
+    sqls: Iterable[str],
+    read: str | None = None,
+    write: str | None = None,
+    *,
+    chunk_size: int = 500,
+    timeout: float = 30.0,
+) -> Iterator[BatchItem]:
+    for item in _run_batches(
+        "transpileMany",
+        sqls,
+        chunk_size,
+        timeout=timeout,
+        readDialect=str(read) if read else "",
+        writeDialect=str(write) if write else "",
+    ):
+        yield BatchItem(item["sql"]) if item["ok"] else _failed_item(item)
+
+
+def fingerprint_many(
+    sqls: Iterable[str],
+    dialect: str | None = None,
+    *,
+    with_values: bool = False,
+    chunk_size: int = 500,
+) -> Iterator[BatchItem]:
+    for item in _run_batches(
+        "fingerprintMany",
+        sqls,
+        chunk_size,
+        dialect=str(dialect) if dialect else "",
+        parameterize=with_values,
+    ):
+        yield BatchItem(_fingerprint_item(item)) if item["ok"] else _failed_item(item)
+
+
+@overload
+def _fingerprint_one(
+    sql: str, dialect: str | None, *, with_values: Literal[False]
+) -> Fingerprint: ...
+
+
+@overload
+def _fingerprint_one(
+    sql: str, dialect: str | None, *, with_values: Literal[True]
+) -> Parameterized: ...
+
+
+def _fingerprint_one(
+    sql: str, dialect: str | None, *, with_values: bool
+) -> Fingerprint | Parameterized:
+    [item] = fingerprint_many([sql], dialect, with_values=with_values)
+    if not item.ok:
+        raise TokenError(item.error)
+    return item.value
+
+
+def fingerprint(sql: str, dialect: str | None = None) -> Fingerprint:
+    return _fingerprint_one(sql, dialect, with_values=False)
+
+
+def parameterize(sql: str, dialect: str | None = None) -> Parameterized:
+    return _fingerprint_one(sql, dialect, with_values=True)
+
+
+def project(
+    expressions: Iterable[ExpressionProxy], fields: list[str]
+) -> list[tuple[Any, ...]]:
+    ids = [expression.expr_id for expression in expressions]
+    if not ids:
+        return []
+    bridge = TSBridge.get()
+    result = bridge.call("project", ids=ids, fields=fields)
+    if not result["ok"]:
+        raise ValueError(result["error"])
+    return [deserialize_row(row) for row in result["rows"]]
@@ -2,8 +2,10 @@ import json
 import logging
 import select
 import subprocess  # noqa: S404
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
+from typing import ClassVar
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -12,6 +14,7 @@ _sqlglot_logger = logging.getLogger("sqlglot")
 
 class TSBridge:
     _instance: "TSBridge | None" = None
+    _startup_hooks: ClassVar[list[Callable[["TSBridge"], None]]] = []
 
     def __init__(self) -> None:
         self.proc = subprocess.Popen(
@@ -27,8 +30,17 @@ class TSBridge:
     def get(cls) -> "TSBridge":
         if cls._instance is None:
             cls._instance = TSBridge()
+            for hook in cls._startup_hooks:
+                hook(cls._instance)
         return cls._instance
 
+    @classmethod
+    def on_startup(cls, hook: Callable[["TSBridge"], None]) -> None:
+        cls._startup_hooks.append(hook)
+        # A bridge that is already running missed the startup, so run it now
+        if cls._instance is not None:
+            hook(cls._instance)
+
     @classmethod
     def reset(cls) -> None:
         if cls._instance is not None:
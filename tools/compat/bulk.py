@@ -0,0 +1,172 @@
+import argparse
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import batched
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+from typing import TextIO
+
+from compat.api import transpile_many
+from compat.bridge import TSBridge
+
+log = logging.getLogger(__name__)
+
+# Bridge timeout for one chunk: a fixed allowance plus one per statement
+_CHUNK_TIMEOUT = 30.0
+_ITEM_TIMEOUT = 0.5
+
+
+class CorpusItem(NamedTuple):
+    id: str
+    sql: str
+
+
+class BulkResult(NamedTuple):
+    id: str
+    sql: list[str] | None
+    error: str | None = None
+
+    def to_json(self) -> str:
+        record: dict[str, Any] = {"id": self.id}
+        if self.error is None:
+            record["sql"] = self.sql
+        else:
+            record["error"] = self.error
+        return json.dumps(record, ensure_ascii=False)
+
+
+class BulkStats(NamedTuple):
+    items: int
+    errors: int
+    seconds: float
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+def iter_corpus(path: Path) -> Iterator[CorpusItem]:
+    if path.is_dir():
+        for file in sorted(path.rglob("*.sql")):
+            yield CorpusItem(
+                file.relative_to(path).as_posix(), file.read_text(encoding="utf-8")
+            )
+        return
+    with path.open(encoding="utf-8") as lines:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                yield CorpusItem(str(number), record)
+            else:
+                yield CorpusItem(str(record.get("id", number)), record["sql"])
+
+
+def _init_worker() -> None:
+    # Each worker starts its own node process; close it when the worker exits
+    atexit.register(TSBridge.reset)
+
+
+def transpile_chunk(
+    job: tuple[list[CorpusItem], str | None, str | None],
+) -> list[BulkResult]:
+    items, read, write = job
+    try:
+        results = list(
+            transpile_many(
+                (item.sql for item in items),
+                read=read,
+                write=write,
+                chunk_size=len(items),
+                timeout=_CHUNK_TIMEOUT + _ITEM_TIMEOUT * len(items),
+            )
+        )
+    except (RuntimeError, TimeoutError, ValueError) as error:
+        # A timeout kills node; start a fresh bridge for the next chunk
+        TSBridge.reset()
+        return [BulkResult(item.id, None, str(error)) for item in items]
+    return [
+        BulkResult(item.id, result.value, result.error)
+        for item, result in zip(items, results, strict=True)
+    ]
+
+
+def run_bulk(
+    items: Iterable[CorpusItem],
+    read: str | None = None,
+    write: str | None = None,
+    *,
+    processes: int | None = None,
+    chunk_size: int = 200,
+) -> Iterator[BulkResult]:
+    jobs = (
+        (list(chunk), read, write) for chunk in batched(items, chunk_size, strict=False)
+    )
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes or os.cpu_count(), initializer=_init_worker) as pool:
+        for results in pool.imap(transpile_chunk, jobs):
+            yield from results
+        # Let workers exit normally so their atexit hooks stop node;
+        # leaving the block would terminate them instead
+        pool.close()
+        pool.join()
+
+
+def write_results(results: Iterable[BulkResult], output: TextIO) -> BulkStats:
+    started = time.perf_counter()
+    items = errors = 0
+    for result in results:
+        output.write(result.to_json() + "\n")
+        items += 1
+        errors += result.error is not None
+    return BulkStats(items, errors, time.perf_counter() - started)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        prog="python -m compat.bulk",
+        description="Transpile a directory of .sql files or an NDJSON corpus",
+    )
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("--read")
+    parser.add_argument("--write")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    results = run_bulk(
+        iter_corpus(args.corpus),
+        args.read,
+        args.write,
+        processes=args.processes,
+        chunk_size=args.chunk_size,
+    )
+    if args.output is None:
+        stats = write_results(results, sys.stdout)
+    else:
+        with args.output.open("w", encoding="utf-8") as output:
+            stats = write_results(results, output)
+
+    log.info(
+        "%d items, %d errors in %.2fs (%.0f items/s)",
+        stats.items,
+        stats.errors,
+        stats.seconds,
+        stats.items_per_second,
+    )
+
+
+if __name__ == "__main__":
+    main()
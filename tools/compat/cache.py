@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    bytes: int
+
+
+# (sql, read dialect, write dialect, serialized generate options)
+CacheKey = tuple[str, str, str, str]
+
+
+def _entry_bytes(key: CacheKey, value: list[str]) -> int:
+    return sum(len(part.encode()) for part in (*key, *value))
+
+
+class TranspileCache:
+    def __init__(self, max_size: int = 1024, max_bytes: int | None = None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, tuple[list[str], int]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bytes = 0
+
+    def get(self, key: CacheKey) -> list[str] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return list(entry[0])
+
+    def put(self, key: CacheKey, value: list[str]) -> None:
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            self._bytes -= existing[1]
+        size = _entry_bytes(key, value)
+        if self.max_size <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        self._entries[key] = (list(value), size)
+        self._bytes += size
+        while len(self._entries) > self.max_size or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            bytes=self._bytes,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = self._bytes = 0
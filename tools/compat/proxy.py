@@ -1,16 +1,22 @@
 import re
 from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 from typing import ClassVar
+from typing import NamedTuple
+from typing import Union
 
 from compat.bridge import TSBridge
 from compat.bridge import emit_bridge_logs
-from compat.errors import Expression
 from compat.errors import UnsupportedError
 
 _convert_handler: Callable[[Any], Any] | None = None
 _parse_one_handler: Callable[..., Any] | None = None
 _create_datatype_handler: Callable[[str], Any] | None = None
+# Per thread and task, so deferred_operators() does not leak into other threads
+_deferred_mode: ContextVar[bool] = ContextVar("deferred_mode", default=False)
 
 
 def set_convert_handler(handler: Callable[[Any], Any]) -> None:
@@ -52,6 +58,12 @@ def deserialize(data: dict) -> Any:
     raise ValueError(msg)
 
 
+def deserialize_row(row: list[Any]) -> tuple[Any, ...]:
+    return tuple(
+        deserialize(value) if isinstance(value, dict) else value for value in row
+    )
+
+
 def serialize_arg(arg: Any) -> Any:
     if isinstance(arg, ExpressionProxy):
         return {"__expr_id__": arg.expr_id}
@@ -103,240 +115,48 @@ def _handle_lock(
     return deserialize(call_result["value"])
 
 
-def _handle_distinct(
-    bridge: TSBridge,
-    self_proxy: "ExpressionProxy",
-    self_id: int,
-    args: tuple,
-    kwargs: dict,
-) -> Any:
-    if "distinct" in kwargs:
-        call_args = (kwargs["distinct"],)
-        serialized_args = [serialize_arg(arg) for arg in call_args]
-        call_result = bridge.call(
-            "call",
-            id=self_id,
-            name="distinct",
-            args=serialized_args,
-        )
-        if not call_result["ok"]:
-            raise ValueError(call_result["error"])
-        return deserialize(call_result["value"])
-    if args and isinstance(args[0], str):
-        parsed_on = [_parse_one(str(arg)) for arg in args]
-        tuple_result = bridge.call(
-            "createExpression",
-            className="Tuple",
-            args={"expressions": [serialize_arg(parsed) for parsed in parsed_on]},
-        )
-        if not tuple_result["ok"]:
-            raise ValueError(tuple_result["error"])
-        tuple_proxy = ExpressionProxy(tuple_result["id"], tuple_result["key"])
-        distinct_result = bridge.call(
-            "createExpression",
-            className="Distinct",
-            args={"on": serialize_arg(tuple_proxy)},
-        )
-        if not distinct_result["ok"]:
-            raise ValueError(distinct_result["error"])
-        distinct_proxy = ExpressionProxy(distinct_result["id"], distinct_result["key"])
-        this_copy = self_proxy.copy()
-        set_result = bridge.call(
-            "call",
-            id=this_copy.expr_id,
-            name="set",
-            args=["distinct", serialize_arg(distinct_proxy)],
-        )
-        if not set_result["ok"]:
-            raise ValueError(set_result["error"])
-        return this_copy
-    return None
+_GROUP_BY_WITH = re.compile(r"\s+with\s+(cube|rollup)\s*$", re.IGNORECASE)
 
 
-def _handle_returning(
-    bridge: TSBridge,
-    self_proxy: "ExpressionProxy",
-    self_id: int,
-    args: tuple,
-    kwargs: dict,
-) -> Any:
-    dialect = kwargs.get("dialect")
-    copy = kwargs.get("copy", True)
-    expr_str = args[0] if args else "*"
-    if isinstance(expr_str, str):
-        parsed_exprs = _parse_one(f"SELECT {expr_str}", read=dialect)
-        select_exprs_result = bridge.call(
-            "getattr",
-            id=parsed_exprs.expr_id,
-            name="expressions",
+def _is_composite(name: str, args: tuple, kwargs: dict) -> bool:
+    if name == "distinct":
+        return "distinct" in kwargs or bool(args and isinstance(args[0], str))
+    if name == "returning":
+        return not args or isinstance(args[0], str)
+    if name == "group_by":
+        return any(
+            (isinstance(arg, str) and _GROUP_BY_WITH.search(arg))
+            or (isinstance(arg, dict) and "with_" in arg)
+            for arg in args
         )
-        if select_exprs_result["ok"]:
-            exprs = deserialize(select_exprs_result["value"])
-            if isinstance(exprs, list) and exprs:
-                returning_result = bridge.call(
-                    "createExpression",
-                    className="Returning",
-                    args={"expressions": [serialize_arg(expr) for expr in exprs]},
-                )
-                if returning_result["ok"]:
-                    returning_proxy = ExpressionProxy(
-                        returning_result["id"], returning_result["key"]
-                    )
-                    this_copy = self_proxy.copy() if copy else self_proxy
-                    set_result = bridge.call(
-                        "call",
-                        id=this_copy.expr_id,
-                        name="set",
-                        args=[
-                            "returning",
-                            serialize_arg(returning_proxy),
-                        ],
-                    )
-                    if set_result["ok"]:
-                        return this_copy
-    call_kwargs = {key: value for key, value in kwargs.items() if key == "copy"}
-    serialized_args = [serialize_arg(arg) for arg in args]
-    serialized_kwargs = {
-        key: serialize_arg(value) for key, value in call_kwargs.items()
-    }
-    call_result = bridge.call(
-        "call",
-        id=self_id,
-        name="returning",
-        args=serialized_args,
-        kwargs=serialized_kwargs,
-    )
-    if not call_result["ok"]:
-        raise ValueError(call_result["error"])
-    return deserialize(call_result["value"])
+    return name == "ctas" and "properties" in kwargs
 
 
-def _handle_group_by(
+def _serialize_composite_kwargs(kwargs: dict) -> dict[str, Any]:
+    serialized = {key: serialize_arg(value) for key, value in kwargs.items()}
+    if "properties" in kwargs:
+        serialized["properties"] = {
+            key: serialize_arg(value)
+            if isinstance(value, ExpressionProxy)
+            else str(value)
+            for key, value in kwargs["properties"].items()
+        }
+    return serialized
+
+
+def _handle_composite(
     bridge: TSBridge, self_id: int, name: str, args: tuple, kwargs: dict
 ) -> Any:
-    real_args: list[Any] = []
-    with_val = None
-    for arg in args:
-        if isinstance(arg, str):
-            match = re.search(r"\s+with\s+(cube|rollup)\s*$", arg, re.IGNORECASE)
-            if match:
-                with_val = match.group(1).upper()
-                real_args.append(arg[: match.start()])
-            else:
-                real_args.append(arg)
-        elif isinstance(arg, dict) and "with_" in arg:
-            with_val = arg["with_"].upper()
-        else:
-            real_args.append(arg)
-    serialized_args = [serialize_arg(arg) for arg in real_args]
-    serialized_kwargs = {key: serialize_arg(value) for key, value in kwargs.items()}
-    group_result = bridge.call(
-        "call",
+    call_result = bridge.call(
+        "composite",
         id=self_id,
         name=name,
-        args=serialized_args,
-        kwargs=serialized_kwargs,
+        args=[serialize_arg(arg) for arg in args],
+        kwargs=_serialize_composite_kwargs(kwargs),
     )
-    if not group_result["ok"]:
-        raise ValueError(group_result["error"])
-    result_proxy = deserialize(group_result["value"])
-    if with_val and isinstance(result_proxy, ExpressionProxy):
-        group_type = type("Group", (Expression,), {"__name__": "Group"})
-        group_node = result_proxy.find(group_type)
-        if group_node is not None:
-            class_name = "Cube" if with_val == "CUBE" else "Rollup"
-            node_result = bridge.call(
-                "createExpression",
-                className=class_name,
-                args={"expressions": []},
-            )
-            if node_result["ok"]:
-                node_proxy = ExpressionProxy(node_result["id"], node_result["key"])
-                key = "cube" if with_val == "CUBE" else "rollup"
-                bridge.call(
-                    "call",
-                    id=group_node.expr_id,
-                    name="set",
-                    args=[key, [serialize_arg(node_proxy)]],
-                )
-    return result_proxy
-
-
-def _handle_ctas(bridge: TSBridge, self_id: int, args: tuple, kwargs: dict) -> Any:
-    props_dict = kwargs.pop("properties")
-    table_arg = args[0] if args else ""
-    ctas_kwargs = {key: value for key, value in kwargs.items() if key != "properties"}
-    ctas_result = bridge.call(
-        "call",
-        id=self_id,
-        name="ctas",
-        args=[serialize_arg(table_arg)],
-        kwargs={key: serialize_arg(value) for key, value in ctas_kwargs.items()},
-    )
-    if not ctas_result["ok"]:
-        raise ValueError(ctas_result["error"])
-    create_proxy = deserialize(ctas_result["value"])
-    prop_exprs: list[Any] = []
-    name_to_property = {"FORMAT": "FileFormatProperty"}
-    for key, value in props_dict.items():
-        prop_class = name_to_property.get(key.upper())
-        if prop_class:
-            prop_result = bridge.call(
-                "createExpression",
-                className=prop_class,
-                args={"this": value},
-            )
-            if prop_result["ok"]:
-                prop_exprs.append(
-                    serialize_arg(
-                        ExpressionProxy(prop_result["id"], prop_result["key"])
-                    )
-                )
-        else:
-            key_lit = bridge.call(
-                "createExpression",
-                className="Literal",
-                args={"this": key, "is_string": True},
-            )
-            val_lit = bridge.call(
-                "createExpression",
-                className="Literal",
-                args={"this": str(value), "is_string": True},
-            )
-            if key_lit["ok"] and val_lit["ok"]:
-                prop_result = bridge.call(
-                    "createExpression",
-                    className="Property",
-                    args={
-                        "this": serialize_arg(
-                            ExpressionProxy(key_lit["id"], key_lit["key"])
-                        ),
-                        "value": serialize_arg(
-                            ExpressionProxy(val_lit["id"], val_lit["key"])
-                        ),
-                    },
-                )
-                if prop_result["ok"]:
-                    prop_exprs.append(
-                        serialize_arg(
-                            ExpressionProxy(prop_result["id"], prop_result["key"])
-                        )
-                    )
-    if prop_exprs:
-        props_result = bridge.call(
-            "createExpression",
-            className="Properties",
-            args={"expressions": prop_exprs},
-        )
-        if props_result["ok"]:
-            props_proxy = ExpressionProxy(props_result["id"], props_result["key"])
-            bridge.call(
-                "call",
-                id=create_proxy.expr_id,
-                name="set",
-                args=["properties", serialize_arg(props_proxy)],
-            )
-    return create_proxy
+    if not call_result["ok"]:
+        raise ValueError(call_result["error"])
+    return deserialize(call_result["value"])
 
 
 def _handle_generic_method_call(
@@ -358,7 +178,6 @@ def _handle_generic_method_call(
 
 def _dispatch_method_call(
     bridge: TSBridge,
-    self_proxy: "ExpressionProxy",
     self_id: int,
     name: str,
     args: tuple,
@@ -366,20 +185,158 @@ def _dispatch_method_call(
 ) -> Any:
     if name == "lock":
         return _handle_lock(bridge, self_id, name, args, kwargs)
-    if name == "distinct":
-        result = _handle_distinct(bridge, self_proxy, self_id, args, kwargs)
-        if result is not None:
-            return result
-        return _handle_generic_method_call(bridge, self_id, name, args, kwargs)
-    if name == "returning":
-        return _handle_returning(bridge, self_proxy, self_id, args, kwargs)
-    if name == "group_by":
-        return _handle_group_by(bridge, self_id, name, args, kwargs)
-    if name == "ctas" and "properties" in kwargs:
-        return _handle_ctas(bridge, self_id, args, kwargs)
+    if _is_composite(name, args, kwargs):
+        return _handle_composite(bridge, self_id, name, args, kwargs)
     return _handle_generic_method_call(bridge, self_id, name, args, kwargs)
 
 
+def _serialize_rule(rule: dict[str, Any]) -> dict[str, Any]:
+    match = rule["match"]
+    if not isinstance(match, (list, tuple)):
+        match = [match]
+    return {
+        **rule,
+        "match": [
+            expr_type if isinstance(expr_type, str) else expr_type.__name__
+            for expr_type in match
+        ],
+    }
+
+
+class _PipelineStep(NamedTuple):
+    name: str
+    args: tuple
+    kwargs: dict
+
+    @classmethod
+    def record(cls, name: str, args: tuple, kwargs: dict) -> "_PipelineStep":
+        if name == "lock" and kwargs:
+            update = kwargs.get("update", args[0] if args else True)
+            args = (update, kwargs["copy"]) if "copy" in kwargs else (update,)
+            kwargs = {}
+        return cls(name, args, kwargs)
+
+    def serialize(self) -> dict[str, Any]:
+        if _is_composite(*self):
+            kwargs = _serialize_composite_kwargs(self.kwargs)
+        else:
+            kwargs = {key: serialize_arg(value) for key, value in self.kwargs.items()}
+        return {
+            "name": self.name,
+            "args": [serialize_arg(arg) for arg in self.args],
+            "kwargs": kwargs,
+            "composite": _is_composite(*self),
+        }
+
+
+class Pipeline:
+    def __init__(
+        self,
+        start: "ExpressionProxy | None" = None,
+        steps: tuple[_PipelineStep, ...] = (),
+    ):
+        self._start = start
+        self._steps = steps
+
+    def __getattr__(self, name: str) -> Callable[..., "Pipeline"]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def record(*args: Any, **kwargs: Any) -> Pipeline:
+            step = _PipelineStep.record(name, args, kwargs)
+            return Pipeline(self._start, (*self._steps, step))
+
+        return record
+
+    def __repr__(self) -> str:
+        names = ".".join(f"{step.name}()" for step in self._steps)
+        return f"<Pipeline {names}>"
+
+    def build(self) -> Any:
+        if not self._steps:
+            if self._start is None:
+                msg = "Empty pipeline"
+                raise ValueError(msg)
+            return self._start
+        bridge = TSBridge.get()
+        result = bridge.call(
+            "pipeline",
+            id=None if self._start is None else self._start.expr_id,
+            steps=[step.serialize() for step in self._steps],
+        )
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        return deserialize(result["value"])
+
+
+EditTarget = Union["ExpressionProxy", str, tuple[str | int, ...], list[str | int], None]
+
+
+def _edit_target(target: EditTarget) -> dict[str, Any] | None:
+    if target is None:
+        return None
+    if isinstance(target, ExpressionProxy):
+        return {"id": target.expr_id}
+    if isinstance(target, str):
+        return {"path": target}
+    return {"path": [str(segment) for segment in target]}
+
+
+class TreeEdit:
+    def __init__(self, root: "ExpressionProxy"):
+        self.root = root
+        self.version: int | None = None
+        self._ops: list[dict[str, Any]] = []
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        target: EditTarget = None,
+        index: int | None = None,
+    ) -> None:
+        self._add("set", target, key=key, value=value, index=index)
+
+    def append(self, key: str, value: Any, *, target: EditTarget = None) -> None:
+        self._add("append", target, key=key, value=value)
+
+    def replace(self, target: EditTarget, value: Any) -> None:
+        self._add("replace", target, value=value)
+
+    def pop(self, target: EditTarget) -> None:
+        self._add("pop", target)
+
+    def commit(self) -> int:
+        bridge = TSBridge.get()
+        result = bridge.call("edit", id=self.root.expr_id, ops=self._ops)
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        self._ops = []
+        self.version = result["version"]
+        return result["version"]
+
+    def _add(self, op: str, target: EditTarget, **fields: Any) -> None:
+        if "value" in fields:
+            fields["value"] = serialize_arg(fields["value"])
+        self._ops.append({"op": op, "target": _edit_target(target), **fields})
+
+
+class ColumnarWalk(NamedTuple):
+    kinds: list[int]
+    parents: list[int]
+    arg_keys: list[int]
+    strings: list[str]
+    fields: dict[str, list[Any]]
+
+    def kind(self, index: int) -> str:
+        return self.strings[self.kinds[index]]
+
+    def arg_key(self, index: int) -> str | None:
+        code = self.arg_keys[index]
+        return None if code < 0 else self.strings[code]
+
+
 class ExpressionProxyMeta(type):
     def __instancecheck__(cls, instance: Any) -> bool:
         if isinstance(instance, ExpressionProxy):
@@ -442,6 +399,15 @@ class ExpressionProxy:  # noqa: PLR0904
             bridge.call("release", ids=cls._all_ids)
             cls._all_ids = []
 
+    @classmethod
+    @contextmanager
+    def deferred_operators(cls) -> Iterator[None]:
+        token = _deferred_mode.set(True)
+        try:
+            yield
+        finally:
+            _deferred_mode.reset(token)
+
     @property
     def key(self) -> str:
         return self.expr_key
@@ -490,13 +456,10 @@ class ExpressionProxy:  # noqa: PLR0904
 
         value = result["value"]
         if value.get("type") == "method":
-            self_proxy = self
             self_id = self.expr_id
 
             def method_proxy(*args: Any, **kwargs: Any) -> Any:
-                return _dispatch_method_call(
-                    bridge, self_proxy, self_id, name, args, kwargs
-                )
+                return _dispatch_method_call(bridge, self_id, name, args, kwargs)
 
             return method_proxy
 
@@ -549,6 +512,84 @@ class ExpressionProxy:  # noqa: PLR0904
             ExpressionProxy(value["id"], value["key"]) for value in result["values"]
         ]
 
+    def query(
+        self,
+        *expr_types: type,
+        where: dict[str, Any] | None = None,
+        limit: int | None = None,
+        prune: tuple[type, ...] = (),
+        bfs: bool = True,
+        fields: list[str] | None = None,
+    ) -> list[Any]:
+        bridge = TSBridge.get()
+        call_kwargs: dict[str, Any] = {
+            "id": self.expr_id,
+            "types": [expr_type.__name__ for expr_type in expr_types],
+            "bfs": bfs,
+        }
+        if where:
+            call_kwargs["where"] = where
+        if limit is not None:
+            call_kwargs["limit"] = limit
+        if prune:
+            call_kwargs["prune"] = [expr_type.__name__ for expr_type in prune]
+        if fields is not None:
+            call_kwargs["fields"] = fields
+        result = bridge.call("query", **call_kwargs)
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        if fields is None:
+            return [
+                ExpressionProxy(value["id"], value["key"]) for value in result["values"]
+            ]
+        return [deserialize_row(row) for row in result["rows"]]
+
+    def apply_rules(
+        self, rules: list[dict[str, Any]], *, copy: bool = True
+    ) -> "ExpressionProxy | None":
+        bridge = TSBridge.get()
+        result = bridge.call(
+            "transformRules",
+            id=self.expr_id,
+            rules=[_serialize_rule(rule) for rule in rules],
+            copy=copy,
+        )
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        return deserialize(result["value"])
+
+    def walk_columnar(
+        self, *, bfs: bool = True, fields: list[str] | None = None
+    ) -> ColumnarWalk:
+        bridge = TSBridge.get()
+        result = bridge.call(
+            "walkColumnar", id=self.expr_id, bfs=bfs, fields=fields or []
+        )
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        return ColumnarWalk(
+            kinds=result["kinds"],
+            parents=result["parents"],
+            arg_keys=result["argKeys"],
+            strings=result["strings"],
+            fields={
+                name: [
+                    deserialize(value) if isinstance(value, dict) else value
+                    for value in values
+                ]
+                for name, values in result["fields"].items()
+            },
+        )
+
+    @contextmanager
+    def edit(self) -> Iterator["TreeEdit"]:
+        tree_edit = TreeEdit(self)
+        yield tree_edit
+        tree_edit.commit()
+
+    def pipeline(self) -> "Pipeline":
+        return Pipeline(self)
+
     def copy(self) -> "ExpressionProxy":
         bridge = TSBridge.get()
         result = bridge.call("copy", id=self.expr_id)
@@ -559,6 +600,8 @@ class ExpressionProxy:  # noqa: PLR0904
     def _create_binop(
         self, class_name: str, other: Any, *, reverse: bool = False
     ) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return self._deferred_binop(class_name, other, reverse=reverse)
         bridge = TSBridge.get()
         other_proxy = _convert_value(other)
         this_copy = self.copy()
@@ -581,7 +624,28 @@ class ExpressionProxy:  # noqa: PLR0904
             raise ValueError(result["error"])
         return ExpressionProxy(result["id"], result["key"])
 
+    def _deferred_binop(
+        self, class_name: str, other: Any, *, reverse: bool
+    ) -> "DeferredExpression":
+        this_operand = _deferred_operand(self)
+        other_operand = _deferred_operand(other, copy=False)
+        target_key = class_name.lower()
+        if target_key not in {_operand_key(this_operand), _operand_key(other_operand)}:
+            if _operand_key(this_operand) in self._BINARY_KEYS:
+                this_operand = DeferredExpression.new("Paren", this=this_operand)
+            if _operand_key(other_operand) in self._BINARY_KEYS:
+                if isinstance(other_operand, _ProxyOperand):
+                    other_operand = other_operand._replace(copy=True)
+                other_operand = DeferredExpression.new("Paren", this=other_operand)
+        if reverse:
+            this_operand, other_operand = other_operand, this_operand
+        return DeferredExpression.new(
+            class_name, this=this_operand, expression=other_operand
+        )
+
     def wrap_paren(self) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new("Paren", this=_deferred_operand(self))
         bridge = TSBridge.get()
         this_copy = self.copy()
         result = bridge.call(
@@ -618,6 +682,12 @@ class ExpressionProxy:  # noqa: PLR0904
         return self._create_binop("Div", other, reverse=True)
 
     def __floordiv__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "Cast",
+                this=self._create_binop("Div", other),
+                to=DeferredExpression.new("DataType", this="INT", nested=False),
+            )
         bridge = TSBridge.get()
         div = self._create_binop("Div", other)
         cast_result = bridge.call(
@@ -633,6 +703,12 @@ class ExpressionProxy:  # noqa: PLR0904
         return ExpressionProxy(cast_result["id"], cast_result["key"])
 
     def __rfloordiv__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "Cast",
+                this=self._create_binop("Div", other, reverse=True),
+                to=DeferredExpression.new("DataType", this="INT", nested=False),
+            )
         bridge = TSBridge.get()
         div = self._create_binop("Div", other, reverse=True)
         cast_result = bridge.call(
@@ -654,32 +730,56 @@ class ExpressionProxy:  # noqa: PLR0904
         return self._create_binop("Mod", other, reverse=True)
 
     def __pow__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "Pow",
+                this=_deferred_operand(self),
+                expression=_deferred_operand(other, copy=False),
+            )
         bridge = TSBridge.get()
         other_proxy = _convert_value(other)
         this_copy = self.copy()
         result = bridge.call(
-            "callFunction",
-            name="func",
-            args=["POWER", serialize_arg(this_copy), serialize_arg(other_proxy)],
+            "createExpression",
+            className="Pow",
+            args={
+                "this": serialize_arg(this_copy),
+                "expression": serialize_arg(other_proxy),
+            },
         )
         if not result["ok"]:
             raise ValueError(result["error"])
-        return deserialize(result["value"])
+        return ExpressionProxy(result["id"], result["key"])
 
     def __rpow__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "Pow",
+                this=_deferred_operand(other, copy=False),
+                expression=_deferred_operand(self),
+            )
         bridge = TSBridge.get()
         other_proxy = _convert_value(other)
         this_copy = self.copy()
         result = bridge.call(
-            "callFunction",
-            name="func",
-            args=["POWER", serialize_arg(other_proxy), serialize_arg(this_copy)],
+            "createExpression",
+            className="Pow",
+            args={
+                "this": serialize_arg(other_proxy),
+                "expression": serialize_arg(this_copy),
+            },
         )
         if not result["ok"]:
             raise ValueError(result["error"])
-        return deserialize(result["value"])
+        return ExpressionProxy(result["id"], result["key"])
 
     def __and__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "And",
+                this=_deferred_operand(self),
+                expression=_deferred_operand(other, copy=False),
+            )
         bridge = TSBridge.get()
         this_copy = self.copy()
         other_val = _convert_value(other)
@@ -696,6 +796,12 @@ class ExpressionProxy:  # noqa: PLR0904
         return ExpressionProxy(result["id"], result["key"])
 
     def __rand__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "And",
+                this=_deferred_operand(other, copy=False),
+                expression=_deferred_operand(self),
+            )
         bridge = TSBridge.get()
         this_copy = self.copy()
         other_val = _convert_value(other)
@@ -712,6 +818,12 @@ class ExpressionProxy:  # noqa: PLR0904
         return ExpressionProxy(result["id"], result["key"])
 
     def __or__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "Or",
+                this=_deferred_operand(self),
+                expression=_deferred_operand(other, copy=False),
+            )
         bridge = TSBridge.get()
         this_copy = self.copy()
         other_val = _convert_value(other)
@@ -728,6 +840,12 @@ class ExpressionProxy:  # noqa: PLR0904
         return ExpressionProxy(result["id"], result["key"])
 
     def __ror__(self, other: Any) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new(
+                "Or",
+                this=_deferred_operand(other, copy=False),
+                expression=_deferred_operand(self),
+            )
         bridge = TSBridge.get()
         this_copy = self.copy()
         other_val = _convert_value(other)
@@ -756,6 +874,8 @@ class ExpressionProxy:  # noqa: PLR0904
         return self._create_binop("GTE", other)
 
     def __neg__(self) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new("Neg", this=_deferred_operand(self))
         bridge = TSBridge.get()
         this_copy = self.copy()
         result = bridge.call(
@@ -766,6 +886,8 @@ class ExpressionProxy:  # noqa: PLR0904
         return ExpressionProxy(result["id"], result["key"])
 
     def __invert__(self) -> "ExpressionProxy":
+        if _deferred_mode.get():
+            return DeferredExpression.new("Not", this=_deferred_operand(self))
         bridge = TSBridge.get()
         this_copy = self.copy()
         result = bridge.call(
@@ -984,3 +1106,134 @@ class ExpressionProxy:  # noqa: PLR0904
         if not set_result["ok"]:
             raise ValueError(set_result["error"])
         return this_copy
+
+
+class _ProxyOperand(NamedTuple):
+    proxy: ExpressionProxy
+    copy: bool
+
+
+# Operator result recorded as a recipe DAG; the whole DAG is sent as a single
+# createTree call the first time the handle is used (sql, method arg, compare)
+class DeferredExpression(ExpressionProxy):
+    def __init__(self, key: str, name: str, args: dict[str, Any] | list[Any]):
+        self.expr_key = key
+        self._name = name
+        self._args = args
+        self._expr_id: int | None = None
+
+    @classmethod
+    def new(cls, class_name: str, **args: Any) -> "DeferredExpression":
+        return cls(class_name.lower(), class_name, args)
+
+    @classmethod
+    def call(cls, name: str, *args: Any, key: str) -> "DeferredExpression":
+        return cls(key, name, list(args))
+
+    @property
+    def pending(self) -> bool:
+        return self._expr_id is None
+
+    @property
+    def expr_id(self) -> int:
+        expr_id = self._expr_id
+        if expr_id is None:
+            bridge = TSBridge.get()
+            result = bridge.call("createTree", nodes=self._encode())
+            if not result["ok"]:
+                raise ValueError(result["error"])
+            expr_id = result["id"]
+            self._expr_id = expr_id
+            self._all_ids.append(expr_id)
+        return expr_id
+
+    def __repr__(self) -> str:
+        if self.pending:
+            return f"<Deferred:{self.key}>"
+        return super().__repr__()
+
+    def operands(self) -> list[Any]:
+        values = self._args.values() if isinstance(self._args, dict) else self._args
+        flat: list[Any] = []
+        for value in values:
+            flat.extend(value if isinstance(value, list) else [value])
+        return flat
+
+    def _encode(self) -> list[dict[str, Any]]:
+        nodes: list[dict[str, Any]] = []
+        positions: dict[int, int] = {}
+
+        def encode_value(value: Any) -> Any:
+            if isinstance(value, DeferredExpression) and value.pending:
+                return {"$node": positions[id(value)]}
+            if isinstance(value, (ExpressionProxy, _ProxyOperand)):
+                operand = (
+                    value
+                    if isinstance(value, _ProxyOperand)
+                    else _ProxyOperand(value, copy=True)
+                )
+                nodes.append({
+                    "op": "copy" if operand.copy else "ref",
+                    "id": operand.proxy.expr_id,
+                })
+                return {"$node": len(nodes) - 1}
+            if isinstance(value, list):
+                return [encode_value(item) for item in value]
+            return value
+
+        # Iterative post-order so long operator chains don't hit the recursion limit
+        stack: list[tuple[DeferredExpression, bool]] = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in positions:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend(
+                    (operand, False)
+                    for operand in node.operands()
+                    if isinstance(operand, DeferredExpression) and operand.pending
+                )
+                continue
+            nodes.append(node.encode_node(encode_value))
+            positions[id(node)] = len(nodes) - 1
+        return nodes
+
+    def encode_node(self, encode_value: Callable[[Any], Any]) -> dict[str, Any]:
+        if isinstance(self._args, dict):
+            args = {key: encode_value(value) for key, value in self._args.items()}
+            return {"op": "new", "className": self._name, "args": args}
+        args = [encode_value(value) for value in self._args]
+        return {"op": "call", "name": self._name, "args": args}
+
+
+deferred_operators = ExpressionProxy.deferred_operators
+
+
+def _deferred_literal(value: Any) -> DeferredExpression | None:
+    if isinstance(value, str):
+        return DeferredExpression.new("Literal", this=value, is_string=True)
+    if isinstance(value, bool):
+        return DeferredExpression.new("Boolean", this=value)
+    if value is None:
+        return DeferredExpression.new("Null")
+    if isinstance(value, (int, float)):
+        return DeferredExpression.new("Literal", this=str(value), is_string=False)
+    return None
+
+
+def _deferred_operand(value: Any, *, copy: bool = True) -> Any:
+    if isinstance(value, DeferredExpression) and value.pending:
+        return value
+    if isinstance(value, ExpressionProxy):
+        return _ProxyOperand(value, copy=copy)
+    literal = _deferred_literal(value)
+    if literal is not None:
+        return literal
+    return _ProxyOperand(_convert_value(value), copy=False)
+
+
+def _operand_key(operand: Any) -> str:
+    if isinstance(operand, _ProxyOperand):
+        return operand.proxy.key
+    return operand.key
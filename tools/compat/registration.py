@@ -3,12 +3,14 @@ import datetime
 import logging
 import sys
 import types
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 from typing import ClassVar
 
 from compat.api import parse
 from compat.api import parse_one
+from compat.api import parse_tokens
 from compat.api import transpile
 from compat.bridge import TSBridge
 from compat.errors import Dialects
@@ -797,9 +799,22 @@ def _annotate_types(expression: ExpressionProxy, **_kwargs: Any) -> ExpressionPr
 class ParserProxy:
     FUNCTIONS: ClassVar[dict[str, Any]] = {}
 
-    def parse(self, tokens: list, **_kwargs: Any) -> list[ExpressionProxy]:
-        sql = " ".join(t.text for t in tokens)
-        return [parse_one(sql)]
+    def __init__(
+        self,
+        error_level: str | None = None,
+        *,
+        dialect: str | None = None,
+        **_kwargs: Any,
+    ):
+        self._error_level = error_level
+        self._dialect = dialect
+
+    def parse(
+        self, raw_tokens: Iterable[Token], sql: str | None = None
+    ) -> list[ExpressionProxy]:
+        return parse_tokens(
+            raw_tokens, sql, self._dialect, error_level=self._error_level
+        )
 
 
 def _register_core_module(sqlglot_mod: types.ModuleType) -> None:
@@ -1,26 +1,37 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
 from typing import Any
 from typing import ClassVar
+from typing import overload
 
 from compat.bridge import TSBridge
 from compat.errors import TokenError
 
 
 class TokenTypeEnum:
+    __slots__ = ("_hash", "code", "name", "value")
+
     _members: ClassVar[dict[str, "TokenTypeEnum"]] = {}
+    # Members indexed by the bridge's integer token type codes
+    by_code: ClassVar[list["TokenTypeEnum"]] = []
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, code: int = -1):
         self.name = name
         self.value = name
+        self.code = code
+        self._hash = hash(name)
 
     def __eq__(self, other: object) -> bool:
+        # Members are singletons per name
         if isinstance(other, TokenTypeEnum):
-            return self.name == other.name
+            return self is other
         if isinstance(other, str):
             return self.name == other
         return NotImplemented
 
     def __hash__(self) -> int:
-        return hash(self.name)
+        return self._hash
 
     def __repr__(self) -> str:
         return f"TokenType.{self.name}"
@@ -35,6 +46,23 @@ class TokenTypeEnum:
             cls._members[name] = member
         return cls._members[name]
 
+    @classmethod
+    def load(cls, names: list[str]) -> None:
+        by_code = []
+        for code, name in enumerate(names):
+            member = cls.get_or_create(name)
+            member.code = code
+            by_code.append(member)
+        cls.by_code = by_code
+
+
+def _load_token_types(bridge: TSBridge) -> None:
+    result = bridge.call("tokenTypes")
+    TokenTypeEnum.load(result["names"])
+
+
+TSBridge.on_startup(_load_token_types)
+
 
 class TokenTypeMeta(type):
     def __getattr__(cls, name: str) -> TokenTypeEnum:
@@ -47,61 +75,203 @@ class TokenType(metaclass=TokenTypeMeta):
     pass
 
 
+class _TokenColumns:
+    __slots__ = ("col", "comments", "end", "line", "start", "text", "type", "types")
+
+    def __init__(self, columns: dict[str, Any], comments: dict[str, list[str]]):
+        self.types = TokenTypeEnum.by_code
+        self.type: list[int] = columns["type"]
+        self.text: list[str] = columns["text"]
+        self.line: list[int] = columns["line"]
+        self.col: list[int] = columns["col"]
+        self.start: list[int] = columns["start"]
+        self.end: list[int] = columns["end"]
+        self.comments = {int(row): texts for row, texts in comments.items()}
+
+    def compact(self, row: int) -> list[Any]:
+        compact: list[Any] = [
+            self.types[self.type[row]].name,
+            self.text[row],
+            self.line[row],
+            self.col[row],
+            self.start[row],
+            self.end[row],
+        ]
+        if row in self.comments:
+            compact.append(self.comments[row])
+        return compact
+
+
 class Token:
-    def __init__(self, data: dict[str, Any]):
-        self._data = data
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns: _TokenColumns, row: int):
+        self._columns = columns
+        self._row = row
 
     @property
     def token_type(self) -> TokenTypeEnum:
-        return TokenTypeEnum.get_or_create(self._data["tokenType"])
+        columns = self._columns
+        return columns.types[columns.type[self._row]]
 
     @property
     def text(self) -> str:
-        return self._data["text"]
+        return self._columns.text[self._row]
 
     @property
     def line(self) -> int:
-        return self._data["line"]
+        return self._columns.line[self._row]
 
     @property
     def col(self) -> int:
-        return self._data["col"]
+        return self._columns.col[self._row]
 
     @property
     def start(self) -> int:
-        return self._data["start"]
+        return self._columns.start[self._row]
 
     @property
     def end(self) -> int:
-        return self._data["end"]
+        return self._columns.end[self._row]
 
     @property
     def comments(self) -> list[str]:
-        return self._data.get("comments", [])
+        return self._columns.comments.get(self._row, [])
+
+    def compact(self) -> list[Any]:
+        return self._columns.compact(self._row)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Token):
+            return NotImplemented
+        return self.compact() == other.compact()
+
+    def __hash__(self) -> int:
+        return hash((self.token_type, self.text, self.start, self.end))
 
     def __repr__(self) -> str:
-        d = self._data
-        tt = self.token_type.name
         return (
-            f"<Token token_type: TokenType.{tt},"
-            + f" text: {d['text']},"
-            + f" line: {d['line']}, col: {d['col']},"
-            + f" start: {d['start']}, end: {d['end']},"
-            + f" comments: {d.get('comments', [])!r}>"
+            f"<Token token_type: {self.token_type!r},"
+            + f" text: {self.text},"
+            + f" line: {self.line}, col: {self.col},"
+            + f" start: {self.start}, end: {self.end},"
+            + f" comments: {self.comments!r}>"
+        )
+
+
+class TokenStream(Sequence[Token]):
+    def __init__(
+        self,
+        columns: _TokenColumns,
+        rows: Sequence[int],
+        handle: int | None = None,
+        sql: str | None = None,
+    ):
+        self._columns = columns
+        self._rows = rows
+        self.handle = handle
+        self.sql = sql
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TokenStream": ...
+
+    def __getitem__(self, index: int | slice) -> "Token | TokenStream":
+        if isinstance(index, slice):
+            return TokenStream(self._columns, self._rows[index], sql=self.sql)
+        return Token(self._columns, self._rows[index])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def token_types(self) -> list[TokenTypeEnum]:
+        types = self._columns.types
+        codes = self._columns.type
+        return [types[codes[row]] for row in self._rows]
+
+    @property
+    def texts(self) -> list[str]:
+        text = self._columns.text
+        return [text[row] for row in self._rows]
+
+    def filter(self, *token_types: "TokenTypeEnum | str") -> "TokenStream":
+        return self._select(token_types, keep=True)
+
+    def exclude(self, *token_types: "TokenTypeEnum | str") -> "TokenStream":
+        return self._select(token_types, keep=False)
+
+    def _select(
+        self, token_types: tuple["TokenTypeEnum | str", ...], *, keep: bool
+    ) -> "TokenStream":
+        codes = {
+            TokenTypeEnum.get_or_create(str(token_type)).code
+            for token_type in token_types
+        }
+        type_codes = self._columns.type
+        rows = [row for row in self._rows if (type_codes[row] in codes) is keep]
+        return TokenStream(self._columns, rows, sql=self.sql)
+
+    def compact(self) -> list[list[Any]]:
+        return [self._columns.compact(row) for row in self._rows]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, TokenStream)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            token == other_token for token, other_token in zip(self, other, strict=True)
         )
 
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return "[" + ", ".join(map(repr, self)) + "]"
+
 
 class Tokenizer:
     def __init__(self, dialect: str | None = None):
         self._dialect = dialect
 
-    def tokenize(self, sql: str) -> list[Token]:
-        bridge = TSBridge.get()
+    def tokenize(self, sql: str, *, keep: bool = False) -> TokenStream:
         kwargs: dict[str, Any] = {"sql": sql}
+        if keep:
+            # Keep the tokens in node for a later parse_tokens() by handle
+            kwargs["keep"] = True
         if self._dialect:
             kwargs["dialect"] = self._dialect
-        result = bridge.call("tokenize", **kwargs)
+        result = self._call("tokenize", **kwargs)
+        return self._token_stream(result, sql)
+
+    def tokenize_stream(self, chunks: Iterable[str]) -> Iterator[Token]:
+        kwargs: dict[str, Any] = {}
+        if self._dialect:
+            kwargs["dialect"] = self._dialect
+        ended = False
+        try:
+            for chunk in chunks:
+                result = self._call("tokenizeStream", chunk=chunk, **kwargs)
+                kwargs = {"streamId": result["streamId"]}
+                yield from self._token_stream(result)
+            ended = True
+            yield from self._token_stream(
+                self._call("tokenizeStream", end=True, **kwargs)
+            )
+        finally:
+            if not ended and "streamId" in kwargs:
+                TSBridge.get().call("tokenizeStream", discard=True, **kwargs)
+
+    @staticmethod
+    def _call(method: str, **kwargs: Any) -> dict[str, Any]:
+        result = TSBridge.get().call(method, **kwargs)
         if not result["ok"]:
             msg = result.get("error", "Tokenize failed")
             raise TokenError(msg)
-        return [Token(t) for t in result["tokens"] if t["tokenType"] != "EOF"]
+        return result
+
+    @staticmethod
+    def _token_stream(result: dict[str, Any], sql: str | None = None) -> TokenStream:
+        columns = _TokenColumns(result["columns"], result["comments"])
+        rows = range(len(columns.type))
+        return TokenStream(columns, rows, result.get("tokensId"), sql)
@@ -4,6 +4,7 @@
  * Holds expressions in memory and proxies all operations from Python.
  */
 
+import { closeSync, openSync, readFileSync, writeSync } from "node:fs"
 import { createInterface } from "node:readline"
 import * as expMod from "../../dist/expressions.generated.mjs"
 import * as expHelpers from "../../dist/expressions.mjs"
@@ -12,8 +13,19 @@ import "../../dist/dialects/index.mjs"
 import { indexOffsetLogs } from "../../dist/expressions.mjs"
 import * as indexMod from "../../dist/index.mjs"
 
-const { annotateTypes, parse, parseOne, transpile, Tokenizer, TokenType } =
-  indexMod
+const {
+  annotateTypes,
+  fingerprint,
+  parameterize,
+  parse,
+  parseOne,
+  splitStatements,
+  transpile,
+  Token,
+  TOKEN_TYPE_NAMES,
+  TokenType,
+  tokenTypeCode,
+} = indexMod
 import { Dialect } from "../../dist/dialect.mjs"
 
 // Snake_case to camelCase conversion for Python→TS name mapping
@@ -49,6 +61,10 @@ let nextId = 1
 function storeExpr(expr) {
   const id = nextId++
   expressions.set(id, expr)
+  if (currentFamily && rootOf(expr) === currentFamily.tree) {
+    currentFamily.ids.add(id)
+    familyOf.set(id, currentFamily)
+  }
   return id
 }
 
@@ -56,6 +72,190 @@ function getExpr(id) {
   return expressions.get(id)
 }
 
+// Token lists kept by tokenize(keep=true) for parseTokens, with the source
+// text they came from. Handles are never released explicitly; the oldest list
+// is dropped once the store is full
+const TOKEN_STORE_SIZE = 64
+const tokenStore = new Map()
+let nextTokensId = 0
+
+function keepTokens(tokens, sql) {
+  if (tokenStore.size >= TOKEN_STORE_SIZE) {
+    tokenStore.delete(tokenStore.keys().next().value)
+  }
+  const id = nextTokensId++
+  tokenStore.set(id, { tokens, sql })
+  return id
+}
+
+// Tokenizers of open tokenizeStream streams, by stream id
+const tokenStreams = new Map()
+let nextStreamId = 0
+
+function openTokenStream(tokenizer) {
+  if (tokenStreams.size >= TOKEN_STORE_SIZE) {
+    tokenStreams.delete(tokenStreams.keys().next().value)
+  }
+  const id = nextStreamId++
+  tokenStreams.set(id, tokenizer)
+  return id
+}
+
+// Columnar token payload: one array per field, token types as the integer
+// codes listed by tokenTypes and comments in a side table keyed by row. The
+// EOF token is left out
+function tokenColumns(tokens) {
+  const columns = {
+    type: [],
+    text: [],
+    line: [],
+    col: [],
+    start: [],
+    end: [],
+  }
+  const comments = {}
+  for (const token of tokens) {
+    if (token.tokenType === TokenType.EOF) continue
+    if (token.comments.length > 0) {
+      comments[columns.type.length] = token.comments
+    }
+    columns.type.push(tokenTypeCode(token.tokenType))
+    columns.text.push(token.text)
+    columns.line.push(token.line)
+    columns.col.push(token.col)
+    columns.start.push(token.start)
+    columns.end.push(token.end)
+  }
+  return { columns, comments }
+}
+
+// Tokens and source text by handle (undefined once evicted), or tokens
+// rebuilt from [type, text, line, col, start, end, comments?] rows. A non-empty
+// cmd.sql takes precedence over the kept text
+function resolveTokens(cmd) {
+  if (cmd.tokensId !== undefined) {
+    const kept = tokenStore.get(cmd.tokensId)
+    return kept && { tokens: kept.tokens, sql: cmd.sql || kept.sql }
+  }
+  const tokens = cmd.tokens.map(
+    ([type, text, line, col, start, end, comments]) =>
+      new Token(type, text, line, col, start, end, comments || []),
+  )
+  return { tokens, sql: cmd.sql || "" }
+}
+
+// Parse cache: every parseOne(cache=true) handle for the same input shares
+// one cached tree. Handles derived from such a handle form a family; the
+// first command that may mutate any of them gives the family a private copy
+const PARSE_CACHE_SIZE = 256
+const parseCache = new Map()
+const familyOf = new Map()
+let currentFamily
+
+function rootOf(expr) {
+  let node = expr
+  while (node.parent) node = node.parent
+  return node
+}
+
+function shareCachedParse(key, parseTree) {
+  let entry = parseCache.get(key)
+  if (entry) {
+    parseCache.delete(key)
+    // Replay the warnings the original parse logged
+    indexOffsetLogs.push(...entry.logs)
+  } else {
+    const tree = parseTree()
+    entry = { tree, logs: [...indexOffsetLogs] }
+    if (parseCache.size >= PARSE_CACHE_SIZE) {
+      parseCache.delete(parseCache.keys().next().value)
+    }
+  }
+  parseCache.set(key, entry)
+  currentFamily = { tree: entry.tree, ids: new Set() }
+  return storeExpr(entry.tree)
+}
+
+// Swap every handle of the family onto the matching node of a fresh copy
+function privatize(id) {
+  const family = familyOf.get(id)
+  if (!family) return
+  const copy = family.tree.copy()
+  for (const memberId of family.ids) {
+    familyOf.delete(memberId)
+    const path = []
+    for (let node = getExpr(memberId); node.parent; node = node.parent) {
+      path.unshift(node)
+    }
+    let target = copy
+    for (const node of path) {
+      const value = target.args[node.argKey]
+      target = Array.isArray(value) ? value[node.index] : value
+    }
+    expressions.set(memberId, target)
+  }
+}
+
+// Commands that never mutate the tree behind cmd.id
+const READ_ONLY_COMMANDS = new Set([
+  "assertIs",
+  "copy",
+  "equals",
+  "find",
+  "findAll",
+  "getattr",
+  "hasArgType",
+  "hashCode",
+  "project",
+  "query",
+  "release",
+  "sql",
+  "text",
+  "walkColumnar",
+])
+
+// Expression methods that leave their receiver untouched
+const PURE_METHODS = new Set([
+  "bfs",
+  "copy",
+  "dfs",
+  "dump",
+  "find",
+  "findAll",
+  "flatten",
+  "isType",
+  "root",
+  "sql",
+  "text",
+  "unalias",
+  "unnest",
+  "walk",
+])
+
+// Builders copy their receiver unless the call passes copy=False
+function builderMutates(name, args = [], kwargs = {}) {
+  if (kwargs.copy === false) return true
+  if (POSITIONAL_COPY_BUILDERS.has(name)) {
+    return args[POSITIONAL_COPY_BUILDERS.get(name)] === false
+  }
+  return false
+}
+
+function mayMutate(cmd) {
+  if (READ_ONLY_COMMANDS.has(cmd.method)) return false
+  if (cmd.method === "call") {
+    const name = toCamel(cmd.name)
+    if (PURE_METHODS.has(name)) return false
+    if (OPTION_COPY_BUILDERS.has(name) || POSITIONAL_COPY_BUILDERS.has(name)) {
+      return builderMutates(name, cmd.args, cmd.kwargs)
+    }
+    // set, append, replace, pop and anything unknown may edit in place
+    return true
+  }
+  if (cmd.method === "transformRules") return cmd.copy === false
+  return true
+}
+
 // Serialize a value for Python
 function serialize(val) {
   if (val === null || val === undefined) {
@@ -92,7 +292,9 @@ function serialize(val) {
 // Deserialize arguments from Python
 function deserializeArg(arg) {
   if (arg && typeof arg === "object" && "__expr_id__" in arg) {
-    return getExpr(arg.__expr_id__)
+    // A shared cached node must not be attached to another tree
+    const expr = getExpr(arg.__expr_id__)
+    return familyOf.has(arg.__expr_id__) ? expr.copy() : expr
   }
   if (Array.isArray(arg)) {
     return arg.map(deserializeArg)
@@ -107,6 +309,558 @@ function deserializeArg(arg) {
   return arg
 }
 
+// Build a node predicate for a Python expression type name: class hierarchy,
+// node key and multi-inheritance aliases all count as a match
+function typeMatcher(exprType) {
+  const TargetClass = expMod[exprType]
+  const keys = new Set([exprType.toLowerCase()])
+  for (const k of expMod.MULTI_INHERITANCE_MAP[exprType] || []) {
+    keys.add(k.toLowerCase())
+  }
+  return (node) =>
+    (TargetClass !== undefined && node instanceof TargetClass) ||
+    keys.has(node.key)
+}
+
+function anyTypeMatcher(exprTypes) {
+  const matchers = exprTypes.map(typeMatcher)
+  return (node) => matchers.some((m) => m(node))
+}
+
+// Read a Python-named attribute from an expression, trying the JS reserved-word
+// variant (delete → delete_) when the plain camelCase name is missing
+function readAttr(expr, name) {
+  const tsName = toCamel(name)
+  const val = expr[tsName]
+  if (val === undefined && !tsName.endsWith("_")) {
+    const altName = tsName + "_"
+    if (expr[altName] !== undefined) {
+      return { name: altName, value: expr[altName] }
+    }
+  }
+  return { name: tsName, value: val }
+}
+
+// Compile a {field: expected} mapping into a node predicate (strict equality)
+function whereMatcher(where) {
+  const entries = Object.entries(where || {})
+  return (node) =>
+    entries.every(([field, expected]) => {
+      const { value } = readAttr(node, field)
+      return typeof value !== "function" && (value ?? null) === expected
+    })
+}
+
+// Scalars travel as plain JSON; anything else goes through serialize()
+function projectValue(val) {
+  if (val === undefined || val === null) return null
+  if (typeof val === "function") return null
+  if (typeof val !== "object") return val
+  return serialize(val)
+}
+
+function projectRow(expr, fields) {
+  return fields.map((f) => projectValue(readAttr(expr, f).value))
+}
+
+// Run fn over every SQL string of a batch; a failing item reports its error
+// and the position of the first parse error instead of aborting the batch
+function batchItems(sqls, fn) {
+  return sqls.map((sql) => {
+    try {
+      return { ok: true, ...fn(sql) }
+    } catch (err) {
+      const item = {
+        ok: false,
+        error: String(err.message || err),
+        errorType: err.name || "Error",
+      }
+      const detail = err.errors?.[0]
+      if (detail?.line !== undefined) {
+        item.line = detail.line
+        item.col = detail.col
+      }
+      return item
+    }
+  })
+}
+
+// Python slices strings by code point while JS offsets count UTF-16 units;
+// rewrite ascending UTF-16 offsets in place, walking the text once
+function toCodePointOffsets(text, offsets) {
+  if (!/[\uD800-\uDFFF]/.test(text)) return offsets
+  let unit = 0
+  let point = 0
+  return offsets.map((offset) => {
+    for (; unit < offset; point++) {
+      unit += text.codePointAt(unit) > 0xffff ? 2 : 1
+    }
+    return point
+  })
+}
+
+function transpileFile(cmd) {
+  const started = performance.now()
+  const sql = readFileSync(cmd.srcPath, "utf8")
+  const read = cmd.readDialect || ""
+  const writeDialect = Dialect.get(cmd.writeDialect || "")
+  const readDone = performance.now()
+  const spans = splitStatements(sql, { dialect: read })
+  const errors = []
+  const fd = openSync(cmd.dstPath, "w")
+  let line = 1
+  let lineOffset = 0
+  try {
+    spans.forEach((span, index) => {
+      for (; lineOffset < span.start; lineOffset++) {
+        if (sql.charCodeAt(lineOffset) === 10) line++
+      }
+      const text = sql.slice(span.start, span.end)
+      let output
+      try {
+        output = parse(text, { dialect: read })
+          .map((e) => writeDialect.generate(e))
+          .join(";\n")
+      } catch (err) {
+        errors.push({
+          index,
+          offset: span.start,
+          line,
+          error: String(err.message || err),
+          errorType: err.name || "Error",
+        })
+        output = text.trim()
+      }
+      writeSync(fd, `${output};\n`)
+    })
+  } finally {
+    closeSync(fd)
+  }
+  const offsets = toCodePointOffsets(
+    sql,
+    errors.map((error) => error.offset),
+  )
+  errors.forEach((error, index) => {
+    error.offset = offsets[index]
+  })
+  const done = performance.now()
+  return {
+    statements: spans.length,
+    errors,
+    timings: {
+      readMs: readDone - started,
+      transpileMs: done - readDone,
+      totalMs: done - started,
+    },
+  }
+}
+
+// Per-root counter bumped by every committed edit transaction
+const mutationVersions = new WeakMap()
+
+// Resolve an edit target: a handle ({id}) or an arg path from the root such
+// as "where.this" or ["expressions", 0]
+function resolveEditTarget(root, target) {
+  if (!target) return root
+  if (target.id !== undefined) {
+    const expr = getExpr(target.id)
+    if (!expr) throw new Error(`Expression ${target.id} not found`)
+    return expr
+  }
+  const path =
+    typeof target.path === "string" ? target.path.split(".") : target.path
+  let node = root
+  for (const segment of path) {
+    const value = Array.isArray(node)
+      ? node[Number(segment)]
+      : node?.args?.[segment]
+    if (value === undefined || value === null) {
+      throw new Error(`No node at path ${path.join(".")}`)
+    }
+    node = value
+  }
+  if (!(node instanceof expHelpers.Expression)) {
+    throw new Error(`Path ${path.join(".")} is not an expression`)
+  }
+  return node
+}
+
+// Resolve and check every edit before touching the tree, so a bad op leaves
+// the tree unchanged. Every target resolves against the pre-edit tree: ops
+// run in order, but a path such as "expressions.0" names the node that was
+// there before the first op ran. Returns one {apply, touched} per op, where
+// touched lists the nodes whose args or parent links the op may change
+function prepareEdits(root, ops) {
+  const claims = new Map()
+  const claim = (node, slot) => {
+    const slots = claims.get(node) ?? new Set()
+    if (slots.has("*") || slots.has(slot) || (slot === "*" && slots.size)) {
+      throw new Error(`Edit targets ${node.key} more than once`)
+    }
+    claims.set(node, slots.add(slot))
+  }
+  return ops.map((op) => {
+    const node = resolveEditTarget(root, op.target)
+    const value = deserializeArg(op.value)
+    const moved = [value]
+      .flat()
+      .filter((item) => item instanceof expHelpers.Expression)
+    switch (op.op) {
+      case "set":
+        claim(node, `set:${op.key}`)
+        return {
+          apply: () => node.set(op.key, value, op.index ?? undefined),
+          touched: [node, ...moved],
+        }
+      case "append": {
+        const current = node.args[op.key]
+        if (current !== undefined && !Array.isArray(current)) {
+          throw new Error(`Cannot append to ${node.key}.${op.key}`)
+        }
+        return {
+          apply: () => node.append(op.key, value),
+          touched: [node, ...moved],
+        }
+      }
+      case "replace":
+      case "pop":
+        if (!node.parent) {
+          throw new Error(`Cannot ${op.op} ${node.key}: it has no parent`)
+        }
+        claim(node, "*")
+        return {
+          apply: op.op === "pop" ? () => node.pop() : () => node.replace(value),
+          touched: [node.parent, node, ...moved],
+        }
+      default:
+        throw new Error(`Unknown edit op: ${op.op}`)
+    }
+  })
+}
+
+// Record the args and parent links of the given nodes and their children;
+// the returned function puts them all back
+function snapshotNodes(nodes) {
+  const args = new Map()
+  const links = new Map()
+  const link = (node) => {
+    if (!links.has(node)) {
+      links.set(node, [node.parent, node.argKey, node.index])
+    }
+  }
+  for (const node of nodes) {
+    link(node)
+    if (args.has(node)) continue
+    const entries = Object.entries(node.args).map(([key, value]) => {
+      const items = Array.isArray(value) ? [...value] : undefined
+      for (const child of items ?? [value]) {
+        if (child instanceof expHelpers.Expression) link(child)
+      }
+      return [key, value, items]
+    })
+    args.set(node, entries)
+  }
+  return () => {
+    for (const [node, entries] of args) {
+      for (const key of Object.keys(node.args)) delete node.args[key]
+      for (const [key, value, items] of entries) {
+        if (items) value.splice(0, value.length, ...items)
+        node.args[key] = value
+      }
+    }
+    for (const [node, [parent, argKey, index]] of links) {
+      node.parent = parent
+      node.argKey = argKey
+      node.index = index
+    }
+  }
+}
+
+// Apply an edit transaction: either every op lands or, if one throws part
+// way through, the touched nodes are restored and an error naming the op
+// is thrown
+function applyEdits(root, ops) {
+  const edits = prepareEdits(root, ops)
+  const restore = snapshotNodes(edits.flatMap((edit) => edit.touched))
+  edits.forEach((edit, i) => {
+    try {
+      edit.apply()
+    } catch (err) {
+      restore()
+      throw new Error(`Edit op ${i} (${ops[i].op}) failed: ${err.message}`)
+    }
+  })
+}
+
+// Compile declarative rewrite rules into a single Expression.transform callback.
+// Each rule matches node types plus a where pattern; the first matching rule
+// renames the node, replaces it with a template (every ? placeholder becomes
+// the matched node), unwraps it to its `this` child, or drops it
+function compileRules(rules) {
+  const compiled = rules.map((rule) => {
+    const types = Array.isArray(rule.match) ? rule.match : [rule.match]
+    const rewrite = ruleAction(rule)
+    const ofType = anyTypeMatcher(types)
+    const where = whereMatcher(rule.where)
+    return (node) => (ofType(node) && where(node) ? rewrite : undefined)
+  })
+  return (node) => {
+    for (const matches of compiled) {
+      const rewrite = matches(node)
+      if (rewrite) return rewrite(node)
+    }
+    return node
+  }
+}
+
+function ruleAction(rule) {
+  switch (rule.action) {
+    case "rename":
+      return (node) => {
+        const name = node.args.this
+        if (name instanceof expMod.Identifier) {
+          name.set("this", rule.name)
+        } else if (typeof name === "string") {
+          node.set("this", rule.name)
+        } else {
+          throw new Error(`Cannot rename ${node.key}: it has no name`)
+        }
+        return node
+      }
+    case "replace": {
+      const template = parseOne(rule.template, { dialect: rule.dialect || "" })
+      return (node) => {
+        if (template instanceof expMod.Placeholder) return node
+        const replacement = template.copy()
+        let used = false
+        for (const slot of [...replacement.findAll(expMod.Placeholder)]) {
+          slot.replace(used ? node.copy() : node)
+          used = true
+        }
+        return replacement
+      }
+    }
+    case "unwrap":
+      return (node) =>
+        node.args.this instanceof expHelpers.Expression ? node.args.this : node
+    case "drop":
+      return () => null
+    default:
+      throw new Error(`Unknown rule action: ${rule.action}`)
+  }
+}
+
+// Resolve a Python-named method on an expression, trying the JS reserved-word
+// variant (where → where_) when the plain camelCase name is not a method
+function resolveMethod(expr, name) {
+  let tsName = toCamel(name)
+  let method = expr[tsName]
+  if (typeof method !== "function" && !tsName.endsWith("_")) {
+    const altName = tsName + "_"
+    if (typeof expr[altName] === "function") {
+      tsName = altName
+      method = expr[altName]
+    }
+  }
+  return { tsName, method: typeof method === "function" ? method : undefined }
+}
+
+// Deserialize positional args and append snake_case kwargs as a trailing
+// camelCase options object, the calling convention of the builder methods
+function callArgs(args, kwargs) {
+  const callArgs = (args || []).map(deserializeArg)
+  const tsKwargs = {}
+  for (const [k, v] of Object.entries(kwargs ? deserializeArg(kwargs) : {})) {
+    tsKwargs[toCamel(k)] = v
+  }
+  if (Object.keys(tsKwargs).length > 0) {
+    callArgs.push(tsKwargs)
+  }
+  return callArgs
+}
+
+// Builders taking a trailing options object with a copy flag
+const OPTION_COPY_BUILDERS = new Set([
+  "clusterBy",
+  "ctas",
+  "from_",
+  "groupBy",
+  "having",
+  "join",
+  "lateral",
+  "limit",
+  "offset",
+  "orderBy",
+  "qualify",
+  "returning",
+  "select",
+  "sortBy",
+  "table",
+  "where",
+  "window",
+  "with_",
+])
+
+// Builders taking copy as a positional argument at the given index
+const POSITIONAL_COPY_BUILDERS = new Map([
+  ["else_", 1],
+  ["lock", 1],
+  ["when", 2],
+])
+
+const GROUP_BY_WITH = /\s+with\s+(cube|rollup)\s*$/i
+
+// Builders whose Python sqlglot spelling has no single TS method counterpart;
+// each runs as one command instead of a chain of create/set round trips
+const COMPOSITE_BUILDERS = {
+  distinct(expr, args, kwargs) {
+    const ons = args.map((on) =>
+      typeof on === "string"
+        ? parseOne(on, { dialect: kwargs.dialect || "" })
+        : on,
+    )
+    const options = "distinct" in kwargs ? [{ distinct: kwargs.distinct }] : []
+    const instance = expr.distinct(...ons, ...options)
+    if (kwargs.copy !== false) return instance
+    // The TS builder always copies; move its result onto expr for copy=False
+    expr.set("distinct", instance.args.distinct)
+    return expr
+  },
+
+  returning(expr, args, kwargs) {
+    const [expression = "*"] = args
+    if (typeof expression !== "string") {
+      return expr.returning(expression, { copy: kwargs.copy })
+    }
+    const select = parseOne(`SELECT ${expression}`, {
+      dialect: kwargs.dialect || "",
+    })
+    const instance = kwargs.copy === false ? expr : expr.copy()
+    instance.set(
+      "returning",
+      new expMod.Returning({ expressions: select.args.expressions }),
+    )
+    return instance
+  },
+
+  group_by(expr, args, kwargs) {
+    let withKind
+    const groupArgs = []
+    for (const arg of args) {
+      const match = typeof arg === "string" ? GROUP_BY_WITH.exec(arg) : null
+      if (match) {
+        withKind = match[1].toUpperCase()
+        groupArgs.push(arg.slice(0, match.index))
+      } else if (
+        arg &&
+        typeof arg === "object" &&
+        !(arg instanceof expHelpers.Expression) &&
+        "with_" in arg
+      ) {
+        withKind = String(arg.with_).toUpperCase()
+      } else {
+        groupArgs.push(arg)
+      }
+    }
+    const instance = expr.groupBy(...groupArgs, kwargs)
+    const group = instance.args.group
+    if (withKind && group) {
+      const isCube = withKind === "CUBE"
+      const WithClass = isCube ? expMod.Cube : expMod.Rollup
+      group.set(isCube ? "cube" : "rollup", [
+        new WithClass({ expressions: [] }),
+      ])
+    }
+    return instance
+  },
+
+  ctas(expr, args, kwargs) {
+    const { properties, ...options } = kwargs
+    const create = expr.ctas(args[0] ?? "", options)
+    const props = Object.entries(properties || {}).map(([key, value]) =>
+      key.toUpperCase() === "FORMAT"
+        ? new expMod.FileFormatProperty({ this: value })
+        : new expMod.Property({
+            this: new expMod.Literal({ this: key, is_string: true }),
+            value: new expMod.Literal({ this: value, is_string: true }),
+          }),
+    )
+    if (props.length > 0) {
+      create.set("properties", new expMod.Properties({ expressions: props }))
+    }
+    return create
+  },
+}
+
+// Whether `node` is `ancestor` or sits below it; walks up the parents, so
+// the cost is the depth of `node` rather than the size of `ancestor`
+function isWithin(node, ancestor) {
+  for (let current = node; current; current = current.parent) {
+    if (current === ancestor) return true
+  }
+  return false
+}
+
+// Copy the expressions in builder arguments. copy=false skips both the
+// receiver copy and the argument copies, but only the receiver is owned
+function copyArgs(value) {
+  if (value instanceof expHelpers.Expression) return value.copy()
+  if (Array.isArray(value)) return value.map(copyArgs)
+  if (value && typeof value === "object") {
+    const result = {}
+    for (const [k, v] of Object.entries(value)) result[k] = copyArgs(v)
+    return result
+  }
+  return value
+}
+
+function callComposite(expr, step, owned = false) {
+  const builder = COMPOSITE_BUILDERS[step.name]
+  if (!builder) throw new Error(`Unknown composite builder: ${step.name}`)
+  let kwargs = {}
+  for (const [k, v] of Object.entries(deserializeArg(step.kwargs || {}))) {
+    kwargs[toCamel(k)] = v
+  }
+  let args = (step.args || []).map(deserializeArg)
+  if (owned && !("copy" in kwargs)) {
+    args = copyArgs(args)
+    kwargs = { ...copyArgs(kwargs), copy: false }
+  }
+  return builder(expr, args, kwargs)
+}
+
+// Call a builder step on an expression the pipeline already owns, turning off
+// the defensive copy of the receiver unless the caller asked for one
+// explicitly; expression arguments are still copied
+function callOwned(expr, step) {
+  if (step.composite) return callComposite(expr, step, true)
+  const { tsName, method } = resolveMethod(expr, step.name)
+  if (!method) {
+    throw new Error(
+      `${step.name} (tried '${tsName}') is not a method on ${expr.key}`,
+    )
+  }
+  const kwargs = step.kwargs || {}
+  let args = callArgs(step.args, kwargs)
+  if (OPTION_COPY_BUILDERS.has(tsName) && !("copy" in kwargs)) {
+    args = copyArgs(args)
+    if (Object.keys(kwargs).length > 0) {
+      args[args.length - 1].copy = false
+    } else {
+      args.push({ copy: false })
+    }
+  } else if (POSITIONAL_COPY_BUILDERS.has(tsName)) {
+    const index = POSITIONAL_COPY_BUILDERS.get(tsName)
+    if (args.length <= index) {
+      args = copyArgs(args)
+      // Fill skipped positional defaults (lock's update = true)
+      while (args.length < index) args.push(true)
+      args.push(false)
+    }
+  }
+  return method.apply(expr, args)
+}
+
 // Custom error class for unsupported operations
 class UnsupportedError extends Error {
   constructor(message) {
@@ -131,6 +885,14 @@ rl.on("line", (line) => {
     const cmd = JSON.parse(line)
     let result
 
+    if (mayMutate(cmd)) {
+      privatize(cmd.id)
+      for (const op of cmd.ops || []) {
+        if (op.target?.id !== undefined) privatize(op.target.id)
+      }
+    }
+    currentFamily = familyOf.get(cmd.id)
+
     switch (cmd.method) {
       case "parse": {
         const exprs = parse(cmd.sql, { dialect: cmd.dialect || "" })
@@ -139,6 +901,62 @@ rl.on("line", (line) => {
         break
       }
 
+      case "parseMany": {
+        drainLogs()
+        const items = batchItems(cmd.sqls, (sql) => {
+          const exprs = parse(sql, { dialect: cmd.dialect || "" })
+          return { ids: exprs.map(storeExpr), keys: exprs.map((e) => e.key) }
+        })
+        const logs = drainLogs()
+        result = { ok: true, items }
+        if (logs) result.logs = logs
+        break
+      }
+
+      case "transpileMany": {
+        drainLogs()
+        const items = batchItems(cmd.sqls, (sql) => ({
+          sql: transpile(sql, {
+            read: cmd.readDialect || "",
+            write: cmd.writeDialect || "",
+          }),
+        }))
+        const logs = drainLogs()
+        result = { ok: true, items }
+        if (logs) result.logs = logs
+        break
+      }
+
+      case "fingerprintMany": {
+        const fn = cmd.parameterize ? parameterize : fingerprint
+        const dialect = cmd.dialect || ""
+        result = {
+          ok: true,
+          items: batchItems(cmd.sqls, (sql) => fn(sql, { dialect })),
+        }
+        break
+      }
+
+      case "parseTokens": {
+        const resolved = resolveTokens(cmd)
+        if (!resolved) {
+          result = {
+            ok: false,
+            expired: true,
+            error: `Tokens ${cmd.tokensId} not found`,
+          }
+          break
+        }
+        const exprs = Dialect.get(cmd.dialect || "").parseTokens(
+          resolved.tokens,
+          resolved.sql,
+          cmd.errorLevel ? { errorLevel: cmd.errorLevel } : undefined,
+        )
+        const ids = exprs.map((e) => storeExpr(e))
+        result = { ok: true, ids, keys: exprs.map((e) => e.key) }
+        break
+      }
+
       case "parseOne": {
         drainLogs()
         const opts = { dialect: cmd.dialect || "" }
@@ -146,8 +964,16 @@ rl.on("line", (line) => {
           const intoClass = expMod[cmd.into]
           if (intoClass) opts.into = intoClass
         }
-        const expr = parseOne(cmd.sql, opts)
-        const id = storeExpr(expr)
+        let expr
+        let id
+        if (cmd.cache) {
+          const key = [opts.dialect, cmd.into || "", cmd.sql].join("\0")
+          id = shareCachedParse(key, () => parseOne(cmd.sql, opts))
+          expr = getExpr(id)
+        } else {
+          expr = parseOne(cmd.sql, opts)
+          id = storeExpr(expr)
+        }
         const parseLogs = drainLogs()
         result = { ok: true, id, key: expr.key }
         if (parseLogs) result.logs = parseLogs
@@ -155,11 +981,80 @@ rl.on("line", (line) => {
       }
 
       case "transpile": {
-        const results = transpile(cmd.sql, {
+        const opts = {
           read: cmd.readDialect || "",
           write: cmd.writeDialect || "",
-        })
-        result = { ok: true, sql: results }
+        }
+        if (cmd.pretty) opts.pretty = cmd.pretty
+        if (cmd.identify) opts.identify = cmd.identify
+        if (cmd.unsupportedLevel) opts.unsupportedLevel = cmd.unsupportedLevel
+        if (cmd.errorLevel) opts.errorLevel = cmd.errorLevel
+        try {
+          drainLogs()
+          result = { ok: true, sql: transpile(cmd.sql, opts) }
+          const logs = drainLogs()
+          if (logs) result.logs = logs
+        } catch (err) {
+          result = {
+            ok: false,
+            error: String(err.message || err),
+            errorType: err.name || "Error",
+          }
+        }
+        break
+      }
+
+      case "transpileFanOut": {
+        // Parse once, then generate the shared tree for every target;
+        // Generator.generate copies its input so targets cannot interfere
+        drainLogs()
+        const parserOpts = cmd.errorLevel ? { errorLevel: cmd.errorLevel } : {}
+        const expressions = Dialect.get(cmd.readDialect || "").parse(
+          cmd.sql,
+          parserOpts,
+        )
+        const parseLogs = drainLogs() || []
+        const genOpts = {}
+        if (cmd.pretty) genOpts.pretty = cmd.pretty
+        if (cmd.identify) genOpts.identify = cmd.identify
+        if (cmd.unsupportedLevel) {
+          genOpts.unsupportedLevel = cmd.unsupportedLevel
+        }
+        const targets = {}
+        for (const write of cmd.writeDialects) {
+          try {
+            const dialect = Dialect.get(write)
+            const sql = expressions.map((e) => dialect.generate(e, genOpts))
+            targets[write] = { ok: true, sql, logs: drainLogs() || [] }
+          } catch (err) {
+            targets[write] = {
+              ok: false,
+              error: String(err.message || err),
+              errorType: err.name || "Error",
+              logs: drainLogs() || [],
+            }
+          }
+        }
+        result = { ok: true, targets }
+        if (parseLogs.length > 0) result.logs = parseLogs
+        break
+      }
+
+      case "splitStatements": {
+        const spans = splitStatements(cmd.sql, { dialect: cmd.dialect || "" })
+        const offsets = toCodePointOffsets(
+          cmd.sql,
+          spans.flatMap((span) => [span.start, span.end]),
+        )
+        result = { ok: true, offsets }
+        break
+      }
+
+      case "transpileFile": {
+        drainLogs()
+        result = { ok: true, ...transpileFile(cmd) }
+        const logs = drainLogs()
+        if (logs) result.logs = logs
         break
       }
 
@@ -239,16 +1134,7 @@ rl.on("line", (line) => {
         if (!expr) {
           result = { ok: false, error: `Expression ${cmd.id} not found` }
         } else {
-          let tsName = toCamel(cmd.name)
-          let val = expr[tsName]
-          // Fallback: try with trailing underscore (JS reserved words like delete → delete_)
-          if (val === undefined && !tsName.endsWith("_")) {
-            const altName = tsName + "_"
-            if (expr[altName] !== undefined) {
-              tsName = altName
-              val = expr[altName]
-            }
-          }
+          const { name: tsName, value: val } = readAttr(expr, cmd.name)
           if (typeof val === "function") {
             result = { ok: true, value: { type: "method", name: tsName } }
           } else {
@@ -263,33 +1149,14 @@ rl.on("line", (line) => {
         if (!expr) {
           result = { ok: false, error: `Expression ${cmd.id} not found` }
         } else {
-          let tsName = toCamel(cmd.name)
-          let method = expr[tsName]
-          // Fallback: try with trailing underscore (JS reserved words)
-          if (typeof method !== "function" && !tsName.endsWith("_")) {
-            const altName = tsName + "_"
-            if (typeof expr[altName] === "function") {
-              tsName = altName
-              method = expr[altName]
-            }
-          }
-          if (typeof method !== "function") {
+          const { tsName, method } = resolveMethod(expr, cmd.name)
+          if (!method) {
             result = {
               ok: false,
               error: `${cmd.name} (tried '${tsName}') is not a method on ${expr.key}`,
             }
           } else {
-            const args = (cmd.args || []).map(deserializeArg)
-            const kwargs = cmd.kwargs ? deserializeArg(cmd.kwargs) : {}
-            // Convert kwarg keys from snake_case to camelCase
-            const tsKwargs = {}
-            for (const [k, v] of Object.entries(kwargs)) {
-              tsKwargs[toCamel(k)] = v
-            }
-            if (Object.keys(tsKwargs).length > 0) {
-              args.push(tsKwargs)
-            }
-            const ret = method.apply(expr, args)
+            const ret = method.apply(expr, callArgs(cmd.args, cmd.kwargs))
             result = { ok: true, value: serialize(ret) }
           }
         }
@@ -311,6 +1178,8 @@ rl.on("line", (line) => {
         // Release expressions to free memory
         for (const id of cmd.ids || []) {
           expressions.delete(id)
+          familyOf.get(id)?.ids.delete(id)
+          familyOf.delete(id)
         }
         result = { ok: true }
         break
@@ -346,16 +1215,10 @@ rl.on("line", (line) => {
         if (!expr) {
           result = { ok: false, error: `Expression ${cmd.id} not found` }
         } else {
-          const targetKey = cmd.exprType.toLowerCase()
-          const TargetClass = expMod[cmd.exprType]
-          const extraKeys = expMod.MULTI_INHERITANCE_MAP[cmd.exprType] || []
+          const matches = typeMatcher(cmd.exprType)
           let found = null
           for (const node of expr.bfs()) {
-            if (
-              (TargetClass && node instanceof TargetClass) ||
-              node.key === targetKey ||
-              extraKeys.some((k) => node.key.toLowerCase() === k.toLowerCase())
-            ) {
+            if (matches(node)) {
               found = node
               break
             }
@@ -378,16 +1241,10 @@ rl.on("line", (line) => {
         if (!expr) {
           result = { ok: false, error: `Expression ${cmd.id} not found` }
         } else {
-          const targetKey = cmd.exprType.toLowerCase()
-          const TargetClass = expMod[cmd.exprType]
-          const extraKeys = expMod.MULTI_INHERITANCE_MAP[cmd.exprType] || []
+          const matches = typeMatcher(cmd.exprType)
           const found = []
           for (const node of expr.bfs()) {
-            if (
-              (TargetClass && node instanceof TargetClass) ||
-              node.key === targetKey ||
-              extraKeys.some((k) => node.key.toLowerCase() === k.toLowerCase())
-            ) {
+            if (matches(node)) {
               const fid = storeExpr(node)
               found.push({ type: "expr", id: fid, key: node.key })
             }
@@ -397,6 +1254,126 @@ rl.on("line", (line) => {
         break
       }
 
+      case "query": {
+        const expr = getExpr(cmd.id)
+        if (!expr) {
+          result = { ok: false, error: `Expression ${cmd.id} not found` }
+        } else {
+          const types = cmd.types || []
+          const ofType = types.length > 0 ? anyTypeMatcher(types) : () => true
+          const where = whereMatcher(cmd.where)
+          const prune =
+            cmd.prune && cmd.prune.length > 0
+              ? anyTypeMatcher(cmd.prune)
+              : undefined
+          const limit = cmd.limit ?? Number.POSITIVE_INFINITY
+          const fields = cmd.fields
+          const found = []
+          for (const node of expr.walk(cmd.bfs !== false, prune)) {
+            if (found.length >= limit) break
+            if (!ofType(node) || !where(node)) continue
+            if (fields) {
+              found.push(projectRow(node, fields))
+            } else {
+              found.push({ type: "expr", id: storeExpr(node), key: node.key })
+            }
+          }
+          result = fields
+            ? { ok: true, rows: found }
+            : { ok: true, values: found }
+        }
+        break
+      }
+
+      case "edit": {
+        const root = getExpr(cmd.id)
+        if (!root) {
+          result = { ok: false, error: `Expression ${cmd.id} not found` }
+        } else {
+          applyEdits(root, cmd.ops || [])
+          const version = (mutationVersions.get(root) ?? 0) + 1
+          mutationVersions.set(root, version)
+          result = { ok: true, version }
+        }
+        break
+      }
+
+      case "composite": {
+        const expr = getExpr(cmd.id)
+        if (!expr) {
+          result = { ok: false, error: `Expression ${cmd.id} not found` }
+        } else {
+          result = { ok: true, value: serialize(callComposite(expr, cmd)) }
+        }
+        break
+      }
+
+      case "project": {
+        const exprs = cmd.ids.map(getExpr)
+        const missing = exprs.indexOf(undefined)
+        if (missing !== -1) {
+          result = {
+            ok: false,
+            error: `Expression ${cmd.ids[missing]} not found`,
+          }
+        } else {
+          result = {
+            ok: true,
+            rows: exprs.map((expr) => projectRow(expr, cmd.fields)),
+          }
+        }
+        break
+      }
+
+      case "transformRules": {
+        const expr = getExpr(cmd.id)
+        if (!expr) {
+          result = { ok: false, error: `Expression ${cmd.id} not found` }
+        } else {
+          const rewrite = compileRules(cmd.rules || [])
+          const transformed = expr.transform(rewrite, cmd.copy !== false)
+          result = { ok: true, value: serialize(transformed) }
+        }
+        break
+      }
+
+      case "walkColumnar": {
+        const expr = getExpr(cmd.id)
+        if (!expr) {
+          result = { ok: false, error: `Expression ${cmd.id} not found` }
+        } else {
+          const strings = []
+          const codes = new Map()
+          const intern = (str) => {
+            let code = codes.get(str)
+            if (code === undefined) {
+              code = strings.length
+              codes.set(str, code)
+              strings.push(str)
+            }
+            return code
+          }
+          const positions = new Map()
+          const kinds = []
+          const parents = []
+          const argKeys = []
+          const fieldNames = cmd.fields || []
+          const fields = Object.fromEntries(fieldNames.map((f) => [f, []]))
+          for (const node of expr.walk(cmd.bfs !== false)) {
+            positions.set(node, kinds.length)
+            kinds.push(intern(node.key))
+            const parent = node === expr ? undefined : node.parent
+            parents.push(parent ? positions.get(parent) : -1)
+            argKeys.push(parent && node.argKey ? intern(node.argKey) : -1)
+            for (const f of fieldNames) {
+              fields[f].push(projectValue(readAttr(node, f).value))
+            }
+          }
+          result = { ok: true, kinds, parents, argKeys, strings, fields }
+        }
+        break
+      }
+
       case "annotateTypes": {
         const expr = getExpr(cmd.id)
         if (!expr) {
@@ -428,23 +1405,109 @@ rl.on("line", (line) => {
         break
       }
 
+      case "createTree": {
+        // Recipe nodes arrive in post-order; {$node: i} refers to an earlier
+        // node and every reuse after the first gets its own copy. Reuse is
+        // tracked per node object, since two refs may name the same handle
+        const built = []
+        const used = new Set()
+        const resolve = (val) => {
+          if (Array.isArray(val)) return val.map(resolve)
+          if (val && typeof val === "object" && "$node" in val) {
+            const node = built[val.$node]
+            if (used.has(node)) return node.copy()
+            used.add(node)
+            return node
+          }
+          return deserializeArg(val)
+        }
+        for (const node of cmd.nodes) {
+          if (node.op === "copy" || node.op === "ref") {
+            const expr = getExpr(node.id)
+            if (!expr) throw new Error(`Expression ${node.id} not found`)
+            const copy = node.op === "copy" || familyOf.has(node.id)
+            built.push(copy ? expr.copy() : expr)
+          } else if (node.op === "new") {
+            const ExprClass = expMod[node.className]
+            if (!ExprClass) {
+              throw new Error(`Unknown expression class: ${node.className}`)
+            }
+            const args = {}
+            for (const [k, v] of Object.entries(node.args || {})) {
+              args[k] = resolve(v)
+            }
+            built.push(new ExprClass(args))
+          } else if (node.op === "call") {
+            const fn = expHelpers[node.name] || indexMod[node.name]
+            if (typeof fn !== "function") {
+              throw new Error(`Unknown function: ${node.name}`)
+            }
+            built.push(fn(...node.args.map(resolve)))
+          } else {
+            throw new Error(`Unknown recipe op: ${node.op}`)
+          }
+        }
+        const root = built[built.length - 1]
+        result = { ok: true, id: storeExpr(root), key: root.key }
+        break
+      }
+
       case "callFunction": {
         const fn = expHelpers[cmd.name] || indexMod[cmd.name]
         if (typeof fn !== "function") {
           result = { ok: false, error: `Unknown function: ${cmd.name}` }
         } else {
-          const args = (cmd.args || []).map(deserializeArg)
-          const kwargs = cmd.kwargs ? deserializeArg(cmd.kwargs) : {}
-          const tsKwargs = {}
-          for (const [k, v] of Object.entries(kwargs)) {
-            tsKwargs[toCamel(k)] = v
+          const ret = fn(...callArgs(cmd.args, cmd.kwargs))
+          result = { ok: true, value: serialize(ret) }
+        }
+        break
+      }
+
+      case "pipeline": {
+        // Run a recorded builder chain in one round trip. The chain starts at
+        // a handle (cmd.id) or a top-level function (first step); only the
+        // final value is stored, so intermediates are built in place
+        const steps = cmd.steps || []
+        let value
+        let owned = false
+        let rest = steps
+        let start
+        if (cmd.id !== undefined && cmd.id !== null) {
+          start = getExpr(cmd.id)
+          if (!start) throw new Error(`Expression ${cmd.id} not found`)
+          value = start
+        } else {
+          const [first, ...others] = steps
+          const fn = expHelpers[first.name] || indexMod[first.name]
+          if (typeof fn !== "function") {
+            throw new Error(`Unknown function: ${first.name}`)
+          }
+          value = fn(...callArgs(first.args, first.kwargs))
+          owned = true
+          rest = others
+        }
+        for (const step of rest) {
+          if (!value || typeof value.key !== "string") {
+            throw new Error(`Cannot call ${step.name} on a non-expression value`)
           }
-          if (Object.keys(tsKwargs).length > 0) {
-            args.push(tsKwargs)
+          if (owned) {
+            value = callOwned(value, step)
+          } else if (step.composite) {
+            value = callComposite(value, step)
+            owned = !isWithin(start, value)
+          } else {
+            const { tsName, method } = resolveMethod(value, step.name)
+            if (!method) {
+              throw new Error(
+                `${step.name} (tried '${tsName}') is not a method on ${value.key}`,
+              )
+            }
+            value = method.apply(value, callArgs(step.args, step.kwargs))
+            // The chain owns the result once it no longer shares the start node
+            owned = !isWithin(start, value)
           }
-          const ret = fn(...args)
-          result = { ok: true, value: serialize(ret) }
         }
+        result = { ok: true, value: serialize(value) }
         break
       }
 
@@ -461,33 +1524,44 @@ rl.on("line", (line) => {
       }
 
       case "tokenize": {
-        let tokenizer
-        if (cmd.dialect) {
-          const dialect = Dialect.getOrThrow(cmd.dialect)
-          tokenizer = dialect.createTokenizer()
-        } else {
-          tokenizer = new Tokenizer()
-        }
-        const tokens = tokenizer.tokenize(cmd.sql)
-        const serialized = tokens.map((t) => ({
-          tokenType: t.tokenType,
-          text: t.text,
-          line: t.line,
-          col: t.col,
-          start: t.start,
-          end: t.end,
-          comments: t.comments,
-        }))
-        result = { ok: true, tokens: serialized }
+        const dialect = cmd.dialect
+          ? Dialect.getOrThrow(cmd.dialect)
+          : Dialect.get("")
+        const tokens = dialect.tokenize(cmd.sql)
+        result = { ok: true, ...tokenColumns(tokens) }
+        if (cmd.keep) result.tokensId = keepTokens(tokens, cmd.sql)
         break
       }
 
-      case "tokenTypes": {
-        const types = {}
-        for (const [key, value] of Object.entries(TokenType)) {
-          types[key] = value
+      case "tokenizeStream": {
+        let streamId = cmd.streamId
+        if (streamId === undefined) {
+          const dialect = cmd.dialect
+            ? Dialect.getOrThrow(cmd.dialect)
+            : Dialect.get("")
+          streamId = openTokenStream(dialect.createTokenizer())
+        }
+        const tokenizer = tokenStreams.get(streamId)
+        if (!tokenizer) {
+          result = { ok: false, error: "Token stream expired" }
+          break
+        }
+        if (cmd.discard) {
+          tokenStreams.delete(streamId)
+          result = { ok: true }
+          break
+        }
+        let tokens = cmd.chunk ? tokenizer.push(cmd.chunk) : []
+        if (cmd.end) {
+          tokenStreams.delete(streamId)
+          tokens = tokens.concat(tokenizer.end())
         }
-        result = { ok: true, types }
+        result = { ok: true, streamId, ...tokenColumns(tokens) }
+        break
+      }
+
+      case "tokenTypes": {
+        result = { ok: true, names: TOKEN_TYPE_NAMES }
         break
       }
 
@@ -1,4 +1,6 @@
 # pyright: reportAttributeAccessIssue=false
+from typing import Any
+
 import pytest
 
 from compat import ExpressionProxy
@@ -21,3 +23,16 @@ def pytest_unconfigure(config: pytest.Config) -> None:  # noqa: ARG001
 def pytest_runtest_teardown(item: pytest.Item, nextitem: pytest.Item | None) -> None:  # noqa: ARG001
     if ExpressionProxy.retained_count() > MAX_RETAINED_EXPRESSIONS:
         ExpressionProxy.release_all()
+
+
+@pytest.fixture
+def bridge_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    original = TSBridge.call
+
+    def recording_call(self: TSBridge, method: str, **kwargs: Any) -> dict:
+        calls.append(method)
+        return original(self, method, **kwargs)
+
+    monkeypatch.setattr(TSBridge, "call", recording_call)
+    return calls
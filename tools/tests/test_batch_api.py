@@ -0,0 +1,48 @@
+from typing import Any
+
+import pytest
+
+from compat import TSBridge
+from compat import parse_many
+from compat import transpile_many
+
+
+def test_parse_many_reports_errors_per_item() -> None:
+    items = list(parse_many(["SELECT 1", "SELECT 1 +", "SELECT a; SELECT b"]))
+
+    assert [item.ok for item in items] == [True, False, True]
+    assert [expr.sql() for expr in items[2].value] == ["SELECT a", "SELECT b"]
+    failed = items[1]
+    assert failed.value is None
+    assert failed.error_type == "ParseError"
+    assert (failed.line, failed.col) == (1, 10)
+
+
+def test_transpile_many_streams_in_chunks(bridge_calls: list[str]) -> None:
+    sqls = (f"SELECT IFNULL(a, {i})" for i in range(5))
+
+    items = transpile_many(sqls, read="mysql", write="duckdb", chunk_size=2)
+
+    assert bridge_calls == []
+    assert next(items).value == ["SELECT COALESCE(a, 0)"]
+    assert bridge_calls == ["transpileMany"]
+    assert [item.value for item in items] == [
+        [f"SELECT COALESCE(a, {i})"] for i in range(1, 5)
+    ]
+    assert bridge_calls == ["transpileMany"] * 3
+
+
+def test_transpile_many_forwards_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    timeouts: list[float] = []
+    original = TSBridge.call
+
+    def timed_call(self: TSBridge, method: str, timeout: float, **kwargs: Any) -> dict:
+        timeouts.append(timeout)
+        return original(self, method, timeout=timeout, **kwargs)
+
+    monkeypatch.setattr(TSBridge, "call", timed_call)
+
+    items = list(transpile_many(["SELECT 1", "SELECT 2"], chunk_size=1, timeout=90))
+
+    assert [item.value for item in items] == [["SELECT 1"], ["SELECT 2"]]
+    assert timeouts == [90, 90]
@@ -0,0 +1,94 @@
+import pytest
+
+from compat import Expression
+from compat import ExpressionProxyMeta
+from compat import TSBridge
+from compat import parse_one
+from compat import project
+
+Column = ExpressionProxyMeta("Column", (Expression,), {})
+Literal = ExpressionProxyMeta("Literal", (Expression,), {})
+Subquery = ExpressionProxyMeta("Subquery", (Expression,), {})
+Table = ExpressionProxyMeta("Table", (Expression,), {})
+
+
+def test_query_matches_several_types() -> None:
+    expr = parse_one("SELECT a FROM t WHERE b = 1")
+
+    found = expr.query(Column, Table)
+
+    assert sorted(node.sql() for node in found) == ["a", "b", "t"]
+
+
+def test_query_where_limit_and_order() -> None:
+    expr = parse_one("SELECT x, y, x FROM t WHERE 'x' = 2")
+
+    assert [node.sql() for node in expr.query(Column, where={"name": "x"})] == [
+        "x",
+        "x",
+    ]
+    assert len(expr.query(Column, limit=1)) == 1
+    assert [n.sql() for n in expr.query(Literal, where={"is_string": True})] == ["'x'"]
+    assert [n.sql() for n in expr.query(Column, Literal, bfs=False, limit=2)] == [
+        "x",
+        "y",
+    ]
+
+
+def test_query_prune_skips_subtrees() -> None:
+    expr = parse_one("SELECT a FROM (SELECT b FROM u) AS s")
+
+    found = expr.query(Column, prune=(Subquery,))
+
+    assert [node.sql() for node in found] == ["a"]
+
+
+def test_query_projects_fields() -> None:
+    expr = parse_one("SELECT t.a, b FROM t")
+
+    rows = expr.query(Column, fields=["name", "table", "key"])
+
+    assert rows == [("a", "t", "column"), ("b", "", "column")]
+
+
+def test_walk_columnar_returns_parallel_arrays() -> None:
+    expr = parse_one("SELECT a FROM t")
+
+    walk = expr.walk_columnar(fields=["name"])
+
+    kinds = [walk.kind(i) for i in range(len(walk.kinds))]
+    assert kinds == ["select", "column", "from", "identifier", "table", "identifier"]
+    assert walk.parents == [-1, 0, 0, 1, 2, 4]
+    assert [walk.arg_key(i) for i in range(len(walk.kinds))] == [
+        None,
+        "expressions",
+        "from_",
+        "this",
+        "this",
+        "this",
+    ]
+    assert walk.fields["name"] == ["", "a", "", "a", "t", "t"]
+
+
+def test_project_fetches_fields_for_many_handles() -> None:
+    expr = parse_one("SELECT t.a AS x, b FROM t")
+    columns = expr.query(Column, bfs=False)
+
+    rows = project(columns, ["name", "table", "alias_or_name", "key"])
+
+    assert rows == [("a", "t", "a", "column"), ("b", "", "b", "column")]
+    assert project([], ["name"]) == []
+
+
+def test_on_startup_runs_hook_on_running_bridge(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(TSBridge, "_startup_hooks", [])
+    bridge = TSBridge.get()
+    seen: list[TSBridge] = []
+
+    TSBridge.on_startup(seen.append)
+
+    assert seen == [bridge]
+    assert TSBridge.get() is bridge
+    assert seen == [bridge]
@@ -0,0 +1,40 @@
+from compat import Pipeline
+from compat import parse_one
+
+
+def test_pipeline_runs_chain_in_one_call(bridge_calls: list[str]) -> None:
+    chain = Pipeline().select("a").from_("t").where("x > 1").group_by("a").limit(10)
+
+    assert bridge_calls == []
+    expr = chain.build()
+    assert bridge_calls == ["pipeline"]
+    assert expr.sql() == "SELECT a FROM t WHERE x > 1 GROUP BY a LIMIT 10"
+
+
+def test_pipeline_from_handle_leaves_start_untouched() -> None:
+    start = parse_one("SELECT a FROM t")
+
+    built = start.pipeline().where("x > 1").where("y = 2", append=False).build()
+    eager = start.where("x > 1").where("y = 2", append=False)
+
+    assert built.sql() == eager.sql() == "SELECT a FROM t WHERE y = 2"
+    assert start.sql() == "SELECT a FROM t"
+
+
+def test_pipeline_recordings_are_reusable() -> None:
+    base = Pipeline().select("a").from_("t")
+
+    assert base.limit(1).build().sql() == "SELECT a FROM t LIMIT 1"
+    assert base.where("b").build().sql() == "SELECT a FROM t WHERE b"
+
+
+def test_pipeline_copies_expression_arguments() -> None:
+    cond = parse_one("x = 1")
+
+    first = Pipeline().select("a").from_("t").where(cond).build()
+    second = Pipeline().select("b").from_("u").where(cond).build()
+
+    assert first.sql() == "SELECT a FROM t WHERE x = 1"
+    assert second.sql() == "SELECT b FROM u WHERE x = 1"
+    assert cond.sql() == "x = 1"
+    assert cond.parent is None
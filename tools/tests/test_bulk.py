@@ -0,0 +1,77 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from compat.bulk import BulkResult
+from compat.bulk import CorpusItem
+from compat.bulk import iter_corpus
+from compat.bulk import main
+from compat.bulk import run_bulk
+from compat.bulk import transpile_chunk
+
+
+def test_run_bulk_keeps_order_across_workers(tmp_path: Path) -> None:
+    for name, sql in [("b.sql", "SELECT IFNULL(b, 1)"), ("a/x.sql", "SELECT 1 +")]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(sql)
+    (tmp_path / "c.sql").write_text("SELECT 1; SELECT 2")
+
+    results = list(
+        run_bulk(iter_corpus(tmp_path), "mysql", "duckdb", processes=2, chunk_size=1)
+    )
+
+    assert [result.id for result in results] == ["a/x.sql", "b.sql", "c.sql"]
+    assert results[0].sql is None
+    assert results[0].error is not None
+    assert results[1:] == [
+        BulkResult("b.sql", ["SELECT COALESCE(b, 1)"]),
+        BulkResult("c.sql", ["SELECT 1", "SELECT 2"]),
+    ]
+
+
+def test_transpile_chunk_recovers_after_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    items = [CorpusItem(str(n), f"SELECT {n}") for n in range(50)]
+    monkeypatch.setattr("compat.bulk._CHUNK_TIMEOUT", 0.0)
+    monkeypatch.setattr("compat.bulk._ITEM_TIMEOUT", 0.0)
+
+    failed = transpile_chunk((items, None, None))
+
+    assert [result.id for result in failed] == [item.id for item in items]
+    assert all(result.sql is None for result in failed)
+    assert all("timed out" in (result.error or "") for result in failed)
+
+    monkeypatch.undo()
+    assert transpile_chunk((items[:2], None, None)) == [
+        BulkResult("0", ["SELECT 0"]),
+        BulkResult("1", ["SELECT 1"]),
+    ]
+
+
+def test_main_transpiles_ndjson_corpus(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level(logging.INFO, logger="compat.bulk")
+    corpus = tmp_path / "corpus.ndjson"
+    output = tmp_path / "out.ndjson"
+    corpus.write_text(
+        '{"id": "q1", "sql": "SELECT IFNULL(a, 0)"}\n\n"SELECT 1 +"\n',
+        encoding="utf-8",
+    )
+
+    main([
+        str(corpus),
+        "--read=mysql",
+        "--write=duckdb",
+        f"--output={output}",
+        "--processes=1",
+    ])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert records[0] == {"id": "q1", "sql": ["SELECT COALESCE(a, 0)"]}
+    assert records[1]["id"] == "3"
+    assert "error" in records[1]
+    assert "2 items, 1 errors" in caplog.text
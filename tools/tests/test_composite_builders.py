@@ -0,0 +1,68 @@
+import pytest
+
+from compat import Pipeline
+from compat import parse_one
+
+
+@pytest.mark.parametrize(
+    ("sql", "name", "args", "kwargs", "expected"),
+    [
+        (
+            "SELECT a FROM t",
+            "distinct",
+            ("a", "b"),
+            {},
+            "SELECT DISTINCT ON (a, b) a FROM t",
+        ),
+        ("DELETE FROM t", "returning", ("a, b",), {}, "DELETE FROM t RETURNING a, b"),
+        (
+            "SELECT a FROM t",
+            "group_by",
+            ("a", "b WITH CUBE"),
+            {},
+            "SELECT a FROM t GROUP BY a, b WITH CUBE",
+        ),
+        (
+            "SELECT a FROM t",
+            "ctas",
+            ("x",),
+            {"properties": {"format": "parquet", "k": 1}},
+            "CREATE TABLE x WITH (USING parquet, 'k'='1') AS SELECT a FROM t",
+        ),
+    ],
+)
+def test_composite_builder_is_one_call(
+    bridge_calls: list[str],
+    sql: str,
+    name: str,
+    args: tuple,
+    kwargs: dict,
+    expected: str,
+) -> None:
+    expr = parse_one(sql)
+    method = getattr(expr, name)
+    bridge_calls.clear()
+
+    result = method(*args, **kwargs)
+
+    assert bridge_calls == ["composite"]
+    assert result.sql() == expected
+    assert expr.sql() == sql
+
+
+def test_pipeline_runs_composite_steps_inline(bridge_calls: list[str]) -> None:
+    chain = Pipeline().select("a").from_("t").group_by("a WITH ROLLUP").limit(5)
+
+    expr = chain.build()
+
+    assert bridge_calls == ["pipeline"]
+    assert expr.sql() == "SELECT a FROM t GROUP BY a WITH ROLLUP LIMIT 5"
+
+
+def test_distinct_honors_copy_and_dialect() -> None:
+    expr = parse_one("SELECT a FROM t")
+
+    result = expr.distinct("`x y`", dialect="mysql", copy=False)
+
+    assert result.sql() == 'SELECT DISTINCT ON ("x y") a FROM t'
+    assert expr.sql() == result.sql()
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from compat import DeferredExpression
+from compat import deferred_operators
+from compat import parse_one
+
+
+def test_deferred_operators_match_eager_sql(bridge_calls: list[str]) -> None:
+    a = parse_one("a")
+    b = parse_one("b")
+    eager = [
+        ((a + 1) * b > 2) & ~(a < b),
+        (a - b) / 3 | (2**a),
+        -(a % 2) // b,
+    ]
+    bridge_calls.clear()
+
+    with deferred_operators():
+        deferred = [
+            ((a + 1) * b > 2) & ~(a < b),
+            (a - b) / 3 | (2**a),
+            -(a % 2) // b,
+        ]
+
+    assert bridge_calls == []
+    assert all(isinstance(expr, DeferredExpression) for expr in deferred)
+    assert [expr.sql() for expr in deferred] == [expr.sql() for expr in eager]
+
+
+def test_deferred_chain_is_one_round_trip(bridge_calls: list[str]) -> None:
+    column = parse_one("x")
+    bridge_calls.clear()
+
+    with deferred_operators():
+        condition = column.eq(-1)
+        for value in range(500):
+            condition |= column.eq(value)
+
+    assert condition.pending
+    assert condition.sql().endswith("OR x = 499")
+    assert bridge_calls.count("createTree") == 1
+    assert "copy" not in bridge_calls
+
+
+def test_deferred_mode_does_not_leak_into_other_threads() -> None:
+    a = parse_one("a")
+
+    with deferred_operators(), ThreadPoolExecutor(1) as executor:
+        other = executor.submit(lambda: a + 1).result()
+        local = a + 1
+
+    assert not isinstance(other, DeferredExpression)
+    assert isinstance(local, DeferredExpression)
+    assert not isinstance(a + 1, DeferredExpression)
+
+
+def test_deferred_shared_operand_is_copied() -> None:
+    with deferred_operators():
+        shared = parse_one("a") + 1
+        both = shared * shared
+
+    assert both.sql() == "(a + 1) * (a + 1)"
+    assert shared.sql() == "a + 1"
+
+
+def test_deferred_operand_used_twice_gets_its_own_node() -> None:
+    x = parse_one("x")
+    y = parse_one("y")
+
+    with deferred_operators():
+        product = (y + x) * x
+
+    assert product.sql() == "(y + x) * x"
+    assert product.this.this.expression.parent.key == "add"
+    assert product.expression.parent.key == "mul"
+
+
+def test_deferred_pow_records_pow_key() -> None:
+    x = parse_one("x")
+
+    with deferred_operators():
+        power = x**2
+        assert power.pending
+        assert power.key == "pow"
+
+    assert power.sql() == "POWER(x, 2)"
+    assert power.key == "pow"
+    assert (2**x).sql() == "POWER(2, x)"
@@ -0,0 +1,31 @@
+from compat import Fingerprint
+from compat import ParameterValue
+from compat import fingerprint
+from compat import fingerprint_many
+from compat import parameterize
+
+
+def test_fingerprint_groups_queries_by_shape() -> None:
+    first = fingerprint("select A from T where x in (1, 2) and y = 'a'")
+    second = fingerprint("SELECT a FROM t WHERE x IN (3) AND y = 'b';")
+
+    assert first == second
+    assert first.normalized == "SELECT a FROM t WHERE x IN (?) AND y = ?"
+    assert len(first.hash) == 16
+
+
+def test_parameterize_returns_literal_values() -> None:
+    result = parameterize("SELECT * FROM t WHERE a = -1 AND b = 'x'", "postgres")
+
+    assert result.normalized == "SELECT * FROM t WHERE a = ? AND b = ?"
+    assert result.values == [
+        ParameterValue("-1", "NUMBER"),
+        ParameterValue("x", "STRING"),
+    ]
+
+
+def test_fingerprint_many_reports_errors_per_item() -> None:
+    items = list(fingerprint_many(["SELECT 1", "SELECT 'open", "SELECT 2"]))
+
+    assert [item.ok for item in items] == [True, False, True]
+    assert items[0].value == Fingerprint(items[2].value.hash, "SELECT ?")
@@ -0,0 +1,54 @@
+from compat import Expression
+from compat import ExpressionProxyMeta
+from compat import parse_one
+
+Column = ExpressionProxyMeta("Column", (Expression,), {})
+Where = ExpressionProxyMeta("Where", (Expression,), {})
+
+SQL = "SELECT a, b FROM t WHERE a > 1"
+
+
+def test_cached_handles_share_until_mutated() -> None:
+    first = parse_one(SQL, cache=True)
+    second = parse_one(SQL, cache=True)
+    column = second.find(Column)
+    assert column is not None
+
+    with second.edit() as tx:
+        tx.set("this", parse_one("z").this, target=column)
+    column.set("this", parse_one("y").this)
+
+    assert second.sql() == "SELECT y, b FROM t WHERE a > 1"
+    assert first.sql() == SQL
+    assert parse_one(SQL, cache=True).sql() == SQL
+
+
+def test_cached_nodes_are_copied_when_attached_elsewhere() -> None:
+    cached = parse_one(SQL, cache=True)
+    where = cached.find(Where)
+    other = parse_one("SELECT c FROM u")
+
+    with other.edit() as tx:
+        tx.set("where", where)
+
+    assert other.sql() == "SELECT c FROM u WHERE a > 1"
+    assert cached.sql() == SQL
+    assert where is not None
+    assert where.parent.sql() == SQL
+
+
+def test_builder_on_cached_handle_leaves_cache_intact() -> None:
+    built = parse_one(SQL, cache=True).where("b = 2", append=False, copy=False)
+
+    assert built.sql() == "SELECT a, b FROM t WHERE b = 2"
+    assert parse_one(SQL, cache=True).sql() == SQL
+
+
+def test_copying_builder_keeps_cached_handle_shared() -> None:
+    cached = parse_one(SQL, cache=True)
+
+    built = cached.where("b = 2")
+
+    assert built.sql() == "SELECT a, b FROM t WHERE a > 1 AND b = 2"
+    assert cached.sql() == SQL
+    assert parse_one(SQL, cache=True).sql() == SQL
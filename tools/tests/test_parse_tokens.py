@@ -0,0 +1,33 @@
+import pytest
+
+from compat import ParseError
+from compat import parse_tokens
+from compat.tokens import Tokenizer
+
+
+def test_parse_tokens_reuses_tokenized_handle(bridge_calls: list[str]) -> None:
+    sql = "SELECT \"a b\", 'x' FROM t; SELECT 2"
+    tokens = Tokenizer().tokenize(sql, keep=True)
+
+    exprs = parse_tokens(tokens, sql)
+
+    assert [e.sql() for e in exprs] == ["SELECT \"a b\", 'x' FROM t", "SELECT 2"]
+    assert bridge_calls[:2] == ["tokenize", "parseTokens"]
+
+
+def test_parse_tokens_from_modified_list() -> None:
+    tokens = Tokenizer("mysql").tokenize("SELECT `a` FROM t WHERE b = 1")[:-4]
+
+    [expr] = parse_tokens(tokens, read="mysql")
+
+    assert expr.sql("mysql") == "SELECT `a` FROM t"
+    with pytest.raises(ParseError):
+        parse_tokens(tokens[:-1], read="mysql")
+
+
+@pytest.mark.parametrize("keep", [True, False])
+def test_parse_tokens_without_sql_uses_tokenized_text(*, keep: bool) -> None:
+    tokens = Tokenizer().tokenize("SELECT 1 +* FROM", keep=keep)
+
+    with pytest.raises(ParseError, match=r"SELECT 1 \+\* FROM"):
+        parse_tokens(tokens)
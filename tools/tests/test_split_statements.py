@@ -0,0 +1,14 @@
+from compat import split_statements
+
+
+def test_split_statements_returns_code_point_spans() -> None:
+    sql = "SELECT '😀;' ;\n-- note\nSELECT $$a;b$$;; \n SELECT 3"
+
+    spans = split_statements(sql, "postgres")
+
+    assert [sql[start:end] for start, end in spans] == [
+        "SELECT '😀;'",
+        "-- note\nSELECT $$a;b$$",
+        "SELECT 3",
+    ]
+    assert split_statements("  ;  ") == []
@@ -0,0 +1,63 @@
+from compat.tokens import Tokenizer
+from compat.tokens import TokenType
+from compat.tokens import TokenTypeEnum
+
+
+def test_tokenize_returns_views_over_columns() -> None:
+    tokens = Tokenizer().tokenize("SELECT a /* c */, 'x' FROM t")
+
+    assert len(tokens) == 6
+    assert tokens[0].token_type == TokenType.SELECT
+    assert tokens[0].token_type is tokens[0].token_type
+    assert (tokens[2].text, tokens[2].comments) == (",", [" c "])
+    assert (tokens[3].start, tokens[3].end, tokens[3].col) == (18, 21, 21)
+    assert tokens[-1].text == "t"
+
+
+def test_token_stream_filters_by_type() -> None:
+    tokens = Tokenizer().tokenize("SELECT a, b FROM t WHERE c = 1")
+
+    names = tokens.filter(TokenType.VAR)
+    assert names.texts == ["a", "b", "t", "c"]
+    assert tokens.exclude(TokenType.VAR, "COMMA").token_types == [
+        TokenType.SELECT,
+        TokenType.FROM,
+        TokenType.WHERE,
+        TokenType.EQ,
+        TokenType.NUMBER,
+    ]
+    assert names[1:].texts == ["b", "t", "c"]
+    assert names.handle is None
+
+
+def test_tokenize_stream_matches_tokenize() -> None:
+    sql = "SELECT 'a;b' -- c\nFROM t ORDER BY x; SELECT $$q\n$$"
+    tokenizer = Tokenizer()
+    chunks = [sql[i : i + 5] for i in range(0, len(sql), 5)]
+
+    streamed = [token.compact() for token in tokenizer.tokenize_stream(chunks)]
+
+    assert streamed == tokenizer.tokenize(sql).compact()
+
+
+def test_token_types_are_preloaded_integer_codes() -> None:
+    tokens = Tokenizer().tokenize("SELECT a FROM t")
+
+    select = TokenType.SELECT
+    assert TokenTypeEnum.by_code[select.code] is select
+    assert tokens.token_types[0] is select
+    assert select == "SELECT"
+    assert "SELECT" in {select, TokenType.FROM}
+    assert TokenType.FROM.code != select.code
+
+
+def test_token_stream_compares_and_prints_like_a_list() -> None:
+    tokenizer = Tokenizer()
+    tokens = tokenizer.tokenize("SELECT a FROM t")
+
+    assert tokens == list(tokens)
+    assert tokens == tokenizer.tokenize("SELECT a FROM t")
+    assert tokens != tokenizer.tokenize("SELECT b FROM t")
+    assert tokens[:2] != tokens
+    assert repr(tokens) == repr(list(tokens))
+    assert repr(tokens).startswith("[<Token token_type: ")
@@ -0,0 +1,59 @@
+import pytest
+
+from compat import Expression
+from compat import ExpressionProxyMeta
+from compat import parse_one
+
+Column = ExpressionProxyMeta("Column", (Expression,), {})
+Paren = ExpressionProxyMeta("Paren", (Expression,), {})
+
+
+def test_replace_with_template_masks_matches() -> None:
+    expr = parse_one("SELECT ssn, name FROM people WHERE ssn = '1'")
+
+    masked = expr.apply_rules([
+        {
+            "match": Column,
+            "where": {"name": "ssn"},
+            "action": "replace",
+            "template": "SHA2(?, 256)",
+        },
+    ])
+
+    assert masked is not None
+    assert (
+        masked.sql()
+        == "SELECT SHA2(ssn, 256), name FROM people WHERE SHA2(ssn, 256) = '1'"
+    )
+    assert expr.sql() == "SELECT ssn, name FROM people WHERE ssn = '1'"
+
+
+def test_rename_unwrap_and_drop() -> None:
+    expr = parse_one("SELECT (a), b, c FROM t")
+
+    rewritten = expr.apply_rules([
+        {"match": Paren, "action": "unwrap"},
+        {"match": "Column", "where": {"name": "b"}, "action": "rename", "name": "x"},
+        {"match": "Column", "where": {"name": "c"}, "action": "drop"},
+    ])
+
+    assert rewritten is not None
+    assert rewritten.sql() == "SELECT a, x FROM t"
+
+
+def test_first_matching_rule_wins_and_drop_root() -> None:
+    expr = parse_one("a + b")
+
+    replaced = expr.apply_rules([
+        {"match": "Column", "action": "replace", "template": "1"},
+        {"match": "Column", "action": "drop"},
+    ])
+
+    assert replaced is not None
+    assert replaced.sql() == "1 + 1"
+    assert expr.apply_rules([{"match": "Add", "action": "drop"}]) is None
+
+
+def test_unknown_action_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown rule action"):
+        parse_one("a").apply_rules([{"match": "Column", "action": "explode"}])
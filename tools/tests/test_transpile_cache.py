@@ -0,0 +1,47 @@
+from compat import CacheStats
+from compat import TranspileCache
+from compat import transpile
+
+
+def test_cache_skips_bridge_on_hits(bridge_calls: list[str]) -> None:
+    cache = TranspileCache(max_size=2)
+
+    for sql in ["SELECT IFNULL(a, 1)", "SELECT 2", "SELECT IFNULL(a, 1)", "SELECT 3"]:
+        transpile(sql, read="mysql", write="duckdb", cache=cache)
+    result = transpile("SELECT IFNULL(a, 1)", read="mysql", write="duckdb", cache=cache)
+
+    assert result == ["SELECT COALESCE(a, 1)"]
+    assert bridge_calls == ["transpile"] * 3
+    stats = cache.stats()
+    assert stats._replace(bytes=0) == CacheStats(
+        hits=2, misses=3, evictions=1, size=2, bytes=0
+    )
+    assert stats.bytes > 0
+
+
+def test_cache_is_bounded_by_bytes() -> None:
+    cache = TranspileCache(max_bytes=20)
+
+    transpile("SELECT 1", cache=cache)
+    transpile("SELECT 2", cache=cache)
+    transpile("SELECT 'longer than the whole byte budget'", cache=cache)
+
+    assert cache.stats() == CacheStats(hits=0, misses=3, evictions=1, size=1, bytes=16)
+    cache.clear()
+    assert cache.stats() == CacheStats(0, 0, 0, 0, 0)
+
+
+def test_cache_keys_on_generate_options(bridge_calls: list[str]) -> None:
+    cache = TranspileCache()
+    sql = "SELECT a FROM t"
+
+    pretty = transpile(sql, cache=cache, pretty=True)
+    plain = transpile(sql, cache=cache)
+    fan_out = transpile(sql, write=["duckdb"], cache=cache, pretty=True)
+
+    assert pretty == ["SELECT\n  a\nFROM t"]
+    assert plain == ["SELECT a FROM t"]
+    assert fan_out["duckdb"].sql == pretty
+    assert transpile(sql, cache=cache, pretty=True) == pretty
+    assert bridge_calls == ["transpile", "transpile", "transpileFanOut"]
+    assert cache.stats().size == 3
@@ -0,0 +1,55 @@
+import pytest
+
+from compat import ParseError
+from compat import TargetResult
+from compat import TranspileCache
+from compat import transpile
+
+SQL = "SELECT ARRAY_AGG(a ORDER BY b) FROM t"
+
+
+def test_fan_out_parses_once_for_all_targets(bridge_calls: list[str]) -> None:
+    results = transpile(SQL, read="duckdb", write=["postgres", "bigquery", "nope"])
+
+    assert bridge_calls == ["transpileFanOut"]
+    assert list(results) == ["postgres", "bigquery", "nope"]
+    assert results["postgres"] == TargetResult(
+        ["SELECT ARRAY_AGG(a ORDER BY b) FROM t"], []
+    )
+    assert results["bigquery"].warnings == [
+        "'NULLS LAST' translation not supported for aggregate functions with sort order"
+    ]
+    assert not results["nope"].ok
+    assert results["nope"].error == "Unknown dialect: nope"
+
+
+def test_fan_out_uses_cache_per_target(bridge_calls: list[str]) -> None:
+    cache = TranspileCache()
+    transpile(SQL, read="duckdb", write="postgres", cache=cache)
+
+    results = transpile(SQL, read="duckdb", write=("postgres", "mysql"), cache=cache)
+
+    assert bridge_calls == ["transpile", "transpileFanOut"]
+    assert results["postgres"].sql == ["SELECT ARRAY_AGG(a ORDER BY b) FROM t"]
+    assert results["mysql"].ok
+    assert cache.stats().size == 2
+
+
+def test_fan_out_parse_error_raises() -> None:
+    with pytest.raises(ParseError):
+        transpile("SELECT 1 +", write=["postgres"])
+
+
+def test_fan_out_does_not_cache_targets_with_warnings(
+    bridge_calls: list[str],
+) -> None:
+    cache = TranspileCache()
+    transpile(SQL, read="duckdb", write="bigquery", cache=cache)
+
+    results = transpile(SQL, read="duckdb", write=["bigquery"], cache=cache)
+
+    assert bridge_calls == ["transpile", "transpileFanOut"]
+    assert results["bigquery"].warnings == [
+        "'NULLS LAST' translation not supported for aggregate functions with sort order"
+    ]
+    assert cache.stats().size == 0
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from compat import transpile_file
+
+
+def test_transpile_file_streams_statements(tmp_path: Path) -> None:
+    src = tmp_path / "in.sql"
+    dst = tmp_path / "out.sql"
+    src.write_text(
+        "-- load\nSELECT IFNULL(a, 1) FROM t;\n\nSELECT 1 +;\nSELECT 'é' || b;;\n",
+        encoding="utf-8",
+    )
+
+    summary = transpile_file(src, dst, read="mysql", write="duckdb")
+
+    assert summary.statements == 3
+    assert [(e.statement, e.offset, e.line) for e in summary.errors] == [(1, 37, 4)]
+    assert summary.errors[0].error_type == "ParseError"
+    assert set(summary.timings) == {"readMs", "transpileMs", "totalMs"}
+    assert dst.read_text(encoding="utf-8") == (
+        "SELECT COALESCE(a, 1) FROM t;\nSELECT 1 +;\nSELECT 'é' || b;\n"
+    )
+
+
+def test_transpile_file_error_offsets_count_code_points(tmp_path: Path) -> None:
+    src = tmp_path / "in.sql"
+    sql = "SELECT '🦆🦆' AS a;\nSELECT 1 +;\n"
+    src.write_text(sql, encoding="utf-8")
+
+    summary = transpile_file(src, tmp_path / "out.sql", read="duckdb")
+
+    [error] = summary.errors
+    assert error.offset == sql.index("SELECT 1 +")
+    assert error.line == 2
@@ -0,0 +1,36 @@
+import logging
+
+import pytest
+
+from compat import ErrorLevel
+from compat import ParseError
+from compat import UnsupportedError
+from compat import transpile
+
+UNSUPPORTED = "SELECT SUM(a RESPECT NULLS) FROM t"
+
+
+def test_transpile_forwards_generator_options() -> None:
+    sql = "SELECT a FROM t WHERE b = 1"
+
+    assert transpile(sql, identify=True) == ['SELECT "a" FROM "t" WHERE "b" = 1']
+    assert transpile(sql, pretty=True) == ["SELECT\n  a\nFROM t\nWHERE\n  b = 1"]
+    assert transpile(sql, write=["postgres"], identify=True)["postgres"].sql == [
+        'SELECT "a" FROM "t" WHERE "b" = 1'
+    ]
+
+
+def test_transpile_unsupported_level(caplog: pytest.LogCaptureFixture) -> None:
+    with pytest.raises(UnsupportedError):
+        transpile(UNSUPPORTED, write="duckdb", unsupported_level=ErrorLevel.RAISE)
+
+    caplog.set_level(logging.WARNING, logger="sqlglot")
+    transpile(UNSUPPORTED, write="duckdb")
+    assert any("RESPECT NULLS" in record.message for record in caplog.records)
+
+
+def test_transpile_error_level() -> None:
+    with pytest.raises(ParseError):
+        transpile("SELECT 1 +")
+
+    assert len(transpile("SELECT 1 +", error_level=ErrorLevel.IGNORE)) == 1
@@ -0,0 +1,101 @@
+from typing import Any
+
+import pytest
+
+from compat import Expression
+from compat import ExpressionProxyMeta
+from compat import TreeEdit
+from compat import parse_one
+
+Column = ExpressionProxyMeta("Column", (Expression,), {})
+Identifier = ExpressionProxyMeta("Identifier", (Expression,), {})
+Literal = ExpressionProxyMeta("Literal", (Expression,), {})
+
+
+def test_edit_applies_ops_in_one_transaction() -> None:
+    expr = parse_one("SELECT a, b FROM t WHERE x = 1")
+    b = expr.query(Column, where={"name": "b"})[0]
+
+    with expr.edit() as tx:
+        tx.append("expressions", parse_one("c"))
+        tx.replace(b, parse_one("d"))
+        tx.set("expression", Literal(this="2", is_string=False), target="where.this")
+        tx.pop(("expressions", 0))
+
+    assert expr.sql() == "SELECT d, c FROM t WHERE x = 2"
+    assert tx.version == 1
+    with expr.edit() as tx:
+        tx.set("where", None)
+    assert tx.version == 2
+    assert expr.sql() == "SELECT d, c FROM t"
+
+
+def test_edit_is_atomic_when_an_op_is_invalid() -> None:
+    expr = parse_one("SELECT a FROM t")
+
+    tree_edit = TreeEdit(expr)
+    tree_edit.set("this", Identifier(this="z"), target="expressions.0")
+    tree_edit.pop("where.this")
+
+    with pytest.raises(ValueError, match="No node at path"):
+        tree_edit.commit()
+
+    assert expr.sql() == "SELECT a FROM t"
+
+
+def test_edit_discarded_on_exception() -> None:
+    expr = parse_one("SELECT a FROM t")
+
+    def abort_edit() -> None:
+        with expr.edit() as tx:
+            tx.pop("expressions.0")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        abort_edit()
+
+    assert expr.sql() == "SELECT a FROM t"
+
+
+def test_edit_rolls_back_when_an_op_fails_while_applying() -> None:
+    expr = parse_one("SELECT a FROM t WHERE x = 1")
+
+    tree_edit = TreeEdit(expr)
+    tree_edit.append("expressions", parse_one("c"))
+    tree_edit.pop("where.this")
+    tree_edit.set("where", [parse_one("y")], index=0)
+
+    with pytest.raises(ValueError, match=r"Edit op 2 \(set\) failed"):
+        tree_edit.commit()
+
+    assert expr.sql() == "SELECT a FROM t WHERE x = 1"
+    with expr.edit() as tx:
+        tx.pop("where")
+    assert tx.version == 1
+    assert expr.sql() == "SELECT a FROM t"
+
+
+@pytest.mark.parametrize(
+    "ops",
+    [
+        [("replace", "expressions.0"), ("set", "expressions.0")],
+        [("set", None), ("set", None)],
+        [("pop", "expressions.0"), ("pop", ("expressions", 0))],
+    ],
+)
+def test_edit_rejects_duplicate_targets(ops: list[tuple[str, Any]]) -> None:
+    expr = parse_one("SELECT a FROM t")
+
+    tree_edit = TreeEdit(expr)
+    for op, target in ops:
+        if op == "replace":
+            tree_edit.replace(target, parse_one("b"))
+        elif op == "set":
+            tree_edit.set("this", Identifier(this="z"), target=target)
+        else:
+            tree_edit.pop(target)
+
+    with pytest.raises(ValueError, match="more than once"):
+        tree_edit.commit()
+
+    assert expr.sql() == "SELECT a FROM t"